@@ -0,0 +1,181 @@
+from dataclasses import replace
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .models import Project, ServerConfig
+
+
+class ThreadIndex:
+    """
+    Resident thread_id -> (task_id, assignee ids) map for the thread monitor.
+
+    Loaded once at startup and kept current by the task write paths in
+    database.py, so on_message never has to query SQLite.
+    """
+
+    def __init__(self):
+        self._task_by_thread: Dict[int, int] = {}
+        self._thread_by_task: Dict[int, int] = {}
+        self._assignees: Dict[int, Set[int]] = {}
+        self.hits = 0
+        self.skipped = 0
+
+    def load(self, threads: Iterable[Tuple[int, int]], assignees: Iterable[Tuple[int, int]]):
+        """Replace the index from (task_id, thread_id) and (task_id, user_id) rows."""
+        self._task_by_thread = {}
+        self._thread_by_task = {}
+        for task_id, thread_id in threads:
+            self.set_thread(task_id, thread_id)
+        self._assignees = {}
+        for task_id, user_id in assignees:
+            self._assignees.setdefault(task_id, set()).add(user_id)
+
+    def lookup(self, thread_id: int) -> Optional[Tuple[int, FrozenSet[int]]]:
+        task_id = self._task_by_thread.get(thread_id)
+        if task_id is None:
+            self.skipped += 1
+            return None
+        self.hits += 1
+        return task_id, frozenset(self._assignees.get(task_id, ()))
+
+    def set_thread(self, task_id: int, thread_id: Optional[int]):
+        old_thread = self._thread_by_task.pop(task_id, None)
+        if old_thread is not None:
+            self._task_by_thread.pop(old_thread, None)
+        if thread_id:
+            self._task_by_thread[thread_id] = task_id
+            self._thread_by_task[task_id] = thread_id
+
+    def add_assignee(self, task_id: int, user_id: int):
+        self._assignees.setdefault(task_id, set()).add(user_id)
+
+    def remove_assignee(self, task_id: int, user_id: int):
+        self._assignees.get(task_id, set()).discard(user_id)
+
+    def remove_task(self, task_id: int):
+        self.set_thread(task_id, None)
+        self._assignees.pop(task_id, None)
+
+    def __len__(self) -> int:
+        return len(self._task_by_thread)
+
+
+thread_index = ThreadIndex()
+
+
+class ProjectRoleCache:
+    """Cached member-role suffix -> [project role id] map used by role sync."""
+
+    def __init__(self):
+        self._by_suffix: Optional[Dict[str, List[int]]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._by_suffix is not None
+
+    def load(self, rows: Iterable[Tuple[str, int]]):
+        by_suffix: Dict[str, List[int]] = {}
+        for suffix, role_id in rows:
+            by_suffix.setdefault(suffix, []).append(role_id)
+        self._by_suffix = by_suffix
+
+    def get(self) -> Dict[str, List[int]]:
+        return self._by_suffix or {}
+
+    def invalidate(self):
+        self._by_suffix = None
+
+
+project_role_cache = ProjectRoleCache()
+
+
+class ProjectChannelIndex:
+    """
+    Resident channel_id / category_id -> project map, with each project's
+    template channels by name.
+
+    Loaded once at startup from projects and project_channels and kept
+    current by the project and project channel write paths in database.py,
+    so finding the project a channel belongs to is one exact dict lookup
+    instead of matching acronyms against the channel name.
+    """
+
+    def __init__(self):
+        self._projects: Dict[int, Project] = {}
+        self._by_channel: Dict[int, int] = {}
+        self._by_category: Dict[int, int] = {}
+        self._channels: Dict[int, Dict[str, int]] = {}
+
+    def load(self, projects: Iterable[Project], channels: Iterable[Tuple[int, int, str]]):
+        """Replace the index from projects and (project_id, channel_id, name) rows."""
+        self._projects = {}
+        self._by_channel = {}
+        self._by_category = {}
+        self._channels = {}
+        for project in projects:
+            self.add_project(project)
+        for project_id, channel_id, name in channels:
+            self.add_channel(project_id, channel_id, name)
+
+    def add_project(self, project: Project):
+        self._projects[project.id] = project
+        if project.category_id:
+            self._by_category[project.category_id] = project.id
+
+    def remove_project(self, project_id: int):
+        project = self._projects.pop(project_id, None)
+        if project and self._by_category.get(project.category_id) == project_id:
+            del self._by_category[project.category_id]
+        for channel_id in self._channels.pop(project_id, {}).values():
+            self._by_channel.pop(channel_id, None)
+
+    def add_channel(self, project_id: int, channel_id: int, name: str):
+        self._by_channel[channel_id] = project_id
+        self._channels.setdefault(project_id, {})[name] = channel_id
+
+    def remove_channel(self, project_id: int, name: str):
+        channel_id = self._channels.get(project_id, {}).pop(name, None)
+        if channel_id is not None and self._by_channel.get(channel_id) == project_id:
+            del self._by_channel[channel_id]
+
+    def project_for(self, channel_id: int, category_id: Optional[int] = None) -> Optional[Project]:
+        """The project owning a channel, or the project whose category it sits in."""
+        project_id = self._by_channel.get(channel_id)
+        if project_id is None and category_id is not None:
+            project_id = self._by_category.get(category_id)
+        return self._projects.get(project_id) if project_id is not None else None
+
+    def __len__(self) -> int:
+        return len(self._by_channel)
+
+
+project_index = ProjectChannelIndex()
+
+
+class ServerConfigCache:
+    """
+    Resident guild_id -> ServerConfig map.
+
+    Loaded once at startup and replaced by upsert_server_config after its
+    commit, so config reads never touch SQLite or parse JSON. Every write
+    bumps the guild's version, so state derived from a config can be
+    checked for staleness with one comparison.
+    """
+
+    def __init__(self):
+        self._configs: Dict[int, ServerConfig] = {}
+
+    def load(self, configs: Iterable[ServerConfig]):
+        self._configs = {c.guild_id: replace(c, version=1) for c in configs}
+
+    def get(self, guild_id: int) -> ServerConfig:
+        """The guild's config, or the defaults (version 0) if it was never configured."""
+        config = self._configs.get(guild_id)
+        return config if config is not None else ServerConfig(guild_id=guild_id)
+
+    def put(self, config: ServerConfig) -> ServerConfig:
+        config = replace(config, version=self.get(config.guild_id).version + 1)
+        self._configs[config.guild_id] = config
+        return config
+
+
+server_configs = ServerConfigCache()
@@ -15,7 +15,7 @@ from ..database import (
     get_all_projects,
     get_project_by_acronym,
     get_all_acronyms,
-    create_project,
+    get_all_project_task_stats,
     delete_project,
     get_all_template_channels,
     get_groups_dict,
@@ -23,16 +23,16 @@ from ..database import (
     remove_project_channel as db_remove_project_channel,
     get_project_channels,
     get_project_channel_by_name,
-    add_project_role,
     get_project_roles,
     get_all_groups,
     get_group,
 )
+from ..provisioning import provision_project
+from ..role_sync import sync_members
 from ..utils import (
     generate_acronym,
     resolve_acronym_conflict,
     format_channel_name,
-    format_role_name,
 )
 
 
@@ -72,44 +72,12 @@ class ProjectsCog(commands.Cog):
         template_channels = await get_all_template_channels()
         groups = await get_groups_dict()
         
+        role_color = discord.Color(random.choice(ROLE_COLORS))
+        
         try:
-            category = await guild.create_category(name=name)
-            project = await create_project(name, acronym, category.id)
-            role_color = discord.Color(random.choice(ROLE_COLORS))
-            
-            created_roles = []
-            for role_name in MEMBER_ROLES:
-                project_role_name = format_role_name(acronym, role_name)
-                role = await guild.create_role(
-                    name=project_role_name,
-                    color=role_color,
-                    reason=f"Project: {name}"
-                )
-                await add_project_role(project.id, role.id, role_name)
-                created_roles.append(role)
-            
-            for template_ch in template_channels:
-                emoji = groups.get(template_ch.group_name, "")
-                channel_name = format_channel_name(emoji, acronym, template_ch.name)
-                
-                if template_ch.is_voice:
-                    channel = await category.create_voice_channel(name=channel_name)
-                else:
-                    channel = await category.create_text_channel(
-                        name=channel_name,
-                        topic=template_ch.description
-                    )
-                
-                await add_project_channel(
-                    project_id=project.id,
-                    channel_id=channel.id,
-                    name=template_ch.name,
-                    group_name=template_ch.group_name,
-                    is_custom=False,
-                    is_voice=template_ch.is_voice
-                )
-            
-            await self.bot.sync_all_project_roles()
+            project, category, created_roles = await provision_project(
+                guild, name, acronym, template_channels, groups, role_color
+            )
             
             embed = discord.Embed(
                 title=f"Created: {name}",
@@ -124,6 +92,14 @@ class ProjectsCog(commands.Cog):
             
         except discord.HTTPException as e:
             await interaction.followup.send(f"Error creating project: {e}")
+            return
+        
+        # Only members holding a member role can need the new project roles
+        members = [
+            m for m in guild.members
+            if not m.bot and any(r.name in MEMBER_ROLES for r in m.roles)
+        ]
+        await sync_members(guild, members)
     
     @project_group.command(name="delete", description="Delete a project and all its channels/roles")
     @app_commands.describe(acronym="Project acronym to delete")
@@ -181,10 +157,16 @@ class ProjectsCog(commands.Cog):
             return
         
         embed = discord.Embed(title="Projects", color=discord.Color.blue())
+        all_stats = await get_all_project_task_stats()
         
         for project in projects:
             category = interaction.guild.get_channel(project.category_id)
             category_status = category.mention if category else "(category deleted)"
+            stats = all_stats.get(project.acronym)
+            if stats and stats.total:
+                category_status += f"\nTasks: {stats.open} open, {stats.overdue} overdue, {stats.done} done"
+                if stats.last_activity:
+                    category_status += f" - last activity {str(stats.last_activity)[:10]}"
             embed.add_field(
                 name=f"{project.acronym} - {project.name}",
                 value=category_status,
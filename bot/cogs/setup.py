@@ -1,12 +1,11 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import json
 import re
+from dataclasses import replace
 from typing import Optional
 
 from ..database import (
-    get_server_config,
     upsert_server_config,
     get_all_template_channels,
     upsert_template_channel,
@@ -21,26 +20,17 @@ from ..database import (
     create_project,
     get_project_by_acronym,
     add_project_role,
+    get_role_sync_progress,
+    rebuild_project_task_stats,
+    history_writer,
 )
+from ..cache import thread_index, server_configs
+from ..models import ServerConfig
 from ..utils import format_channel_name
 
 
-DEFAULT_CONFIG = {
-    'channel_mode': 'per_project',
-    'board_channel_template': 'tasks',
-    'questions_channel_template': 'questions',
-    'leads_channel_template': 'leads',
-    'global_board_channel_id': None,
-    'global_questions_channel_id': None,
-    'global_leads_channel_id': None,
-    'lead_role_ids': [],
-    'approval_mode': 'auto',
-    'approval_threshold': None,
-    'reminder_interval_hours': 1,
-    'deadline_warning_hours': 24,
-    'stagnant_days': 3,
-    'reminders_enabled': True,
-}
+# Settings dict edited by the setup wizard; defaults live on ServerConfig
+DEFAULT_CONFIG = ServerConfig(guild_id=0).settings()
 
 
 class ChannelModeSelect(discord.ui.Select):
@@ -494,8 +484,10 @@ class SetupWizardView(discord.ui.View):
         return embed
 
     async def confirm_setup(self, interaction: discord.Interaction):
-        config_json = json.dumps(self.config)
-        await upsert_server_config(self.guild_id, config_json, setup_completed=True)
+        await upsert_server_config(ServerConfig.from_settings(self.guild_id, self.config, setup_completed=True))
+        tasks_cog = interaction.client.get_cog("TasksCog")
+        if tasks_cog and tasks_cog.reminders:
+            tasks_cog.reminders.wake()
         embed = discord.Embed(
             title="\u2705 Setup Complete!",
             description="The task system has been configured.\n\nUse `/task new` to create tasks, `/task board` to view boards.",
@@ -519,13 +511,8 @@ class AdminCog(commands.Cog):
     @admin_group.command(name="setup", description="Configure the task management system")
     @app_commands.checks.has_permissions(administrator=True)
     async def admin_setup(self, interaction: discord.Interaction):
-        existing = await get_server_config(interaction.guild.id)
-        existing_config = None
-        if existing and existing.config_json:
-            try:
-                existing_config = json.loads(existing.config_json)
-            except json.JSONDecodeError:
-                pass
+        existing = server_configs.get(interaction.guild.id)
+        existing_config = existing.settings() if existing.version else None
 
         embed = discord.Embed(
             title="🔧 Task System Setup",
@@ -545,9 +532,9 @@ class AdminCog(commands.Cog):
 
     @admin_group.command(name="status", description="Show current setup configuration")
     async def admin_status(self, interaction: discord.Interaction):
-        config = await get_server_config(interaction.guild.id)
+        config = server_configs.get(interaction.guild.id)
 
-        if not config or not config.setup_completed:
+        if not config.setup_completed:
             embed = discord.Embed(
                 title="\u26a0\ufe0f Setup Not Completed",
                 description="Run `/admin setup` to configure the task system.",
@@ -556,34 +543,66 @@ class AdminCog(commands.Cog):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        try:
-            cfg = json.loads(config.config_json)
-        except json.JSONDecodeError:
-            cfg = DEFAULT_CONFIG
-
         embed = discord.Embed(title="\u2699\ufe0f Server Configuration", color=discord.Color.blue())
-        mode = "Per-Project" if cfg.get('channel_mode') == 'per_project' else "Global"
+        mode = "Per-Project" if config.channel_mode == 'per_project' else "Global"
         embed.add_field(name="Channel Mode", value=mode, inline=True)
 
-        if cfg.get('channel_mode') == 'per_project':
+        if config.channel_mode == 'per_project':
             embed.add_field(
                 name="Templates",
-                value=f"Board: `{cfg.get('board_channel_template', 'tasks')}`\nQuestions: `{cfg.get('questions_channel_template', 'questions')}`\nLeads: `{cfg.get('leads_channel_template', 'leads')}`",
+                value=f"Board: `{config.board_channel_template}`\nQuestions: `{config.questions_channel_template}`\nLeads: `{config.leads_channel_template}`",
                 inline=True
             )
         else:
             embed.add_field(
                 name="Channels",
-                value=f"Board: <#{cfg.get('global_board_channel_id')}>\nQuestions: <#{cfg.get('global_questions_channel_id')}>\nLeads: <#{cfg.get('global_leads_channel_id')}>",
+                value=f"Board: <#{config.global_board_channel_id}>\nQuestions: <#{config.global_questions_channel_id}>\nLeads: <#{config.global_leads_channel_id}>",
                 inline=True
             )
 
-        lead_ids = cfg.get('lead_role_ids', [])
-        lead_mentions = ' '.join(f"<@&{rid}>" for rid in lead_ids) if lead_ids else "Not set"
+        lead_mentions = ' '.join(f"<@&{rid}>" for rid in sorted(config.lead_role_ids)) or "Not set"
         embed.add_field(name="Lead Roles", value=lead_mentions, inline=False)
 
         approval_modes = {'auto': "Auto", 'all': "All Must Approve", 'majority': "Majority", 'any': "Any Can Close"}
-        embed.add_field(name="Approval Mode", value=approval_modes.get(cfg.get('approval_mode', 'auto'), 'Auto'), inline=True)
+        embed.add_field(name="Approval Mode", value=approval_modes.get(config.approval_mode, 'Auto'), inline=True)
+
+        embed.add_field(
+            name="Thread Monitor",
+            value=(
+                f"Task threads indexed: {len(thread_index)}\n"
+                f"Messages short-circuited: {thread_index.hits + thread_index.skipped} "
+                f"({thread_index.skipped} outside task threads)"
+            ),
+            inline=False
+        )
+
+        last_flush = f"{history_writer.last_flush_ms:.1f} ms" if history_writer.last_flush_ms is not None else "n/a"
+        embed.add_field(
+            name="Task History Queue",
+            value=(
+                f"Pending: {history_writer.depth}\n"
+                f"Written: {history_writer.flushed} in {history_writer.flushes} batches\n"
+                f"Flush latency: {last_flush} last, {history_writer.max_flush_ms:.1f} ms max"
+            ),
+            inline=False
+        )
+
+        tasks_cog = self.bot.get_cog("TasksCog")
+        if tasks_cog:
+            dashboards = tasks_cog.dashboards
+            embed.add_field(
+                name="Dashboards",
+                value=f"Updates requested: {dashboards.requested}\nRenders: {dashboards.rendered}",
+                inline=False
+            )
+            reminders = tasks_cog.reminders
+            if reminders:
+                next_due = reminders.next_due.strftime('%Y-%m-%d %H:%M UTC') if reminders.next_due else "none"
+                embed.add_field(
+                    name="Reminders",
+                    value=f"Pending: {reminders.pending}\nSent: {reminders.sent}\nNext due: {next_due}",
+                    inline=False
+                )
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
@@ -683,12 +702,81 @@ class AdminCog(commands.Cog):
         )
         await interaction.followup.send(embed=embed, view=view)
 
+    @admin_group.command(name="rolesync", description="Show or start the background project role sync")
+    @app_commands.describe(action="status: show progress, start: sync changed members, restart: resync everyone")
+    @app_commands.choices(action=[
+        app_commands.Choice(name="status", value="status"),
+        app_commands.Choice(name="start", value="start"),
+        app_commands.Choice(name="restart", value="restart"),
+    ])
+    @app_commands.checks.has_permissions(administrator=True)
+    async def admin_rolesync(self, interaction: discord.Interaction, action: str = "status"):
+        job = self.bot.role_sync
+        note = None
+        if action in ("start", "restart"):
+            started = await self.bot.sync_all_project_roles(restart=(action == "restart"))
+            note = "Role sync started." if started else "Role sync already running, it will repeat once finished."
+
+        progress = job.progress
+        if not job.running and progress.status == 'idle':
+            saved = await get_role_sync_progress()
+            if saved:
+                progress = saved
+
+        status = "Running" if job.running else progress.status.capitalize()
+        embed = discord.Embed(title="Project Role Sync", description=note, color=discord.Color.blue())
+        embed.add_field(name="Status", value=status, inline=True)
+        embed.add_field(name="Progress", value=f"{progress.processed}/{progress.total} members", inline=True)
+
+        eta = job.eta_seconds()
+        if eta is not None:
+            embed.add_field(name="ETA", value=f"~{int(eta // 60)}m {int(eta % 60)}s", inline=True)
+
+        embed.add_field(
+            name="Results",
+            value=f"Updated: {progress.updated}\nUnchanged: {progress.skipped}\nFailed: {progress.failed}",
+            inline=False
+        )
+        if progress.started_at:
+            embed.set_footer(text=f"Started {progress.started_at} UTC")
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @admin_group.command(name="commandsync", description="Force a slash command sync with Discord")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def admin_commandsync(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            await self.bot.sync_command_tree(force=True)
+        except discord.HTTPException as e:
+            await interaction.followup.send(f"Command sync failed: {e}", ephemeral=True)
+            return
+        await interaction.followup.send("Slash commands synced.", ephemeral=True)
+
+    @admin_group.command(name="rebuildstats", description="Recount the per-project task statistics")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def admin_rebuildstats(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+        repaired = await rebuild_project_task_stats()
+        if repaired:
+            await interaction.followup.send(f"Task statistics rebuilt, {repaired} project(s) had drifted.", ephemeral=True)
+        else:
+            await interaction.followup.send("Task statistics rebuilt, all counts were already correct.", ephemeral=True)
+
     @admin_group.command(name="config", description="Configure reminder and notification settings")
     @app_commands.describe(
         reminders_enabled="Enable/disable automatic reminders",
-        reminder_interval="Hours between reminder checks (1-24)",
+        reminder_interval="Minimum hours between two reminders to the same task (1-24)",
         deadline_warning="Hours before deadline to warn (1-72)",
-        stagnant_days="Days of inactivity before stagnant reminder (1-14)"
+        stagnant_days="Days of inactivity before stagnant reminder (1-14)",
+        reminder_digest="Roll reminders due together into one post per project or one DM per assignee"
+    )
+    @app_commands.choices(
+        reminder_digest=[
+            app_commands.Choice(name="off (post in each task thread)", value="off"),
+            app_commands.Choice(name="per project", value="project"),
+            app_commands.Choice(name="per user", value="user"),
+        ]
     )
     @app_commands.checks.has_permissions(administrator=True)
     async def admin_config(
@@ -697,33 +785,35 @@ class AdminCog(commands.Cog):
         reminders_enabled: bool = None,
         reminder_interval: app_commands.Range[int, 1, 24] = None,
         deadline_warning: app_commands.Range[int, 1, 72] = None,
-        stagnant_days: app_commands.Range[int, 1, 14] = None
+        stagnant_days: app_commands.Range[int, 1, 14] = None,
+        reminder_digest: str = None
     ):
-        server_config = await get_server_config(interaction.guild.id)
-        if server_config and server_config.config_json:
-            try:
-                cfg = json.loads(server_config.config_json) if isinstance(server_config.config_json, str) else server_config.config_json
-            except json.JSONDecodeError:
-                cfg = DEFAULT_CONFIG.copy()
-        else:
-            cfg = DEFAULT_CONFIG.copy()
+        cfg = server_configs.get(interaction.guild.id)
 
+        changes = {}
         updated = []
         if reminders_enabled is not None:
-            cfg['reminders_enabled'] = reminders_enabled
+            changes['reminders_enabled'] = reminders_enabled
             updated.append(f"Reminders: {'Enabled' if reminders_enabled else 'Disabled'}")
         if reminder_interval is not None:
-            cfg['reminder_interval_hours'] = reminder_interval
+            changes['reminder_interval_hours'] = reminder_interval
             updated.append(f"Reminder interval: {reminder_interval}h")
         if deadline_warning is not None:
-            cfg['deadline_warning_hours'] = deadline_warning
+            changes['deadline_warning_hours'] = deadline_warning
             updated.append(f"Deadline warning: {deadline_warning}h before")
         if stagnant_days is not None:
-            cfg['stagnant_days'] = stagnant_days
+            changes['stagnant_days'] = stagnant_days
             updated.append(f"Stagnant threshold: {stagnant_days} days")
+        if reminder_digest is not None:
+            changes['reminder_digest'] = reminder_digest
+            updated.append(f"Reminder digest: {reminder_digest}")
 
         if updated:
-            await upsert_server_config(interaction.guild.id, json.dumps(cfg))
+            # setup_completed carries over, a settings tweak does not undo /admin setup
+            await upsert_server_config(replace(cfg, **changes))
+            tasks_cog = self.bot.get_cog("TasksCog")
+            if tasks_cog and tasks_cog.reminders:
+                tasks_cog.reminders.wake()
             embed = discord.Embed(
                 title="Configuration Updated",
                 description="\n".join(updated),
@@ -736,22 +826,27 @@ class AdminCog(commands.Cog):
             )
             embed.add_field(
                 name="Reminders",
-                value="Enabled" if cfg.get('reminders_enabled', True) else "Disabled",
+                value="Enabled" if cfg.reminders_enabled else "Disabled",
                 inline=True
             )
             embed.add_field(
                 name="Reminder Interval",
-                value=f"{cfg.get('reminder_interval_hours', 1)}h",
+                value=f"{cfg.reminder_interval_hours}h",
                 inline=True
             )
             embed.add_field(
                 name="Deadline Warning",
-                value=f"{cfg.get('deadline_warning_hours', 24)}h before",
+                value=f"{cfg.deadline_warning_hours}h before",
                 inline=True
             )
             embed.add_field(
                 name="Stagnant Threshold",
-                value=f"{cfg.get('stagnant_days', 3)} days",
+                value=f"{cfg.stagnant_days} days",
+                inline=True
+            )
+            embed.add_field(
+                name="Reminder Digest",
+                value=cfg.reminder_digest,
                 inline=True
             )
             embed.set_footer(text="Use parameters to update: /admin config reminders_enabled:True reminder_interval:2")
@@ -1,27 +1,27 @@
+import aiohttp
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
-from datetime import datetime
+from discord.ext import commands
+from datetime import datetime, timezone
+import asyncio
+import functools
+import hashlib
 import json
-import xml.etree.ElementTree as ET
-from typing import Optional, List
+import time
+from typing import Awaitable, Callable, Optional, List, Set
 
-from ..config import GUILD_ID
+from ..config import GUILD_ID, DASHBOARD_DEBOUNCE_SECONDS, REMINDER_CONCURRENCY
 from ..database import (
     get_all_projects,
     get_project_by_acronym,
     create_task,
     get_task,
     get_task_by_thread_id,
-    get_tasks_by_project,
-    get_tasks_by_assignee,
-    get_tasks_by_status,
-    get_tasks_due_soon,
-    get_stagnant_tasks,
+    get_task_page,
+    get_project_task_stats,
     update_task_thread,
     update_task_status,
     update_task_eta,
-    update_task_assignee,
     update_task_priority,
     update_task_header_message,
     add_task_history,
@@ -31,18 +31,41 @@ from ..database import (
     add_task_assignee,
     remove_task_assignee,
     get_task_assignees,
+    get_assignees_for_tasks,
     get_task_primary_assignee,
     set_task_primary_assignee,
     clear_task_primary_assignee,
     set_task_assignee_approval,
     get_task_approval_status,
-    reset_task_approvals,
     is_user_task_assignee,
-    get_tasks_by_assignee_multi,
-    get_server_config,
-    is_setup_completed,
+    load_thread_index,
+    search_tasks,
+    get_bot_state,
+    set_bot_state,
+    delete_bot_state,
+    add_task_listener,
+    remove_task_listener,
+    get_import_job,
+    get_import_job_by_hash,
+    get_recent_import_jobs,
+    interrupt_running_import_jobs,
+    transaction,
 )
-from ..models import Task
+from ..cache import thread_index, project_index, server_configs
+from ..dashboard import DebouncedRenderer, embed_hash
+from ..reminders import ReminderScheduler, digest_chunks
+from ..task_import import (
+    ImportItem,
+    ImportValidator,
+    attachment_chunks,
+    hashed_chunks,
+    iter_json_rows,
+    iter_xml_rows,
+    start_import_job,
+    resume_import_job,
+    run_import_job,
+)
+from ..models import ImportJob, ImportJobRow, Project, ProjectTaskStats, Task, TaskPage
 
 
 # Status display mapping
@@ -70,6 +93,13 @@ STATUS_EMOJI = {
     'cancelled': '\u274c'      # x mark
 }
 
+# Status columns of a task board, one message each
+BOARD_STATUSES = ['todo', 'progress', 'review', 'done']
+BOARD_PAGE_SIZE = 10
+
+# Least seconds between edits of the /task import progress message
+IMPORT_PROGRESS_INTERVAL = 2.0
+
 PRIORITY_EMOJI = {
     'Critical': '\U0001f534',  # red circle
     'High': '\U0001f7e0',      # orange circle
@@ -112,6 +142,19 @@ ROLE_TASK_STYLE = {
 }
 
 
+def member_is_lead(member: discord.Member) -> bool:
+    """
+    Admins and holders of a lead role configured in /admin setup. Until lead
+    roles are configured, any role with 'lead' or 'admin' in its name counts.
+    """
+    if member.guild_permissions.administrator:
+        return True
+    config = server_configs.get(member.guild.id)
+    if config.lead_role_ids:
+        return config.is_lead(r.id for r in member.roles)
+    return any('lead' in r.name.lower() or 'admin' in r.name.lower() for r in member.roles)
+
+
 class AddMemberModal(discord.ui.Modal, title='Add Team Member'):
     user_id_input = discord.ui.TextInput(
         label='User ID',
@@ -142,8 +185,9 @@ class AddMemberModal(discord.ui.Modal, title='Add Team Member'):
             await interaction.response.send_message("User not found in this server.", ephemeral=True)
             return
 
-        await add_task_assignee(self.task_id, user_id)
-        await add_task_history(self.task_id, interaction.user.id, 'add_assignee', None, str(user_id))
+        async with transaction():
+            await add_task_assignee(self.task_id, user_id)
+            await add_task_history(self.task_id, interaction.user.id, 'add_assignee', None, str(user_id))
 
         await self.cog.update_control_panel(interaction, task)
         await self.cog.update_header_message(interaction, task)
@@ -220,9 +264,10 @@ class ManageTeamView(discord.ui.View):
             await interaction.response.send_message("No primary owner set.", ephemeral=True)
             return
 
-        await clear_task_primary_assignee(self.task_id)
-        task = await get_task(self.task_id)
-        await add_task_history(self.task_id, interaction.user.id, 'remove_primary', str(primary.user_id), None)
+        async with transaction():
+            await clear_task_primary_assignee(self.task_id)
+            task = await get_task(self.task_id)
+            await add_task_history(self.task_id, interaction.user.id, 'remove_primary', str(primary.user_id), None)
         await self.cog.update_control_panel(interaction, task)
         await self.cog.update_header_message(interaction, task)
         await interaction.response.send_message("Primary owner removed. Team approval rules now apply.", ephemeral=True)
@@ -236,9 +281,10 @@ class RemoveMemberSelect(discord.ui.Select):
 
     async def callback(self, interaction: discord.Interaction):
         user_id = int(self.values[0])
-        await remove_task_assignee(self.task_id, user_id)
-        task = await get_task(self.task_id)
-        await add_task_history(self.task_id, interaction.user.id, 'remove_assignee', str(user_id), None)
+        async with transaction():
+            await remove_task_assignee(self.task_id, user_id)
+            task = await get_task(self.task_id)
+            await add_task_history(self.task_id, interaction.user.id, 'remove_assignee', str(user_id), None)
         await self.cog.update_control_panel(interaction, task)
         await self.cog.update_header_message(interaction, task)
         await self.cog.update_dashboard(task.project_acronym, interaction.client)
@@ -257,11 +303,11 @@ class SetPrimarySelect(discord.ui.Select):
     async def callback(self, interaction: discord.Interaction):
         user_id = int(self.values[0])
         old_primary = await get_task_primary_assignee(self.task_id)
-        await set_task_primary_assignee(self.task_id, user_id)
-        task = await get_task(self.task_id)
-        
         old_val = str(old_primary.user_id) if old_primary else None
-        await add_task_history(self.task_id, interaction.user.id, 'set_primary', old_val, str(user_id))
+        async with transaction():
+            await set_task_primary_assignee(self.task_id, user_id)
+            task = await get_task(self.task_id)
+            await add_task_history(self.task_id, interaction.user.id, 'set_primary', old_val, str(user_id))
         
         await self.cog.update_control_panel(interaction, task)
         await self.cog.update_header_message(interaction, task)
@@ -271,23 +317,66 @@ class SetPrimarySelect(discord.ui.Select):
         await interaction.response.send_message(f"Set {name} as primary owner.", ephemeral=True)
 
 
-class HeaderView(discord.ui.View):
-    """View attached to the header message (channel message before thread)."""
+class TaskComponent(discord.ui.DynamicItem[discord.ui.Button], template=r'(?P<action>(?:task|header)_[a-z_]+):(?P<task_id>[0-9]+)'):
+    """
+    Persistent button for any task, matched by the `action:task_id` custom_id.
+
+    Registered once at startup; a press rebuilds the owning TaskView or
+    HeaderView for that task and runs the decorated handler named by the
+    action, so no per-task view objects are kept in memory.
+    """
+
+    def __init__(self, item: discord.ui.Button, action: str, task_id: int):
+        super().__init__(item)
+        self.action = action
+        self.task_id = task_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(item, match['action'], int(match['task_id']))
+
+    async def callback(self, interaction: discord.Interaction):
+        view_cls = HeaderView if self.action.startswith('header_') else TaskView
+        view = view_cls(self.task_id, interaction.client.get_cog('TasksCog'))
+        handler = view.actions.get(self.action)
+        if handler and await view.interaction_check(interaction):
+            await handler.callback(interaction)
+
+
+class TaskComponentView(discord.ui.View):
+    """
+    Base for persistent task views.
+
+    The decorated buttons define layout and handlers; on init each is swapped
+    for a TaskComponent carrying the task id, so sending the view stores no
+    per-message state and presses are routed back here by TaskComponent.
+    """
+
     def __init__(self, task_id: int, cog: 'TasksCog'):
         super().__init__(timeout=None)
         self.task_id = task_id
         self.cog = cog
-        
-        # Update custom_ids to include task_id for persistence
-        for item in self.children:
-            if hasattr(item, 'custom_id') and item.custom_id:
-                item.custom_id = f"{item.custom_id}:{task_id}"
+        self.actions = {}
+
+        for item in list(self.children):
+            if not getattr(item, 'custom_id', None):
+                continue
+            self.actions[item.custom_id] = item
+            self.remove_item(item)
+            button = discord.ui.Button(
+                label=item.label,
+                style=item.style,
+                emoji=item.emoji,
+                custom_id=f"{item.custom_id}:{task_id}"
+            )
+            self.add_item(TaskComponent(button, item.custom_id, task_id))
+
+
+class HeaderView(TaskComponentView):
+    """View attached to the header message (channel message before thread)."""
 
     async def check_lead(self, interaction: discord.Interaction) -> bool:
-        if interaction.user.guild_permissions.administrator:
-            return True
-        lead_roles = [r for r in interaction.user.roles if 'lead' in r.name.lower() or 'admin' in r.name.lower()]
-        if not lead_roles:
+        if not member_is_lead(interaction.user):
             await interaction.response.send_message("Only Leads/Admins can use this button.", ephemeral=True)
             return False
         return True
@@ -337,8 +426,9 @@ class HeaderView(discord.ui.View):
             return
 
         old_status = task.status
-        await update_task_status(self.task_id, 'cancelled')
-        await add_task_history(self.task_id, interaction.user.id, 'status_change', old_status, 'cancelled')
+        async with transaction():
+            await update_task_status(self.task_id, 'cancelled')
+            await add_task_history(self.task_id, interaction.user.id, 'status_change', old_status, 'cancelled')
 
         task.status = 'cancelled'
         await interaction.response.send_message("Task cancelled.", ephemeral=True)
@@ -382,8 +472,9 @@ class PrioritySelectView(discord.ui.View):
 
         old_priority = task.priority
         new_priority = select.values[0]
-        await update_task_priority(self.task_id, new_priority)
-        await add_task_history(self.task_id, interaction.user.id, 'priority_change', old_priority, new_priority)
+        async with transaction():
+            await update_task_priority(self.task_id, new_priority)
+            await add_task_history(self.task_id, interaction.user.id, 'priority_change', old_priority, new_priority)
 
         task.priority = new_priority
         await self.cog.update_control_panel(interaction, task)
@@ -442,6 +533,7 @@ class QuestionModal(discord.ui.Modal, title='Ask a Question'):
 
         view = LeadReplyView(self.task_id, task.thread_id, interaction.user.id, self.cog)
         await leads_channel.send(embed=embed, view=view)
+        await add_task_history(self.task_id, interaction.user.id, 'question', None, str(self.question_input))
 
         await interaction.response.send_message(
             "Your question has been sent to the leads!\n"
@@ -502,11 +594,9 @@ class LeadReplyView(discord.ui.View):
 
     @discord.ui.button(label='Reply', style=discord.ButtonStyle.success, emoji='\U0001f4ac')
     async def reply_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not interaction.user.guild_permissions.administrator:
-            lead_roles = [r for r in interaction.user.roles if 'lead' in r.name.lower() or 'admin' in r.name.lower()]
-            if not lead_roles:
-                await interaction.response.send_message("Only leads can reply.", ephemeral=True)
-                return
+        if not member_is_lead(interaction.user):
+            await interaction.response.send_message("Only leads can reply.", ephemeral=True)
+            return
 
         modal = LeadReplyModal(self.task_id, self.thread_id, self.asker_id, self.cog)
         await interaction.response.send_modal(modal)
@@ -532,8 +622,9 @@ class ETAModal(discord.ui.Modal, title='Update ETA'):
             return
 
         old_eta = task.eta
-        await update_task_eta(self.task_id, str(self.eta_input))
-        await add_task_history(self.task_id, interaction.user.id, 'eta_update', old_eta, str(self.eta_input))
+        async with transaction():
+            await update_task_eta(self.task_id, str(self.eta_input))
+            await add_task_history(self.task_id, interaction.user.id, 'eta_update', old_eta, str(self.eta_input))
 
         task.eta = str(self.eta_input)
         await self.cog.update_control_panel(interaction, task)
@@ -541,16 +632,7 @@ class ETAModal(discord.ui.Modal, title='Update ETA'):
         await interaction.response.send_message(f"ETA updated to: {self.eta_input}", ephemeral=True)
 
 
-class TaskView(discord.ui.View):
-    def __init__(self, task_id: int, cog: 'TasksCog'):
-        super().__init__(timeout=None)
-        self.task_id = task_id
-        self.cog = cog
-        
-        for item in self.children:
-            if hasattr(item, 'custom_id') and item.custom_id:
-                item.custom_id = f"{item.custom_id}:{task_id}"
-
+class TaskView(TaskComponentView):
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         task = await get_task(self.task_id)
         if not task:
@@ -567,21 +649,13 @@ class TaskView(discord.ui.View):
 
     async def check_assignee_or_lead(self, interaction: discord.Interaction) -> bool:
         is_assignee = await is_user_task_assignee(self.task_id, interaction.user.id)
-        if is_assignee:
-            return True
-        if interaction.user.guild_permissions.administrator:
-            return True
-        lead_roles = [r for r in interaction.user.roles if 'lead' in r.name.lower() or 'admin' in r.name.lower()]
-        if lead_roles:
+        if is_assignee or member_is_lead(interaction.user):
             return True
         await interaction.response.send_message("Only team members or leads can use this button.", ephemeral=True)
         return False
 
     async def check_lead(self, interaction: discord.Interaction) -> bool:
-        if interaction.user.guild_permissions.administrator:
-            return True
-        lead_roles = [r for r in interaction.user.roles if 'lead' in r.name.lower() or 'admin' in r.name.lower()]
-        if not lead_roles:
+        if not member_is_lead(interaction.user):
             await interaction.response.send_message("Only Leads/Admins can use this button.", ephemeral=True)
             return False
         return True
@@ -596,8 +670,9 @@ class TaskView(discord.ui.View):
             await interaction.response.send_message("Task must be in 'To Do' status to start.", ephemeral=True)
             return
 
-        await update_task_status(self.task_id, 'progress')
-        await add_task_history(self.task_id, interaction.user.id, 'status_change', 'todo', 'progress')
+        async with transaction():
+            await update_task_status(self.task_id, 'progress')
+            await add_task_history(self.task_id, interaction.user.id, 'status_change', 'todo', 'progress')
         
         task.status = 'progress'
         await interaction.response.send_message("Task started!", ephemeral=True)
@@ -614,8 +689,9 @@ class TaskView(discord.ui.View):
             await interaction.response.send_message("Task must be 'In Progress' to pause.", ephemeral=True)
             return
 
-        await update_task_status(self.task_id, 'todo')
-        await add_task_history(self.task_id, interaction.user.id, 'status_change', 'progress', 'todo')
+        async with transaction():
+            await update_task_status(self.task_id, 'todo')
+            await add_task_history(self.task_id, interaction.user.id, 'status_change', 'progress', 'todo')
 
         task.status = 'todo'
         await interaction.response.send_message("Task paused.", ephemeral=True)
@@ -649,8 +725,9 @@ class TaskView(discord.ui.View):
             return
 
         old_status = task.status
-        await update_task_status(self.task_id, 'review')
-        await add_task_history(self.task_id, interaction.user.id, 'status_change', old_status, 'review')
+        async with transaction():
+            await update_task_status(self.task_id, 'review')
+            await add_task_history(self.task_id, interaction.user.id, 'status_change', old_status, 'review')
 
         task.status = 'review'
         await interaction.response.send_message("Task submitted for review! Lead has been notified.", ephemeral=True)
@@ -686,10 +763,7 @@ class TaskView(discord.ui.View):
             return
 
         approval_status = await get_task_approval_status(self.task_id)
-        is_lead = interaction.user.guild_permissions.administrator or any(
-            'lead' in r.name.lower() or 'admin' in r.name.lower() 
-            for r in interaction.user.roles
-        )
+        is_lead = member_is_lead(interaction.user)
 
         if is_lead:
             await self._complete_task(interaction, task)
@@ -709,14 +783,7 @@ class TaskView(discord.ui.View):
         await set_task_assignee_approval(self.task_id, interaction.user.id, True)
         approval_status = await get_task_approval_status(self.task_id)
 
-        config = await get_server_config(interaction.guild.id)
-        approval_mode = 'auto'
-        if config and config.config_json:
-            try:
-                cfg = json.loads(config.config_json)
-                approval_mode = cfg.get('approval_mode', 'auto')
-            except json.JSONDecodeError:
-                pass
+        approval_mode = server_configs.get(interaction.guild.id).approval_mode
 
         total = approval_status['total']
         approved = approval_status['approved']
@@ -744,8 +811,9 @@ class TaskView(discord.ui.View):
 
     async def _complete_task(self, interaction: discord.Interaction, task: Task):
         old_status = task.status
-        await update_task_status(self.task_id, 'done')
-        await add_task_history(self.task_id, interaction.user.id, 'status_change', old_status, 'done')
+        async with transaction():
+            await update_task_status(self.task_id, 'done')
+            await add_task_history(self.task_id, interaction.user.id, 'status_change', old_status, 'done')
 
         task.status = 'done'
         await interaction.response.send_message("Task approved and closed!", ephemeral=True)
@@ -765,15 +833,125 @@ class TaskView(discord.ui.View):
                 await thread.edit(archived=True, locked=True)
 
 
+class TaskPageView(discord.ui.View):
+    """
+    Prev/next buttons over a keyset-paginated task listing.
+
+    `fetch(after=..., before=...)` loads one page (see get_task_page) and
+    `render(page)` turns it into an embed, so each press reads a single
+    page of rows however large the project is.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[..., Awaitable[TaskPage]],
+        render: Callable[[TaskPage], discord.Embed],
+        page: TaskPage
+    ):
+        super().__init__(timeout=600)
+        self.fetch = fetch
+        self.render = render
+        self.page = page
+        self.number = 1
+        self._sync_buttons()
+
+    def _sync_buttons(self):
+        self.prev_button.disabled = not self.page.has_prev
+        self.next_button.disabled = not self.page.has_next
+
+    def embed(self) -> discord.Embed:
+        embed = self.render(self.page)
+        if self.page.has_prev or self.page.has_next:
+            embed.set_footer(text=f"Page {self.number}")
+        return embed
+
+    async def _show(self, interaction: discord.Interaction, page: TaskPage, step: int):
+        if not page.tasks:
+            # Everything on the far side was deleted meanwhile, start over
+            page, self.number = await self.fetch(), 1
+        else:
+            self.number = max(1, self.number + step)
+        self.page = page
+        self._sync_buttons()
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
+    @discord.ui.button(label="Prev", style=discord.ButtonStyle.secondary, emoji="◀️")
+    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, await self.fetch(before=self.page.first_key), -1)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary, emoji="▶️")
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, await self.fetch(after=self.page.last_key), 1)
+
+
+class BoardBrowseButton(discord.ui.DynamicItem[discord.ui.Button], template=r'board_browse:(?P<status>[a-z]+):(?P<project>.+)'):
+    """
+    Persistent Browse button under each task board message.
+
+    The board only shows the newest tasks of each status; a press opens an
+    ephemeral TaskPageView over all of them.
+    """
+
+    def __init__(self, project_acronym: str, status: str):
+        super().__init__(discord.ui.Button(
+            label="Browse",
+            style=discord.ButtonStyle.secondary,
+            emoji="\U0001f4d6",
+            custom_id=f"board_browse:{status}:{project_acronym}"
+        ))
+        self.project_acronym = project_acronym
+        self.status = status
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['project'], match['status'])
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog('TasksCog')
+        fetch = functools.partial(get_task_page, project_acronym=self.project_acronym, status=self.status, limit=15)
+        page = await fetch()
+        if not page.tasks:
+            await interaction.response.send_message("No tasks here.", ephemeral=True)
+            return
+
+        title = f"{STATUS_EMOJI.get(self.status, '')} {STATUS_DISPLAY.get(self.status, self.status)} - {self.project_acronym}"
+        view = TaskPageView(fetch, lambda p: cog.create_status_embed(self.status, p, title=title), page)
+        await interaction.response.send_message(embed=view.embed(), view=view, ephemeral=True)
+
+
+def board_view(project_acronym: str, status: str) -> discord.ui.View:
+    view = discord.ui.View(timeout=None)
+    view.add_item(BoardBrowseButton(project_acronym, status))
+    return view
+
+
 class TasksCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.reminder_loop.start()
+        self.dashboards = DebouncedRenderer(self.render_dashboard, DASHBOARD_DEBOUNCE_SECONDS)
+        # Hash of the embed last written to each board message
+        self._board_hashes: dict = {}
+        # Import jobs running in this process
+        self._active_imports: set = set()
+        self.reminders = None
+        if GUILD_ID:
+            self.reminders = ReminderScheduler(int(GUILD_ID), self.send_reminders, wait_ready=self.bot.wait_until_ready)
+
+    async def cog_load(self):
+        await load_thread_index()
+        await interrupt_running_import_jobs()
+        if self.reminders:
+            add_task_listener(self.reminders.task_changed)
+            self.reminders.start()
 
     def cog_unload(self):
-        self.reminder_loop.cancel()
+        if self.reminders:
+            remove_task_listener(self.reminders.task_changed)
+            self.reminders.stop()
+        self.dashboards.cancel_all()
 
     task_group = app_commands.Group(name="task", description="Task management")
+    import_group = app_commands.Group(name="import", description="Bulk import tasks", parent=task_group)
 
     # ============== HELP COMMAND ==============
 
@@ -805,7 +983,8 @@ class TasksCog(commands.Cog):
             value=(
                 "`/task create` - Create a new task with thread\n"
                 "`/task board <project>` - Show/refresh task dashboard\n"
-                "`/task import <file>` - Bulk import from JSON/XML\n"
+                "`/task import file <file>` - Bulk import from JSON/XML\n"
+                "`/task import resume <job>` - Continue an interrupted import\n"
                 "`/task close [id]` - Close task (run in thread or specify ID)"
             ),
             inline=False
@@ -943,8 +1122,7 @@ class TasksCog(commands.Cog):
     ):
         await interaction.response.defer()
 
-        setup_complete = await is_setup_completed(interaction.guild.id)
-        if not setup_complete:
+        if not server_configs.get(interaction.guild.id).setup_completed:
             await interaction.followup.send(
                 "\u26a0\ufe0f **Setup not complete.** Some features may not work correctly.\n"
                 "Run `/setup` to configure the task system.\n\n"
@@ -959,58 +1137,67 @@ class TasksCog(commands.Cog):
                 return
             project_acronym = project_obj.acronym
         else:
-            projects = await get_all_projects()
-            project_acronym = None
-            for p in projects:
-                if p.acronym.lower() in target_channel.name.lower():
-                    project_acronym = p.acronym
-                    break
-            if not project_acronym:
+            detected = project_index.project_for(target_channel.id, target_channel.category_id)
+            if not detected:
                 await interaction.followup.send("Could not detect project. Please specify with `project` parameter.")
                 return
-
-        task = await create_task(
-            project_acronym=project_acronym,
-            title=title,
-            description=description,
-            assignee_id=assignee.id,
-            target_channel_id=target_channel.id,
-            deadline=deadline,
-            priority=priority
-        )
-
-        all_assignees = [assignee]
-        is_primary = len(additional_assignees.split(',')) > 0 if additional_assignees else False
-        await add_task_assignee(task.id, assignee.id, is_primary=is_primary)
-
-        if additional_assignees:
-            for uid_str in additional_assignees.split(','):
-                uid_str = uid_str.strip()
-                try:
-                    uid = int(uid_str)
-                    member = interaction.guild.get_member(uid)
-                    if member:
-                        await add_task_assignee(task.id, uid, is_primary=False)
-                        all_assignees.append(member)
-                except ValueError:
-                    pass
+            project_acronym = detected.acronym
 
         project_obj = await get_project_by_acronym(project_acronym)
         project_name = project_obj.name if project_obj else project_acronym
 
-        header_embed = self.create_header_embed(task, all_assignees, project_name)
-        header_view = HeaderView(task.id, self)
-        header_msg = await target_channel.send(embed=header_embed, view=header_view)
+        # The rows commit before the Discord calls so no write lock is held
+        # across REST round trips; a failed send or thread creation deletes
+        # them again, so no half-written task is left behind
+        async with transaction():
+            task = await create_task(
+                project_acronym=project_acronym,
+                title=title,
+                description=description,
+                assignee_id=assignee.id,
+                target_channel_id=target_channel.id,
+                deadline=deadline,
+                priority=priority
+            )
 
-        thread = await header_msg.create_thread(name=f"Task: {title[:50]}")
+            all_assignees = [assignee]
+            is_primary = len(additional_assignees.split(',')) > 0 if additional_assignees else False
+            await add_task_assignee(task.id, assignee.id, is_primary=is_primary)
 
-        control_embed = self.create_control_embed(task, all_assignees, project_name)
-        view = TaskView(task.id, self)
-        control_msg = await thread.send(embed=control_embed, view=view)
+            if additional_assignees:
+                for uid_str in additional_assignees.split(','):
+                    uid_str = uid_str.strip()
+                    try:
+                        uid = int(uid_str)
+                        member = interaction.guild.get_member(uid)
+                        if member:
+                            await add_task_assignee(task.id, uid, is_primary=False)
+                            all_assignees.append(member)
+                    except ValueError:
+                        pass
+
+        header_msg = None
+        thread = None
+        try:
+            header_embed = self.create_header_embed(task, all_assignees, project_name)
+            header_view = HeaderView(task.id, self)
+            header_msg = await target_channel.send(embed=header_embed, view=header_view)
+
+            thread = await header_msg.create_thread(name=f"Task: {title[:50]}")
+
+            control_embed = self.create_control_embed(task, all_assignees, project_name)
+            view = TaskView(task.id, self)
+            control_msg = await thread.send(embed=control_embed, view=view)
+        except discord.HTTPException as e:
+            await self._discard_task_messages(header_msg, thread)
+            await delete_task(task.id)
+            await interaction.followup.send(f"Failed to create task: {e}")
+            return
+
+        async with transaction():
+            await update_task_thread(task.id, thread.id, control_msg.id)
+            await update_task_header_message(task.id, header_msg.id)
 
-        await update_task_thread(task.id, thread.id, control_msg.id)
-        await update_task_header_message(task.id, header_msg.id)
-        
         task.thread_id = thread.id
         task.header_message_id = header_msg.id
 
@@ -1029,6 +1216,16 @@ class TasksCog(commands.Cog):
             f"Deadline: {deadline or 'None'}"
         )
 
+    async def _discard_task_messages(self, header_msg: Optional[discord.Message], thread: Optional[discord.Thread]):
+        """Best-effort cleanup of Discord messages for a task whose rows were dropped."""
+        for obj in (thread, header_msg):
+            if obj is None:
+                continue
+            try:
+                await obj.delete()
+            except discord.HTTPException:
+                pass
+
     def _get_role_style(self, members=None) -> dict:
         if not members:
             return ROLE_TASK_STYLE['default']
@@ -1112,27 +1309,41 @@ class TasksCog(commands.Cog):
             return
 
         try:
-            thread = interaction.guild.get_channel(task.thread_id)
-            if not thread:
-                try:
-                    thread = await interaction.guild.fetch_channel(task.thread_id)
-                except discord.NotFound:
-                    return
-            if thread:
-                msg = await thread.fetch_message(task.control_message_id)
-                assignees_data = await get_task_assignees(task.id)
-                assignees = [interaction.guild.get_member(a.user_id) for a in assignees_data]
-                assignees = [m for m in assignees if m]
-                project_obj = await get_project_by_acronym(task.project_acronym)
-                project_name = project_obj.name if project_obj else None
-                embed = self.create_control_embed(task, assignees if assignees else None, project_name)
-                view = TaskView(task.id, self) if task.status not in ('done', 'cancelled') else None
-                await msg.edit(embed=embed, view=view)
-        except discord.NotFound:
-            pass
+            assignees_data = await get_task_assignees(task.id)
+            assignees = [interaction.guild.get_member(a.user_id) for a in assignees_data]
+            assignees = [m for m in assignees if m]
+            project_obj = await get_project_by_acronym(task.project_acronym)
+            project_name = project_obj.name if project_obj else None
+            embed = self.create_control_embed(task, assignees if assignees else None, project_name)
+            view = TaskView(task.id, self) if task.status not in ('done', 'cancelled') else None
+            msg = await self._edit_or_repost(task.thread_id, task.control_message_id, embed=embed, view=view)
+            if msg is None:
+                await update_task_thread(task.id, None, None)
+            elif msg.id != task.control_message_id:
+                await update_task_thread(task.id, task.thread_id, msg.id)
         except discord.HTTPException:
             pass
 
+    async def _edit_or_repost(self, channel_id: int, message_id: int, **fields) -> Optional[discord.Message]:
+        """
+        Edit a message by its stored IDs without fetching it first.
+
+        If the message no longer exists, the channel is fetched and the content
+        re-posted there, so the caller can store the new message's ID. Returns
+        None when the channel is gone as well.
+        """
+        partial = self.bot.get_partial_messageable(channel_id).get_partial_message(message_id)
+        try:
+            return await partial.edit(**fields)
+        except discord.NotFound:
+            pass
+
+        try:
+            channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+        except discord.NotFound:
+            return None
+        return await channel.send(**fields)
+
     def create_header_embed(self, task: Task, assignees=None, project_name: str = None) -> discord.Embed:
         status = task.status or 'todo'
         role_style = self._get_role_style(assignees)
@@ -1169,17 +1380,16 @@ class TasksCog(commands.Cog):
             return
 
         try:
-            channel = interaction.guild.get_channel(task.target_channel_id)
-            if channel:
-                msg = await channel.fetch_message(task.header_message_id)
-                assignees_data = await get_task_assignees(task.id)
-                assignees = [interaction.guild.get_member(a.user_id) for a in assignees_data]
-                assignees = [m for m in assignees if m]
-                embed = self.create_header_embed(task, assignees if assignees else None)
-                view = HeaderView(task.id, self) if task.status not in ('done', 'cancelled') else None
-                await msg.edit(embed=embed, view=view)
-        except discord.NotFound:
-            pass
+            assignees_data = await get_task_assignees(task.id)
+            assignees = [interaction.guild.get_member(a.user_id) for a in assignees_data]
+            assignees = [m for m in assignees if m]
+            embed = self.create_header_embed(task, assignees if assignees else None)
+            view = HeaderView(task.id, self) if task.status not in ('done', 'cancelled') else None
+            msg = await self._edit_or_repost(task.target_channel_id, task.header_message_id, embed=embed, view=view)
+            if msg is None:
+                await update_task_header_message(task.id, None)
+            elif msg.id != task.header_message_id:
+                await update_task_header_message(task.id, msg.id)
         except discord.HTTPException:
             pass
 
@@ -1198,39 +1408,8 @@ class TasksCog(commands.Cog):
             await interaction.followup.send(f"Project `{project}` not found.")
             return
 
-        tasks = await get_tasks_by_project(project)
-
-        # Group by status
-        by_status = {
-            'todo': [],
-            'progress': [],
-            'review': [],
-            'done': []
-        }
-        for t in tasks:
-            if t.status in by_status:
-                by_status[t.status].append(t)
-
-        # Create embeds
-        embeds = []
-        for status, status_tasks in by_status.items():
-            embed = discord.Embed(
-                title=f"{STATUS_EMOJI.get(status, '')} {STATUS_DISPLAY.get(status, status)}",
-                color=STATUS_COLORS.get(status, discord.Color.greyple())
-            )
-            
-            if status_tasks:
-                desc_lines = []
-                for t in status_tasks[:10]:  # Limit to 10 per status
-                    thread_link = f"<#{t.thread_id}>" if t.thread_id else ""
-                    assignee = f"<@{t.assignee_id}>"
-                    deadline_str = f" (Due: {str(t.deadline)[:10]})" if t.deadline else ""
-                    desc_lines.append(f"**{t.title}** - {assignee}{deadline_str}\n{thread_link}")
-                embed.description = "\n".join(desc_lines)
-            else:
-                embed.description = "*No tasks*"
-            
-            embeds.append(embed)
+        project = project_obj.acronym
+        embeds = await self.create_board_embeds(project, await get_project_task_stats(project))
 
         # Check if board exists
         existing_board = await get_task_board(project)
@@ -1243,8 +1422,10 @@ class TasksCog(commands.Cog):
                     msg_ids = json.loads(existing_board.message_ids)
                     for i, msg_id in enumerate(msg_ids):
                         if i < len(embeds):
-                            msg = await channel.fetch_message(msg_id)
-                            await msg.edit(embed=embeds[i])
+                            await channel.get_partial_message(msg_id).edit(
+                                embed=embeds[i], view=board_view(project, BOARD_STATUSES[i])
+                            )
+                            self._board_hashes[msg_id] = embed_hash(embeds[i])
                     await interaction.followup.send("Board updated!")
                     return
             except (discord.NotFound, discord.HTTPException):
@@ -1252,8 +1433,8 @@ class TasksCog(commands.Cog):
 
         # Create new board messages
         msg_ids = []
-        for embed in embeds:
-            msg = await interaction.channel.send(embed=embed)
+        for status, embed in zip(BOARD_STATUSES, embeds):
+            msg = await interaction.channel.send(embed=embed, view=board_view(project, status))
             msg_ids.append(msg.id)
 
         await upsert_task_board(project, interaction.channel.id, json.dumps(msg_ids))
@@ -1280,6 +1461,8 @@ class TasksCog(commands.Cog):
             return
 
         target_channel = channel or interaction.channel
+        project = project_obj.acronym
+        header_key = f"board_header:{project}"
 
         # Check if board already exists
         existing_board = await get_task_board(project)
@@ -1289,71 +1472,117 @@ class TasksCog(commands.Cog):
                 old_channel = interaction.guild.get_channel(existing_board.channel_id)
                 if old_channel:
                     msg_ids = json.loads(existing_board.message_ids)
+                    old_header = await get_bot_state(header_key)
+                    if old_header:
+                        msg_ids.append(int(old_header))
                     for msg_id in msg_ids:
                         try:
-                            msg = await old_channel.fetch_message(msg_id)
-                            await msg.delete()
+                            await old_channel.get_partial_message(msg_id).delete()
                         except discord.NotFound:
                             pass
             except (json.JSONDecodeError, discord.HTTPException):
                 pass
 
-        # Get tasks for this project
-        tasks = await get_tasks_by_project(project)
-
-        # Group by status
-        by_status = {
-            'todo': [],
-            'progress': [],
-            'review': [],
-            'done': []
-        }
-        for t in tasks:
-            if t.status in by_status:
-                by_status[t.status].append(t)
+        stats = await get_project_task_stats(project)
 
         # Create header embed
-        header_embed = discord.Embed(
-            title=f"\U0001f4cb Task Board: {project_obj.name}",
-            description=f"All tasks for **{project_obj.name}** ({project_obj.acronym})\nUpdates automatically when task status changes.",
-            color=discord.Color.blue()
-        )
-        await target_channel.send(embed=header_embed)
+        header_embed = self.create_board_header_embed(project_obj, stats)
+        header = await target_channel.send(embed=header_embed)
+        self._board_hashes[header.id] = embed_hash(header_embed)
 
         # Create status embeds
         msg_ids = []
-        for status in ['todo', 'progress', 'review', 'done']:
-            embed = discord.Embed(
-                title=f"{STATUS_EMOJI.get(status, '')} {STATUS_DISPLAY.get(status, status)}",
-                color=STATUS_COLORS.get(status, discord.Color.greyple())
-            )
-            
-            status_tasks = by_status[status]
-            if status_tasks:
-                desc_lines = []
-                for t in status_tasks[:10]:
-                    thread_link = f"<#{t.thread_id}>" if t.thread_id else ""
-                    assignee = f"<@{t.assignee_id}>"
-                    priority_str = f" [{t.priority}]" if t.priority else ""
-                    deadline_str = f" (Due: {str(t.deadline)[:10]})" if t.deadline else ""
-                    desc_lines.append(f"**{t.title}**{priority_str} - {assignee}{deadline_str}\n{thread_link}")
-                embed.description = "\n".join(desc_lines)
-            else:
-                embed.description = "*No tasks*"
-            
-            msg = await target_channel.send(embed=embed)
+        embeds = await self.create_board_embeds(project, stats)
+        for status, embed in zip(BOARD_STATUSES, embeds):
+            msg = await target_channel.send(embed=embed, view=board_view(project, status))
             msg_ids.append(msg.id)
+            self._board_hashes[msg.id] = embed_hash(embed)
 
-        await upsert_task_board(project, target_channel.id, json.dumps(msg_ids))
+        async with transaction():
+            await upsert_task_board(project, target_channel.id, json.dumps(msg_ids))
+            await set_bot_state(header_key, str(header.id))
         await interaction.followup.send(f"Task board set up in {target_channel.mention}!")
 
+    def create_board_header_embed(self, project: Project, stats: ProjectTaskStats) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"\U0001f4cb Task Board: {project.name}",
+            description=f"All tasks for **{project.name}** ({project.acronym})\nUpdates automatically when task status changes.",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Open", value=str(stats.open), inline=True)
+        embed.add_field(name="Overdue", value=str(stats.overdue), inline=True)
+        embed.add_field(name="Done", value=str(stats.done), inline=True)
+        if stats.last_activity:
+            last = datetime.strptime(str(stats.last_activity)[:19], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+            embed.add_field(name="Last Activity", value=f"<t:{int(last.timestamp())}:R>", inline=True)
+        return embed
+
+    def create_status_embed(self, status: str, page: TaskPage, title: str = None, total: int = None) -> discord.Embed:
+        """One status column of a task board, or a page of its Browse pager."""
+        if not title:
+            title = f"{STATUS_EMOJI.get(status, '')} {STATUS_DISPLAY.get(status, status)}"
+            if total is not None:
+                title += f" ({total})"
+        embed = discord.Embed(title=title, color=STATUS_COLORS.get(status, discord.Color.greyple()))
+
+        if page.tasks:
+            desc_lines = []
+            for t in page.tasks:
+                thread_link = f"<#{t.thread_id}>" if t.thread_id else ""
+                assignee = f"<@{t.assignee_id}>"
+                deadline_str = f" (Due: {str(t.deadline)[:10]})" if t.deadline else ""
+                desc_lines.append(f"**{t.title}** - {assignee}{deadline_str}\n{thread_link}")
+            embed.description = "\n".join(desc_lines)
+        else:
+            embed.description = "*No tasks*"
+
+        if total is not None and page.has_next:
+            embed.set_footer(text=f"Showing the newest {len(page.tasks)} - press Browse for the rest")
+        return embed
+
+    async def create_board_embeds(self, project_acronym: str, stats: ProjectTaskStats) -> List[discord.Embed]:
+        """Embeds for each board status, reading only the first page of every column."""
+        embeds = []
+        for status in BOARD_STATUSES:
+            page = await get_task_page(project_acronym=project_acronym, status=status, limit=BOARD_PAGE_SIZE)
+            embeds.append(self.create_status_embed(status, page, total=stats.count(status)))
+        return embeds
+
+    async def _render_board_header(self, project_acronym: str, channel_id: int, stats: ProjectTaskStats):
+        """Refresh the live counts in the header posted by /task setup, if the board has one."""
+        header_key = f"board_header:{project_acronym}"
+        header_id = await get_bot_state(header_key)
+        project = await get_project_by_acronym(project_acronym) if header_id else None
+        if not project:
+            return
+
+        header_id = int(header_id)
+        embed = self.create_board_header_embed(project, stats)
+        rendered = embed_hash(embed)
+        if self._board_hashes.get(header_id) == rendered:
+            return
+        try:
+            await self.bot.get_partial_messageable(channel_id).get_partial_message(header_id).edit(embed=embed)
+        except discord.NotFound:
+            # Re-posting would put the header below the columns, so just drop it
+            await delete_bot_state(header_key)
+            return
+        self._board_hashes[header_id] = rendered
+
     async def update_dashboard(self, project_acronym: str, bot: commands.Bot):
-        """Update the dashboard for a project."""
+        """
+        Mark a project's dashboard dirty. Changes within DASHBOARD_DEBOUNCE_SECONDS
+        are coalesced into a single render_dashboard call.
+        """
+        self.dashboards.schedule(project_acronym)
+
+    async def render_dashboard(self, project_acronym: str):
+        """Rebuild the dashboard for a project, editing only messages whose embed changed."""
         board = await get_task_board(project_acronym)
         if not board:
             return
 
-        guild = bot.get_guild(int(GUILD_ID)) if GUILD_ID else None
+        guild = self.bot.get_guild(int(GUILD_ID)) if GUILD_ID else None
         if not guild:
             return
 
@@ -1361,50 +1590,35 @@ class TasksCog(commands.Cog):
         if not channel:
             return
 
-        tasks = await get_tasks_by_project(project_acronym)
-
-        # Group by status
-        by_status = {
-            'todo': [],
-            'progress': [],
-            'review': [],
-            'done': []
-        }
-        for t in tasks:
-            if t.status in by_status:
-                by_status[t.status].append(t)
+        stats = await get_project_task_stats(project_acronym)
+        embeds = await self.create_board_embeds(project_acronym, stats)
 
         # Update embeds
         try:
+            await self._render_board_header(project_acronym, board.channel_id, stats)
             msg_ids = json.loads(board.message_ids)
-            statuses = ['todo', 'progress', 'review', 'done']
-            
-            for i, status in enumerate(statuses):
+            repaired = False
+
+            for i, (status, embed) in enumerate(zip(BOARD_STATUSES, embeds)):
                 if i >= len(msg_ids):
                     break
-                    
-                embed = discord.Embed(
-                    title=f"{STATUS_EMOJI.get(status, '')} {STATUS_DISPLAY.get(status, status)}",
-                    color=STATUS_COLORS.get(status, discord.Color.greyple())
+
+                rendered = embed_hash(embed)
+                if self._board_hashes.get(msg_ids[i]) == rendered:
+                    continue
+
+                msg = await self._edit_or_repost(
+                    board.channel_id, msg_ids[i], embed=embed, view=board_view(project_acronym, status)
                 )
-                
-                status_tasks = by_status[status]
-                if status_tasks:
-                    desc_lines = []
-                    for t in status_tasks[:10]:
-                        thread_link = f"<#{t.thread_id}>" if t.thread_id else ""
-                        assignee = f"<@{t.assignee_id}>"
-                        deadline_str = f" (Due: {str(t.deadline)[:10]})" if t.deadline else ""
-                        desc_lines.append(f"**{t.title}** - {assignee}{deadline_str}\n{thread_link}")
-                    embed.description = "\n".join(desc_lines)
-                else:
-                    embed.description = "*No tasks*"
+                if msg is None:
+                    return
+                if msg.id != msg_ids[i]:
+                    msg_ids[i] = msg.id
+                    repaired = True
+                self._board_hashes[msg.id] = rendered
 
-                try:
-                    msg = await channel.fetch_message(msg_ids[i])
-                    await msg.edit(embed=embed)
-                except discord.NotFound:
-                    pass
+            if repaired:
+                await upsert_task_board(project_acronym, board.channel_id, json.dumps(msg_ids))
         except (json.JSONDecodeError, discord.HTTPException):
             pass
 
@@ -1414,32 +1628,39 @@ class TasksCog(commands.Cog):
     @app_commands.describe(user="User to list tasks for (defaults to you)")
     async def task_list(self, interaction: discord.Interaction, user: discord.Member = None):
         target = user or interaction.user
-        tasks = await get_tasks_by_assignee_multi(target.id)
+        fetch = functools.partial(get_task_page, assignee_id=target.id, open_only=True, limit=10)
+        page = await fetch()
 
-        if not tasks:
+        if not page.tasks:
             await interaction.response.send_message(
                 f"No active tasks for {target.mention}.",
                 ephemeral=True
             )
             return
 
-        embed = discord.Embed(
-            title=f"Tasks for {target.display_name}",
-            color=discord.Color.blue()
-        )
-
-        for task in tasks[:10]:
-            status_str = f"{STATUS_EMOJI.get(task.status, '')} {STATUS_DISPLAY.get(task.status, task.status)}"
-            thread_link = f"<#{task.thread_id}>" if task.thread_id else ""
-            deadline_str = f"\nDeadline: {str(task.deadline)[:10]}" if task.deadline else ""
-            
-            embed.add_field(
-                name=f"{task.title} [{task.project_acronym}]",
-                value=f"Status: {status_str}{deadline_str}\n{thread_link}",
-                inline=False
+        def render(page: TaskPage) -> discord.Embed:
+            embed = discord.Embed(
+                title=f"Tasks for {target.display_name}",
+                color=discord.Color.blue()
             )
+            for task in page.tasks:
+                status_str = f"{STATUS_EMOJI.get(task.status, '')} {STATUS_DISPLAY.get(task.status, task.status)}"
+                thread_link = f"<#{task.thread_id}>" if task.thread_id else ""
+                deadline_str = f"\nDeadline: {str(task.deadline)[:10]}" if task.deadline else ""
+
+                embed.add_field(
+                    name=f"{task.title} [{task.project_acronym}]",
+                    value=f"Status: {status_str}{deadline_str}\n{thread_link}",
+                    inline=False
+                )
+            return embed
 
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        view = TaskPageView(fetch, render, page)
+        await interaction.response.send_message(
+            embed=view.embed(),
+            view=view if page.has_next else discord.utils.MISSING,
+            ephemeral=True
+        )
 
     # ============== TASK DELETE ==============
 
@@ -1470,8 +1691,7 @@ class TasksCog(commands.Cog):
             try:
                 channel = interaction.guild.get_channel(task.target_channel_id)
                 if channel:
-                    msg = await channel.fetch_message(task.header_message_id)
-                    await msg.delete()
+                    await channel.get_partial_message(task.header_message_id).delete()
             except discord.HTTPException:
                 pass
 
@@ -1508,10 +1728,7 @@ class TasksCog(commands.Cog):
             return
 
         is_assignee = await is_user_task_assignee(task.id, interaction.user.id)
-        is_lead = interaction.user.guild_permissions.administrator or any(
-            'lead' in r.name.lower() or 'admin' in r.name.lower()
-            for r in interaction.user.roles
-        )
+        is_lead = member_is_lead(interaction.user)
 
         if not is_assignee and not is_lead:
             await interaction.followup.send("Only assignees or leads can close tasks.")
@@ -1532,14 +1749,7 @@ class TasksCog(commands.Cog):
             await set_task_assignee_approval(task.id, interaction.user.id, True)
             approval_status = await get_task_approval_status(task.id)
 
-            config = await get_server_config(interaction.guild.id)
-            approval_mode = 'auto'
-            if config and config.config_json:
-                try:
-                    cfg = json.loads(config.config_json)
-                    approval_mode = cfg.get('approval_mode', 'auto')
-                except json.JSONDecodeError:
-                    pass
+            approval_mode = server_configs.get(interaction.guild.id).approval_mode
 
             total = approval_status['total']
             approved = approval_status['approved']
@@ -1562,8 +1772,9 @@ class TasksCog(commands.Cog):
                 return
 
         old_status = task.status
-        await update_task_status(task.id, 'done')
-        await add_task_history(task.id, interaction.user.id, 'status_change', old_status, 'done')
+        async with transaction():
+            await update_task_status(task.id, 'done')
+            await add_task_history(task.id, interaction.user.id, 'status_change', old_status, 'done')
 
         task.status = 'done'
         await self.update_control_panel(interaction, task)
@@ -1581,9 +1792,13 @@ class TasksCog(commands.Cog):
         await interaction.followup.send(f"Task #{task.id} ({task.title}) closed!")
 
     @task_group.command(name="manage", description="List all tasks for a project with management options")
-    @app_commands.describe(game="Project acronym")
+    @app_commands.describe(game="Project acronym", status="Only tasks with this status")
+    @app_commands.choices(status=[
+        app_commands.Choice(name=STATUS_DISPLAY[s], value=s)
+        for s in ('todo', 'progress', 'review', 'done', 'cancelled')
+    ])
     @app_commands.checks.has_permissions(administrator=True)
-    async def task_manage(self, interaction: discord.Interaction, game: str):
+    async def task_manage(self, interaction: discord.Interaction, game: str, status: str = None):
         await interaction.response.defer(ephemeral=True)
 
         project_obj = await get_project_by_acronym(game)
@@ -1591,47 +1806,66 @@ class TasksCog(commands.Cog):
             await interaction.followup.send(f"Project `{game}` not found.")
             return
 
-        tasks = await get_tasks_by_project(game)
+        fetch = functools.partial(get_task_page, project_acronym=project_obj.acronym, status=status, limit=15)
+        page = await fetch()
 
-        if not tasks:
+        if not page.tasks:
             await interaction.followup.send(f"No tasks for {project_obj.name}.")
             return
 
-        # Create embed with all tasks
-        embed = discord.Embed(
-            title=f"Task Management: {project_obj.name}",
-            description="Use `/task delete <id>` to remove a task.",
-            color=discord.Color.blue()
+        stats = await get_project_task_stats(project_obj.acronym)
+        summary = " | ".join(
+            f"{STATUS_EMOJI.get(s, '')} {STATUS_DISPLAY.get(s, s)}: {stats.count(s)}"
+            for s in ('todo', 'progress', 'review', 'done', 'cancelled')
+            if stats.count(s)
         )
+        if stats.overdue:
+            summary += f" | Overdue: {stats.overdue}"
 
-        # Group by status
-        by_status = {}
-        for t in tasks:
-            if t.status not in by_status:
-                by_status[t.status] = []
-            by_status[t.status].append(t)
-
-        for status in ['todo', 'progress', 'review', 'done', 'cancelled']:
-            if status not in by_status:
-                continue
-            
-            status_tasks = by_status[status]
+        def render(page: TaskPage) -> discord.Embed:
             lines = []
-            for t in status_tasks[:8]:
+            for t in page.tasks:
                 assignee = f"<@{t.assignee_id}>"
                 priority = f" [{t.priority}]" if t.priority else ""
-                lines.append(f"`#{t.id}` **{t.title}**{priority} - {assignee}")
-            
-            if len(status_tasks) > 8:
-                lines.append(f"*... and {len(status_tasks) - 8} more*")
-            
-            embed.add_field(
-                name=f"{STATUS_EMOJI.get(status, '')} {STATUS_DISPLAY.get(status, status)} ({len(status_tasks)})",
-                value="\n".join(lines) or "*None*",
-                inline=False
+                lines.append(f"`#{t.id}` {STATUS_EMOJI.get(t.status, '')} **{t.title}**{priority} - {assignee}")
+
+            return discord.Embed(
+                title=f"Task Management: {project_obj.name}",
+                description=f"{summary}\nUse `/task delete <id>` to remove a task.\n\n" + "\n".join(lines),
+                color=discord.Color.blue()
             )
 
-        await interaction.followup.send(embed=embed)
+        view = TaskPageView(fetch, render, page)
+        await interaction.followup.send(embed=view.embed(), view=view if page.has_next else discord.utils.MISSING)
+
+    # ============== SEARCH ==============
+
+    @task_group.command(name="search", description="Search tasks by title, description or questions")
+    @app_commands.describe(
+        query="Words to search for (prefixes match, e.g. 'inv' finds 'inventory')",
+        project="Only search this project",
+        status="Only tasks with this status"
+    )
+    @app_commands.choices(status=[
+        app_commands.Choice(name=STATUS_DISPLAY[s], value=s)
+        for s in ('todo', 'progress', 'review', 'done', 'cancelled')
+    ])
+    async def task_search(self, interaction: discord.Interaction, query: str, project: str = None, status: str = None):
+        tasks = await search_tasks(query, project, status, limit=10)
+
+        if not tasks:
+            await interaction.response.send_message(f"No tasks match `{query}`.", ephemeral=True)
+            return
+
+        embed = discord.Embed(title=f"Search: {query}", color=discord.Color.blue())
+        lines = []
+        for t in tasks:
+            status_str = f"{STATUS_EMOJI.get(t.status, '')} {STATUS_DISPLAY.get(t.status, t.status)}"
+            thread_link = f" - <#{t.thread_id}>" if t.thread_id else ""
+            lines.append(f"`#{t.id}` **{t.title}** [{t.project_acronym}] {status_str}{thread_link}")
+        embed.description = "\n".join(lines)
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @task_manage.autocomplete("game")
     async def task_manage_autocomplete(self, interaction: discord.Interaction, current: str):
@@ -1644,218 +1878,340 @@ class TasksCog(commands.Cog):
 
     # ============== TASK IMPORT ==============
 
-    @task_group.command(name="import", description="Import tasks from JSON or XML file")
-    @app_commands.describe(file="JSON or XML file with tasks")
+    @import_group.command(name="file", description="Import tasks from JSON or XML file")
+    @app_commands.describe(
+        file="JSON or XML file with tasks",
+        allow_duplicate="Import even if this exact file was imported before"
+    )
     @app_commands.checks.has_permissions(administrator=True)
-    async def task_import(self, interaction: discord.Interaction, file: discord.Attachment):
+    async def task_import(self, interaction: discord.Interaction, file: discord.Attachment, allow_duplicate: bool = False):
         await interaction.response.defer()
 
         if not file.filename.endswith(('.json', '.xml')):
             await interaction.followup.send("File must be .json or .xml")
             return
 
-        content = await file.read()
-        content = content.decode('utf-8')
-
-        tasks_data = []
+        status_msg = await interaction.followup.send("Importing tasks: reading file...", wait=True)
+        report = self._import_reporter(status_msg)
 
-        try:
-            if file.filename.endswith('.json'):
-                tasks_data = json.loads(content)
-                # Handle double-encoded JSON (string containing JSON)
-                if isinstance(tasks_data, str):
-                    tasks_data = json.loads(tasks_data)
-                # Validate it's a list
-                if not isinstance(tasks_data, list):
-                    await interaction.followup.send("JSON must be an array of task objects")
-                    return
-            else:
-                root = ET.fromstring(content)
-                for task_elem in root.findall('task'):
-                    task_dict = {
-                        'title': task_elem.findtext('title', ''),
-                        'description': task_elem.findtext('description', ''),
-                        'assignee_id': task_elem.findtext('assignee_id', ''),
-                        'target_channel_id': task_elem.findtext('target_channel_id', ''),
-                        'deadline': task_elem.findtext('deadline'),
-                        'priority': task_elem.findtext('priority')
-                    }
-                    tasks_data.append(task_dict)
-        except (json.JSONDecodeError, ET.ParseError) as e:
-            await interaction.followup.send(f"Parse error: {e}")
-            return
-
-        # Validate and create tasks
-        created = 0
+        # Parse and validate as the file streams in; nothing is written
+        # unless the whole file parses
+        validator = ImportValidator(interaction.guild)
+        digest = hashlib.sha256()
+        entries = []
         errors = []
+        parse = iter_json_rows if file.filename.endswith('.json') else iter_xml_rows
+        try:
+            async for data in parse(hashed_chunks(attachment_chunks(file), digest)):
+                number = len(entries) + 1
+                try:
+                    entries.append((number, data, validator.validate(number, data), None))
+                except ValueError as e:
+                    entries.append((number, data, None, str(e)))
+                    errors.append(f"Task {number}: {e}")
+                await report(f"Importing tasks: read {number} rows...")
+        except ValueError as e:
+            await report(f"Parse error: {e}", final=True)
+            return
+        except aiohttp.ClientError as e:
+            await report(f"Could not download {file.filename}: {e}", final=True)
+            return
 
-        for i, td in enumerate(tasks_data):
-            try:
-                # Validate required fields
-                if not td.get('title'):
-                    errors.append(f"Task {i+1}: missing title")
-                    continue
-                if not td.get('assignee_id'):
-                    errors.append(f"Task {i+1}: missing assignee_id")
-                    continue
-                if not td.get('target_channel_id'):
-                    errors.append(f"Task {i+1}: missing target_channel_id")
-                    continue
-
-                assignee_id = int(td['assignee_id'])
-                target_channel_id = int(td['target_channel_id'])
+        previous = await get_import_job_by_hash(digest.hexdigest())
+        if previous and previous.status != 'done':
+            await report(
+                f"This file is already import job #{previous.id} ({self._import_job_status(previous)}). "
+                f"Use `/task import resume job:{previous.id}` to continue it.",
+                final=True
+            )
+            return
+        if previous and not allow_duplicate:
+            await report(
+                f"This file was already imported as job #{previous.id} on {previous.started_at}. "
+                f"Use `allow_duplicate:True` to import it again.",
+                final=True
+            )
+            return
 
-                # Verify channel exists
-                channel = interaction.guild.get_channel(target_channel_id)
-                if not channel:
-                    errors.append(f"Task {i+1}: channel {target_channel_id} not found")
-                    continue
+        job, items = await start_import_job(digest.hexdigest(), file.filename, interaction.user.id, entries)
+        await self._run_import_job(job, items, errors, report)
 
-                # Verify member exists
-                member = interaction.guild.get_member(assignee_id)
-                if not member:
-                    errors.append(f"Task {i+1}: member {assignee_id} not found")
-                    continue
+    @import_group.command(name="resume", description="Continue an interrupted or incomplete import")
+    @app_commands.describe(job="Import job number, see /task import jobs")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def task_import_resume(self, interaction: discord.Interaction, job: int):
+        import_job = await get_import_job(job)
+        if not import_job:
+            await interaction.response.send_message(f"Import job #{job} not found.", ephemeral=True)
+            return
+        if import_job.status == 'done':
+            await interaction.response.send_message(f"Import job #{job} already finished.", ephemeral=True)
+            return
+        if import_job.id in self._active_imports:
+            await interaction.response.send_message(f"Import job #{job} is still running.", ephemeral=True)
+            return
 
-                # Detect game from channel
-                games = await get_all_projects()
-                game_acronym = None
-                for g in games:
-                    if g.acronym.lower() in channel.name.lower():
-                        game_acronym = g.acronym
-                        break
-                
-                if not game_acronym:
-                    errors.append(f"Task {i+1}: could not detect game from channel")
-                    continue
+        await interaction.response.defer()
+        self._active_imports.add(import_job.id)
+        try:
+            status_msg = await interaction.followup.send(f"Resuming import job #{job}...", wait=True)
+            report = self._import_reporter(status_msg)
+            validator = ImportValidator(interaction.guild)
+            items, errors = await resume_import_job(
+                import_job, validator, discard=functools.partial(self._discard_import_row, interaction.guild)
+            )
+        finally:
+            self._active_imports.discard(import_job.id)
+        await self._run_import_job(import_job, items, errors, report)
 
-                # Create task
-                task = await create_task(
-                    project_acronym=game_acronym,
-                    title=td['title'],
-                    description=td.get('description', ''),
-                    assignee_id=assignee_id,
-                    target_channel_id=target_channel_id,
-                    deadline=td.get('deadline'),
-                    priority=td.get('priority')
-                )
+    @import_group.command(name="jobs", description="List recent import jobs")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def task_import_jobs(self, interaction: discord.Interaction):
+        jobs = await get_recent_import_jobs()
+        if not jobs:
+            await interaction.response.send_message("No import jobs yet.", ephemeral=True)
+            return
+        lines = [
+            f"**#{j.id}** `{j.filename}` - {self._import_job_status(j)}, "
+            f"{j.cursor}/{j.total_rows} rows, started {j.started_at}"
+            for j in jobs
+        ]
+        embed = discord.Embed(title="Import Jobs", description="\n".join(lines), color=discord.Color.blue())
+        embed.set_footer(text="Resume with /task import resume <job>")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
-                # Get game name for embed
-                game_obj = await get_project_by_acronym(game_acronym)
-                game_name = game_obj.name if game_obj else game_acronym
+    def _import_job_status(self, job: ImportJob) -> str:
+        # A job marked running that no command is working on was cut short
+        if job.status == 'running' and job.id not in self._active_imports:
+            return 'interrupted'
+        return job.status
 
-                # Create header message with detailed embed and buttons
-                header_embed = self.create_header_embed(task, member, game_name)
-                header_view = HeaderView(task.id, self)
-                header_msg = await channel.send(embed=header_embed, view=header_view)
-                
-                # Create thread
-                thread = await header_msg.create_thread(name=f"Task: {task.title[:50]}")
+    def _import_reporter(self, status_msg: discord.WebhookMessage) -> Callable[..., Awaitable[None]]:
+        """Edit a status message with import progress, at most every IMPORT_PROGRESS_INTERVAL seconds."""
+        last_edit = time.monotonic()
 
-                # Create control panel in thread
-                control_embed = self.create_control_embed(task, member, game_name)
-                view = TaskView(task.id, self)
-                control_msg = await thread.send(embed=control_embed, view=view)
-
-                # Update task with thread/message IDs
-                await update_task_thread(task.id, thread.id, control_msg.id)
-                await update_task_header_message(task.id, header_msg.id)
-                
-                # Add primary assignee to task_assignees table
-                await add_task_assignee(task.id, assignee_id, is_primary=True)
-                
-                # Handle additional assignees if provided
-                additional_ids = td.get('additional_assignees', [])
-                if isinstance(additional_ids, str):
-                    additional_ids = [x.strip() for x in additional_ids.split(',') if x.strip()]
-                for add_id in additional_ids:
-                    try:
-                        add_member = interaction.guild.get_member(int(add_id))
-                        if add_member:
-                            await add_task_assignee(task.id, int(add_id), is_primary=False)
-                    except (ValueError, TypeError):
-                        pass
-                
-                # Update task object and refresh header with thread link
-                task.thread_id = thread.id
-                task.header_message_id = header_msg.id
-                header_embed = self.create_header_embed(task, member, game_name)
-                await header_msg.edit(embed=header_embed, view=header_view)
+        async def report(text: str, final: bool = False):
+            nonlocal last_edit
+            if not final and time.monotonic() - last_edit < IMPORT_PROGRESS_INTERVAL:
+                return
+            last_edit = time.monotonic()
+            try:
+                await status_msg.edit(content=text)
+            except discord.HTTPException:
+                pass
 
-                # Notify assignee
-                await thread.send(f"{member.mention} You have been assigned this task!")
+        return report
 
-                created += 1
+    async def _run_import_job(self, job: ImportJob, items: List[ImportItem], errors: List[str], report):
+        async def progress(done: int, total: int):
+            await report(f"Import job #{job.id}: {done}/{total} tasks published...")
 
-            except Exception as e:
-                errors.append(f"Task {i+1}: {str(e)}")
+        self._active_imports.add(job.id)
+        try:
+            result = await run_import_job(job, items, self._publish_imported_task, on_progress=progress)
+        finally:
+            self._active_imports.discard(job.id)
+        errors = errors + result.errors
 
-        # Update dashboards
-        games = await get_all_projects()
-        for g in games:
-            await self.update_dashboard(g.acronym, self.bot)
+        for acronym in result.projects:
+            await self.update_dashboard(acronym, self.bot)
 
-        result = f"Imported {created} tasks."
+        text = f"Import job #{job.id}: imported {len(result.created)} tasks."
         if errors:
-            result += f"\n\nErrors ({len(errors)}):\n" + "\n".join(errors[:10])
+            text += f"\n\nErrors ({len(errors)}):\n" + "\n".join(errors[:10])
             if len(errors) > 10:
-                result += f"\n... and {len(errors) - 10} more"
-
-        await interaction.followup.send(result)
+                text += f"\n... and {len(errors) - 10} more"
+        if job.status == 'incomplete':
+            text += f"\n\nFailed rows can be retried with `/task import resume job:{job.id}`."
+        await report(text, final=True)
+
+    async def _publish_imported_task(self, item: ImportItem, on_header: Callable[[int], Awaitable[None]]):
+        """
+        Post an imported task's header, thread and control panel.
+
+        A header already journalled for the row is reused along with its
+        thread (which shares the header's ID) and any control panel in it,
+        so resuming a job never posts a task twice. On a Discord error
+        everything posted for the task is deleted again.
+        """
+        task, row = item.task, item.row
+        header_view = HeaderView(task.id, self)
+        header_msg = None
+        thread = None
+        control_msg = None
+        try:
+            if item.journal.header_message_id:
+                try:
+                    header_msg = await row.channel.fetch_message(item.journal.header_message_id)
+                    thread = header_msg.thread or await self.bot.fetch_channel(header_msg.id)
+                except discord.NotFound:
+                    pass
+            if header_msg is None:
+                header_embed = self.create_header_embed(task, row.members, row.project.name)
+                header_msg = await row.channel.send(embed=header_embed, view=header_view)
+                await on_header(header_msg.id)
 
-    # ============== BACKGROUND TASKS ==============
+            if thread is None:
+                thread = await header_msg.create_thread(name=f"Task: {task.title[:50]}")
+            else:
+                async for message in thread.history(limit=10, oldest_first=True):
+                    if message.author.id == self.bot.user.id and message.components:
+                        control_msg = message
+                        break
 
-    @tasks.loop(hours=1)
-    async def reminder_loop(self):
-        """Check for upcoming deadlines and stagnant tasks."""
-        if not GUILD_ID:
-            return
+            if control_msg is None:
+                # The assignment ping rides on the control panel instead of a message of its own
+                mentions = ' '.join(m.mention for m in row.members)
+                control_embed = self.create_control_embed(task, row.members, row.project.name)
+                control_msg = await thread.send(
+                    f"{mentions} You have been assigned this task!",
+                    embed=control_embed,
+                    view=TaskView(task.id, self)
+                )
 
-        guild = self.bot.get_guild(int(GUILD_ID))
-        if not guild:
-            return
+            task.thread_id = thread.id
+            task.control_message_id = control_msg.id
+            task.header_message_id = header_msg.id
+            await header_msg.edit(embed=self.create_header_embed(task, row.members, row.project.name), view=header_view)
+        except discord.HTTPException:
+            await self._discard_task_messages(header_msg, thread)
+            raise
 
-        config = await get_server_config(int(GUILD_ID))
-        cfg = {}
-        if config and config.config_json:
-            try:
-                cfg = json.loads(config.config_json) if isinstance(config.config_json, str) else config.config_json
-            except json.JSONDecodeError:
-                pass
+    async def _discard_import_row(self, guild: discord.Guild, journal: ImportJobRow):
+        """Delete the header and thread an import row posted before it was dropped."""
+        try:
+            channel = guild.get_channel(int(journal.payload.get('target_channel_id')))
+        except (AttributeError, TypeError, ValueError):
+            channel = None
+        header = channel.get_partial_message(journal.header_message_id) if channel else None
+        await self._discard_task_messages(header, guild.get_thread(journal.header_message_id))
 
-        if not cfg.get('reminders_enabled', True):
-            return
+    # ============== BACKGROUND TASKS ==============
 
-        deadline_hours = cfg.get('deadline_warning_hours', 24)
-        stagnant_days = cfg.get('stagnant_days', 3)
+    async def send_reminders(self, reminders: List[tuple]) -> List[bool]:
+        """
+        Deliver a batch of due (task, kind) reminders, called by ReminderScheduler.
+
+        Assignees of the whole batch are loaded in one query and posts go
+        out REMINDER_CONCURRENCY at a time. With a reminder digest configured
+        the batch is rolled into one post per project (in its board channel)
+        or one DM per assignee; reminders a digest message could not reach
+        fall back to a post in the task's thread. Returns one flag per reminder, False
+        to retry it later; that includes tasks whose thread is not posted
+        yet, such as rows of a running import.
+        """
+        guild = self.bot.get_guild(int(GUILD_ID))
+        if not guild:
+            return [False] * len(reminders)
+        config = server_configs.get(guild.id)
+        assignees = await get_assignees_for_tasks({task.id for task, _ in reminders})
+        user_ids = {
+            task.id: [a.user_id for a in assignees.get(task.id, ())] or [task.assignee_id]
+            for task, _ in reminders
+        }
+        slots = asyncio.Semaphore(max(1, REMINDER_CONCURRENCY))
+        delivered = [False] * len(reminders)
+        ready = [i for i, (task, _) in enumerate(reminders) if task.thread_id]
 
-        due_soon = await get_tasks_due_soon(deadline_hours)
-        for task in due_soon:
-            if task.thread_id:
-                thread = guild.get_channel(task.thread_id)
-                if thread:
-                    try:
-                        assignees = await get_task_assignees(task.id)
-                        mentions = ' '.join(f"<@{a.user_id}>" for a in assignees) if assignees else f"<@{task.assignee_id}>"
-                        await thread.send(f"\u26a0\ufe0f {mentions} This task is due within {deadline_hours} hours!")
-                    except discord.HTTPException:
-                        pass
+        async def send(destination, content: str) -> bool:
+            async with slots:
+                try:
+                    await destination.send(content)
+                except discord.HTTPException:
+                    return False
+            return True
 
-        stagnant = await get_stagnant_tasks(stagnant_days)
-        for task in stagnant:
-            if task.thread_id:
-                thread = guild.get_channel(task.thread_id)
-                if thread:
+        async def send_digest(destination, header: str, indexes: List[int], lines: List[str]) -> Set[int]:
+            """Post a digest; returns the reminders carried by the chunks that went out."""
+            covered = set()
+            start = 0
+            for chunk, count in digest_chunks(header, lines):
+                if await send(destination, chunk):
+                    covered.update(indexes[start:start + count])
+                start += count
+            return covered
+
+        if config.reminder_digest == 'project':
+            by_project = {}
+            for i in ready:
+                task = reminders[i][0]
+                by_project.setdefault(task.project_acronym, []).append(i)
+
+            async def project_digest(acronym: str, indexes: List[int]):
+                board = await get_task_board(acronym)
+                channel = guild.get_channel(board.channel_id) if board else None
+                if not channel:
+                    return
+                lines = [
+                    self._reminder_line(config, reminders[i][0], reminders[i][1],
+                                        ' '.join(f"<@{u}>" for u in user_ids[reminders[i][0].id]))
+                    for i in indexes
+                ]
+                header = f"\U0001f514 **{acronym} reminders** ({len(lines)})"
+                for i in await send_digest(channel, header, indexes, lines):
+                    delivered[i] = True
+
+            await asyncio.gather(*(project_digest(a, idx) for a, idx in by_project.items()))
+
+        elif config.reminder_digest == 'user':
+            by_user = {}
+            for i in ready:
+                task = reminders[i][0]
+                for user_id in user_ids[task.id]:
+                    by_user.setdefault(user_id, []).append(i)
+            unreached = set()
+
+            async def user_digest(user_id: int, indexes: List[int]):
+                member = guild.get_member(user_id)
+                lines = [self._reminder_line(config, reminders[i][0], reminders[i][1]) for i in indexes]
+                header = f"\U0001f514 **Your task reminders in {guild.name}** ({len(lines)})"
+                covered = await send_digest(member, header, indexes, lines) if member else set()
+                unreached.update(i for i in indexes if i not in covered)
+
+            await asyncio.gather(*(user_digest(u, idx) for u, idx in by_user.items()))
+            for i in ready:
+                delivered[i] = i not in unreached
+
+        async def thread_post(i: int):
+            task, kind = reminders[i]
+            thread = guild.get_channel_or_thread(task.thread_id)
+            if thread is None:
+                # Archived threads are not cached
+                async with slots:
                     try:
-                        assignees = await get_task_assignees(task.id)
-                        mentions = ' '.join(f"<@{a.user_id}>" for a in assignees) if assignees else f"<@{task.assignee_id}>"
-                        await thread.send(f"\U0001f4ac {mentions} Update request: How is this task going?")
+                        thread = await guild.fetch_channel(task.thread_id)
+                    except discord.NotFound:
+                        # Thread was deleted, nowhere to be reminded
+                        delivered[i] = True
+                        return
                     except discord.HTTPException:
-                        pass
-
-    @reminder_loop.before_loop
-    async def before_reminder_loop(self):
-        await self.bot.wait_until_ready()
+                        return
+            mentions = ' '.join(f"<@{u}>" for u in user_ids[task.id])
+            delivered[i] = await send(thread, self._reminder_message(config, task, kind, mentions))
+
+        await asyncio.gather(*(thread_post(i) for i in ready if not delivered[i]))
+        return delivered
+
+    @staticmethod
+    def _reminder_message(config, task: Task, kind: str, mentions: str) -> str:
+        """A reminder posted in the task's own thread."""
+        if kind == 'deadline':
+            return f"\u26a0\ufe0f {mentions} This task is due within {config.deadline_warning_hours} hours!"
+        if kind == 'overdue':
+            return f"\u23f0 {mentions} This task is past its deadline ({str(task.deadline)[:10]})!"
+        return f"\U0001f4ac {mentions} Update request: How is this task going?"
+
+    @staticmethod
+    def _reminder_line(config, task: Task, kind: str, mentions: str = "") -> str:
+        """One reminder as a line of a digest."""
+        ref = f"**#{task.id} {task.title}** <#{task.thread_id}>"
+        if kind == 'deadline':
+            line = f"\u26a0\ufe0f {ref} is due within {config.deadline_warning_hours} hours"
+        elif kind == 'overdue':
+            line = f"\u23f0 {ref} is past its deadline ({str(task.deadline)[:10]})"
+        else:
+            line = f"\U0001f4ac {ref} has had no update for {config.stagnant_days} days"
+        return f"{line} {mentions}".rstrip()
 
     # ============== THREAD MONITOR ==============
 
@@ -1868,16 +2224,14 @@ class TasksCog(commands.Cog):
         if not isinstance(message.channel, discord.Thread):
             return
 
-        task = await get_task_by_thread_id(message.channel.id)
-        if not task:
+        # Resident index: ordinary thread messages never touch SQLite
+        entry = thread_index.lookup(message.channel.id)
+        if entry is None:
             return
 
-        is_assignee = await is_user_task_assignee(task.id, message.author.id)
-        is_lead = message.author.guild_permissions.administrator
-        
-        if not is_lead:
-            lead_roles = [r for r in message.author.roles if 'lead' in r.name.lower() or 'admin' in r.name.lower()]
-            is_lead = len(lead_roles) > 0
+        _, assignee_ids = entry
+        is_assignee = message.author.id in assignee_ids
+        is_lead = member_is_lead(message.author)
 
         if not is_assignee and not is_lead:
             try:
@@ -1890,6 +2244,7 @@ class TasksCog(commands.Cog):
                 pass
 
     @task_new.autocomplete("project")
+    @task_search.autocomplete("project")
     @task_board.autocomplete("project")
     @task_setup.autocomplete("project")
     async def project_autocomplete(self, interaction: discord.Interaction, current: str):
@@ -1902,17 +2257,6 @@ class TasksCog(commands.Cog):
 
 
 async def setup(bot: commands.Bot):
-    cog = TasksCog(bot)
-    await bot.add_cog(cog)
-    
-    # Register persistent views for existing tasks
-    # This is called when bot restarts to re-attach button handlers
-    from ..database import get_tasks_by_status
-    
-    for status in ['todo', 'progress', 'review']:
-        tasks = await get_tasks_by_status(status)
-        for task in tasks:
-            if task.thread_id:
-                bot.add_view(TaskView(task.id, cog))
-            if task.header_message_id:
-                bot.add_view(HeaderView(task.id, cog))
+    # Pattern-matched handlers serve the buttons of every task and board, old and new
+    bot.add_dynamic_items(TaskComponent, BoardBrowseButton)
+    await bot.add_cog(TasksCog(bot))
@@ -3,6 +3,7 @@ from discord import app_commands
 from discord.ext import commands
 import json
 import io
+import time
 
 from ..database import (
     get_all_template_channels,
@@ -15,15 +16,21 @@ from ..database import (
     upsert_group,
     get_all_projects,
     get_project_channels,
-    get_non_custom_project_channels,
-    add_project_channel,
-    remove_project_channel as db_remove_project_channel,
     get_groups_dict,
     clear_template_channels,
     upsert_template_channel,
-    get_server_config,
+    get_all_non_custom_project_channels,
 )
-from ..utils import format_channel_name
+from ..cache import server_configs
+from ..provisioning import (
+    TemplateSyncPlan,
+    TemplateSyncResult,
+    plan_template_sync,
+    apply_template_sync,
+)
+
+# Minimum seconds between progress edits during /template sync
+SYNC_PROGRESS_INTERVAL = 2.0
 
 
 class TemplatesCog(commands.Cog):
@@ -106,8 +113,9 @@ class TemplatesCog(commands.Cog):
             await interaction.response.send_message(f"Channel `{name}` not found in template.")
     
     @template_group.command(name="sync", description="Sync template to all existing projects")
+    @app_commands.describe(dry_run="Only show which channels would be added or removed")
     @app_commands.checks.has_permissions(administrator=True)
-    async def template_sync(self, interaction: discord.Interaction):
+    async def template_sync(self, interaction: discord.Interaction, dry_run: bool = False):
         await interaction.response.defer()
         
         projects = await get_all_projects()
@@ -115,87 +123,73 @@ class TemplatesCog(commands.Cog):
             await interaction.followup.send("No projects to sync.")
             return
         
-        template_channels = await get_all_template_channels()
-        template_names = {ch.name for ch in template_channels}
-        groups = await get_groups_dict()
+        plan = plan_template_sync(
+            interaction.guild,
+            projects,
+            await get_all_template_channels(),
+            await get_all_non_custom_project_channels(),
+            await get_groups_dict()
+        )
         
-        server_config = await get_server_config(interaction.guild.id)
-        lead_role_ids = []
-        if server_config and server_config.config_json:
-            cfg = json.loads(server_config.config_json) if isinstance(server_config.config_json, str) else server_config.config_json
-            lead_role_ids = cfg.get('lead_role_ids', [])
+        if dry_run:
+            await self._send_sync_plan(interaction, plan)
+            return
         
-        added_count = 0
-        removed_count = 0
-        errors = []
+        if not plan.total:
+            await interaction.followup.send(self._format_sync_result(TemplateSyncResult(errors=plan.errors)))
+            return
         
-        for project in projects:
-            category = interaction.guild.get_channel(project.category_id)
-            if not category:
-                errors.append(f"Category not found for {project.name}")
-                continue
-            
-            project_channels = await get_non_custom_project_channels(project.id)
-            project_channel_names = {ch.name for ch in project_channels}
-            
-            for template_ch in template_channels:
-                if template_ch.name not in project_channel_names:
-                    emoji = groups.get(template_ch.group_name, "")
-                    channel_name = format_channel_name(emoji, project.acronym, template_ch.name)
-                    
-                    try:
-                        is_leads_channel = 'lead' in template_ch.name.lower()
-                        overwrites = None
-                        
-                        if is_leads_channel and lead_role_ids:
-                            overwrites = {
-                                interaction.guild.default_role: discord.PermissionOverwrite(read_messages=False),
-                                interaction.guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True)
-                            }
-                            for role_id in lead_role_ids:
-                                role = interaction.guild.get_role(role_id)
-                                if role:
-                                    overwrites[role] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
-                        
-                        if template_ch.is_voice:
-                            new_channel = await category.create_voice_channel(name=channel_name)
-                        else:
-                            new_channel = await category.create_text_channel(
-                                name=channel_name,
-                                topic=template_ch.description,
-                                overwrites=overwrites
-                            )
-                        
-                        await add_project_channel(
-                            project_id=project.id,
-                            channel_id=new_channel.id,
-                            name=template_ch.name,
-                            group_name=template_ch.group_name,
-                            is_custom=False,
-                            is_voice=template_ch.is_voice
-                        )
-                        added_count += 1
-                    except discord.HTTPException as e:
-                        errors.append(f"Failed to create {channel_name}: {e}")
-            
-            for proj_ch in project_channels:
-                if proj_ch.name not in template_names:
-                    channel = interaction.guild.get_channel(proj_ch.channel_id)
-                    if channel:
-                        try:
-                            await channel.delete(reason="Template sync")
-                            removed_count += 1
-                        except discord.HTTPException as e:
-                            errors.append(f"Failed to delete {proj_ch.name}: {e}")
-                    await db_remove_project_channel(project.id, proj_ch.name)
-        
-        result = f"Sync complete.\nAdded: {added_count} channels\nRemoved: {removed_count} channels"
-        if errors:
-            result += f"\n\nErrors:\n" + "\n".join(errors[:10])
-            if len(errors) > 10:
-                result += f"\n... and {len(errors) - 10} more errors"
+        lead_role_ids = sorted(server_configs.get(interaction.guild.id).lead_role_ids)
         
-        await interaction.followup.send(result)
+        status_msg = await interaction.followup.send(f"Syncing template: 0/{plan.total} changes...", wait=True)
+        last_edit = time.monotonic()
+        
+        async def report(done: int, total: int):
+            nonlocal last_edit
+            if done < total and time.monotonic() - last_edit < SYNC_PROGRESS_INTERVAL:
+                return
+            last_edit = time.monotonic()
+            try:
+                await status_msg.edit(content=f"Syncing template: {done}/{total} changes...")
+            except discord.HTTPException:
+                pass
+        
+        result = await apply_template_sync(interaction.guild, plan, lead_role_ids, on_progress=report)
+        await interaction.followup.send(self._format_sync_result(result))
+    
+    @staticmethod
+    def _format_sync_result(result: TemplateSyncResult) -> str:
+        text = f"Sync complete.\nAdded: {result.added} channels\nRemoved: {result.removed} channels"
+        if result.errors:
+            text += f"\n\nErrors:\n" + "\n".join(result.errors[:10])
+            if len(result.errors) > 10:
+                text += f"\n... and {len(result.errors) - 10} more errors"
+        return text
+    
+    async def _send_sync_plan(self, interaction: discord.Interaction, plan: TemplateSyncPlan):
+        if not plan.total and not plan.errors:
+            await interaction.followup.send("Dry run: all projects already match the template.")
+            return
+        
+        by_project = {}
+        for item in plan.additions:
+            by_project.setdefault(item.project.acronym, []).append(f"+ {item.channel_name}")
+        for item in plan.removals:
+            by_project.setdefault(item.project.acronym, []).append(f"- {item.channel.name}")
+        
+        lines = []
+        for acronym, changes in by_project.items():
+            lines.append(f"[{acronym}]")
+            lines.extend(changes)
+        lines.extend(f"! {error}" for error in plan.errors)
+        
+        summary = f"Dry run: {len(plan.additions)} to add, {len(plan.removals)} to remove across {len(by_project)} projects."
+        body = "\n".join(lines)
+        if len(summary) + len(body) < 1900:
+            await interaction.followup.send(f"{summary}\n```diff\n{body}\n```")
+        else:
+            file = discord.File(io.BytesIO(body.encode('utf-8')), filename="template-sync-plan.txt")
+            await interaction.followup.send(summary, file=file)
     
     @template_group.command(name="export", description="Export template to JSON file")
     @app_commands.checks.has_permissions(administrator=True)
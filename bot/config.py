@@ -11,6 +11,31 @@ GUILD_ID = os.getenv("GUILD_ID")
 
 DATABASE_PATH = "data/bot.db"
 
+# Number of long-lived SQLite connections shared by all database calls
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "4"))
+
+# SQLite durability profile: "safe", "balanced" or "fast" (see database.STORAGE_PROFILES)
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "balanced")
+
+# Task history rows are written in batches of up to this size, at most this many seconds after being queued
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "50"))
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", "1"))
+
+# Members whose project roles are reconciled in parallel by the background role sync
+ROLE_SYNC_CONCURRENCY = int(os.getenv("ROLE_SYNC_CONCURRENCY", "4"))
+
+# Role and channel creations in flight per rate-limit bucket during /project new
+PROVISION_CONCURRENCY = int(os.getenv("PROVISION_CONCURRENCY", "4"))
+
+# Imported tasks whose header, thread and control panel are posted in parallel by /task import
+IMPORT_CONCURRENCY = int(os.getenv("IMPORT_CONCURRENCY", "4"))
+
+# Reminder posts and DMs in flight at once when a batch of reminders falls due
+REMINDER_CONCURRENCY = int(os.getenv("REMINDER_CONCURRENCY", "4"))
+
+# Seconds to collect task changes before re-rendering a project's dashboard
+DASHBOARD_DEBOUNCE_SECONDS = float(os.getenv("DASHBOARD_DEBOUNCE_SECONDS", "2"))
+
 # Member roles (server-wide, manually assigned)
 MEMBER_ROLES = ["Coder", "Artist", "Audio", "Writer", "QA"]
 
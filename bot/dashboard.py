@@ -0,0 +1,66 @@
+import asyncio
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, Set
+
+import discord
+
+
+class DebouncedRenderer:
+    """
+    Coalesces bursts of render requests per key into one render.
+
+    `schedule(key)` marks the key dirty; the render callback runs once
+    `window` seconds after the first request, however many more arrive in
+    between. Renders of one key never overlap: a request that lands
+    mid-render is remembered, and exactly one more pass runs (after
+    another window) once the current render has finished.
+    """
+
+    def __init__(self, render: Callable[[str], Awaitable[None]], window: float):
+        self.render = render
+        self.window = window
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._rendering: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self.requested = 0
+        self.rendered = 0
+
+    def schedule(self, key: str):
+        self.requested += 1
+        if key not in self._pending:
+            self._pending[key] = asyncio.create_task(self._fire(key))
+        elif key in self._rendering:
+            self._dirty.add(key)
+
+    async def _fire(self, key: str):
+        try:
+            while True:
+                await asyncio.sleep(self.window)
+                self._rendering.add(key)
+                self.rendered += 1
+                try:
+                    await self.render(key)
+                except Exception as e:
+                    print(f"Failed to render {key}: {e}")
+                finally:
+                    self._rendering.discard(key)
+                if key not in self._dirty:
+                    return
+                self._dirty.discard(key)
+        finally:
+            if self._pending.get(key) is asyncio.current_task():
+                del self._pending[key]
+                self._dirty.discard(key)
+
+    def cancel_all(self):
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+        self._dirty.clear()
+
+
+def embed_hash(embed: discord.Embed) -> str:
+    """Stable hash of an embed's payload, used to skip edits that change nothing."""
+    payload = json.dumps(embed.to_dict(), sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
@@ -1,236 +1,227 @@
+import asyncio
+import json
+import re
+import time
 import aiosqlite
-from typing import List, Optional, Set
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .cache import thread_index, project_role_cache, project_index, server_configs
+from .config import DATABASE_PATH, DATABASE_POOL_SIZE, DATABASE_PROFILE, HISTORY_BATCH_SIZE, HISTORY_FLUSH_INTERVAL
+from .migrations import TASK_STATS_BACKFILL, migrate
+from .models import Project, Group, TemplateChannel, ProjectChannel, ProjectRole, ProjectTaskStats, Task, TaskPage, TaskHistory, TaskBoard, TaskAssignee, ServerConfig, RoleSyncProgress, ImportJob, ImportJobRow
+
+
+# ============== CONNECTION POOL ==============
+
+# PRAGMAs applied to every pooled connection, selected by DATABASE_PROFILE.
+# All profiles use WAL so writers never block readers; they differ in how
+# often SQLite fsyncs and how much memory it may use.
+STORAGE_PROFILES = {
+    # fsync on every commit: survives power loss, slowest writes
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    # fsync at checkpoints only: a power cut may lose the last commits, never corrupts
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # no fsync: an OS crash may corrupt the database, use only with backups
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+class ConnectionPool:
+    """Fixed-size pool of long-lived aiosqlite connections.
+
+    Each aiosqlite connection owns a worker thread, so opening one per query
+    costs a thread spawn plus a file open. The pool opens `size` connections
+    once and hands them out exclusively for the duration of an `acquire()`.
+    """
+
+    def __init__(self, path: str, size: int, profile: str = "balanced"):
+        if profile not in STORAGE_PROFILES:
+            raise ValueError(
+                f"Unknown DATABASE_PROFILE '{profile}'. Use one of: {', '.join(STORAGE_PROFILES)}"
+            )
+        self.path = path
+        self.size = max(1, size)
+        self.profile = profile
+        self._idle: Optional[asyncio.Queue] = None
+        self._connections: List[aiosqlite.Connection] = []
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._idle is not None
+
+    async def open(self):
+        async with self._lock:
+            if self._idle is not None:
+                return
+            idle = asyncio.Queue()
+            for _ in range(self.size):
+                db = await aiosqlite.connect(self.path)
+                db.row_factory = aiosqlite.Row
+                for pragma, value in STORAGE_PROFILES[self.profile].items():
+                    await db.execute(f"PRAGMA {pragma} = {value}")
+                self._connections.append(db)
+                idle.put_nowait(db)
+            self._idle = idle
+
+    async def close(self):
+        async with self._lock:
+            if self._idle is None:
+                return
+            for db in self._connections:
+                await db.close()
+            self._connections.clear()
+            self._idle = None
+
+    @asynccontextmanager
+    async def acquire(self):
+        if self._idle is None:
+            await self.open()
+        idle = self._idle
+        db = await idle.get()
+        try:
+            yield db
+        finally:
+            # Never hand a half-finished transaction to the next caller
+            if db.in_transaction:
+                await db.rollback()
+            idle.put_nowait(db)
+
+
+_pool = ConnectionPool(DATABASE_PATH, DATABASE_POOL_SIZE, DATABASE_PROFILE)
+
+
+class _Transaction:
+    def __init__(self, db: aiosqlite.Connection):
+        self.db = db
+        self.active = True
+        self.on_commit: List[Callable[[], None]] = []
+        self.on_rollback: List[Callable[[], None]] = []
+
+
+# Unit of work the current task is running inside, if any
+_current_transaction: ContextVar[Optional[_Transaction]] = ContextVar("_current_transaction", default=None)
+
+
+def _active_transaction() -> Optional[_Transaction]:
+    tx = _current_transaction.get()
+    # Tasks spawned inside a transaction inherit the context var, but must not
+    # reuse the connection once that transaction has finished
+    return tx if tx is not None and tx.active else None
+
+
+@asynccontextmanager
+async def _connection():
+    """Yield the current transaction's connection, or borrow one from the pool."""
+    tx = _active_transaction()
+    if tx is not None:
+        yield tx.db
+        return
+    async with _pool.acquire() as db:
+        yield db
+
+
+async def _commit(db: aiosqlite.Connection):
+    """Commit unless the write is part of an enclosing transaction()."""
+    if _active_transaction() is None:
+        await db.commit()
+
+
+def _after_commit(callback: Callable[[], None]):
+    """Run an in-memory cache update once the current write is durable."""
+    tx = _active_transaction()
+    if tx is not None:
+        tx.on_commit.append(callback)
+    else:
+        callback()
+
+
+@asynccontextmanager
+async def transaction():
+    """
+    Group several database calls into one atomic commit.
+
+    Every database function awaited inside the block shares one connection
+    and skips its own commit; the block commits once on exit and rolls back
+    everything if it raises. Nested blocks join the outer transaction.
+
+    Example:
+        async with transaction():
+            await update_task_status(task_id, 'done')
+            await add_task_history(task_id, user_id, 'status_change', 'review', 'done')
+    """
+    if _active_transaction() is not None:
+        yield
+        return
+
+    async with _pool.acquire() as db:
+        tx = _Transaction(db)
+        token = _current_transaction.set(tx)
+        try:
+            await db.execute("BEGIN IMMEDIATE")
+            yield
+            await db.commit()
+            for callback in tx.on_commit:
+                callback()
+        except BaseException:
+            await db.rollback()
+            for callback in tx.on_rollback:
+                callback()
+            raise
+        finally:
+            tx.active = False
+            _current_transaction.reset(token)
+
 
-from .config import DATABASE_PATH, DEFAULT_GROUPS, DEFAULT_TEMPLATE
-from .models import Project, Group, TemplateChannel, ProjectChannel, ProjectRole, Task, TaskHistory, TaskBoard, TaskAssignee, ServerConfig
+async def close_db():
+    """Flush queued writes and close all pooled connections. Called on bot shutdown."""
+    if _pool.is_open:
+        await history_writer.close()
+    await _pool.close()
 
 
 async def init_db():
-    """Initialize database schema and seed default data."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        # MIGRATION: Rename games -> projects (must run BEFORE CREATE TABLE)
-        cursor = await db.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='games'")
-        if await cursor.fetchone():
-            cursor2 = await db.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='projects'")
-            if await cursor2.fetchone():
-                await db.execute("DROP TABLE IF EXISTS games")
-                await db.execute("DROP TABLE IF EXISTS game_channels")
-                await db.execute("DROP TABLE IF EXISTS game_roles")
-            else:
-                await db.execute("ALTER TABLE games RENAME TO projects")
-                await db.execute("ALTER TABLE game_channels RENAME TO project_channels")
-                await db.execute("ALTER TABLE game_roles RENAME TO project_roles")
-            
-            cursor = await db.execute("PRAGMA table_info(tasks)")
-            columns = [row[1] for row in await cursor.fetchall()]
-            if 'game_acronym' in columns:
-                await db.execute("""
-                    CREATE TABLE tasks_new (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        project_acronym TEXT NOT NULL,
-                        title TEXT NOT NULL,
-                        description TEXT,
-                        assignee_id INTEGER NOT NULL,
-                        target_channel_id INTEGER NOT NULL,
-                        thread_id INTEGER,
-                        control_message_id INTEGER,
-                        header_message_id INTEGER,
-                        status TEXT DEFAULT 'todo',
-                        deadline DATETIME,
-                        eta TEXT,
-                        priority TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                await db.execute("""
-                    INSERT INTO tasks_new (id, project_acronym, title, description, assignee_id, 
-                        target_channel_id, thread_id, control_message_id, header_message_id,
-                        status, deadline, eta, priority, created_at, updated_at)
-                    SELECT id, game_acronym, title, description, assignee_id,
-                        target_channel_id, thread_id, control_message_id, header_message_id,
-                        status, deadline, eta, priority, created_at, updated_at
-                    FROM tasks
-                """)
-                await db.execute("DROP TABLE tasks")
-                await db.execute("ALTER TABLE tasks_new RENAME TO tasks")
-            
-            cursor = await db.execute("PRAGMA table_info(task_boards)")
-            columns = [row[1] for row in await cursor.fetchall()]
-            if 'game_acronym' in columns:
-                await db.execute("""
-                    CREATE TABLE task_boards_new (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        project_acronym TEXT NOT NULL UNIQUE,
-                        channel_id INTEGER NOT NULL,
-                        message_ids TEXT NOT NULL
-                    )
-                """)
-                await db.execute("""
-                    INSERT INTO task_boards_new (id, project_acronym, channel_id, message_ids)
-                    SELECT id, game_acronym, channel_id, message_ids FROM task_boards
-                """)
-                await db.execute("DROP TABLE task_boards")
-                await db.execute("ALTER TABLE task_boards_new RENAME TO task_boards")
-            
-            await db.commit()
-        
-        # Create tables
-        await db.executescript("""
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                acronym TEXT UNIQUE NOT NULL,
-                category_id INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS groups (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                emoji TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS template_channels (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                group_name TEXT NOT NULL,
-                is_voice BOOLEAN DEFAULT 0,
-                description TEXT,
-                UNIQUE(name)
-            );
-
-            CREATE TABLE IF NOT EXISTS project_channels (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id INTEGER NOT NULL,
-                channel_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                group_name TEXT NOT NULL,
-                is_custom BOOLEAN DEFAULT 0,
-                is_voice BOOLEAN DEFAULT 0,
-                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS project_roles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id INTEGER NOT NULL,
-                role_id INTEGER NOT NULL,
-                suffix TEXT NOT NULL,
-                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
-            );
-
-            -- Task management tables
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_acronym TEXT NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
-                assignee_id INTEGER NOT NULL,
-                target_channel_id INTEGER NOT NULL,
-                thread_id INTEGER,
-                control_message_id INTEGER,
-                header_message_id INTEGER,
-                status TEXT DEFAULT 'todo',
-                deadline DATETIME,
-                eta TEXT,
-                priority TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS task_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                action TEXT NOT NULL,
-                old_value TEXT,
-                new_value TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS task_boards (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_acronym TEXT NOT NULL UNIQUE,
-                channel_id INTEGER NOT NULL,
-                message_ids TEXT NOT NULL
-            );
-
-            -- Multi-assignee support
-            CREATE TABLE IF NOT EXISTS task_assignees (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                is_primary BOOLEAN DEFAULT 0,
-                has_approved BOOLEAN DEFAULT 0,
-                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE,
-                UNIQUE(task_id, user_id)
-            );
-
-            -- Server configuration
-            CREATE TABLE IF NOT EXISTS server_config (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL UNIQUE,
-                config_json TEXT NOT NULL DEFAULT '{}',
-                setup_completed BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-        
-        # Migration: Add header_message_id column if it doesn't exist
-        cursor = await db.execute("PRAGMA table_info(tasks)")
-        columns = [row[1] for row in await cursor.fetchall()]
-        if 'header_message_id' not in columns:
-            await db.execute("ALTER TABLE tasks ADD COLUMN header_message_id INTEGER")
-        
-        # Migration: Create task_assignees index for performance
-        await db.execute("""
-            CREATE INDEX IF NOT EXISTS idx_task_assignees_task_id 
-            ON task_assignees(task_id)
-        """)
-        await db.execute("""
-            CREATE INDEX IF NOT EXISTS idx_task_assignees_user_id 
-            ON task_assignees(user_id)
-        """)
-        
-        # Seed default groups if empty
-        cursor = await db.execute("SELECT COUNT(*) FROM groups")
-        count = (await cursor.fetchone())[0]
-        if count == 0:
-            for name, emoji in DEFAULT_GROUPS.items():
-                await db.execute(
-                    "INSERT INTO groups (name, emoji) VALUES (?, ?)",
-                    (name, emoji)
-                )
-        
-        # Seed default template channels if empty
-        cursor = await db.execute("SELECT COUNT(*) FROM template_channels")
-        count = (await cursor.fetchone())[0]
-        if count == 0:
-            for name, group_name, is_voice, description in DEFAULT_TEMPLATE:
-                await db.execute(
-                    "INSERT INTO template_channels (name, group_name, is_voice, description) VALUES (?, ?, ?, ?)",
-                    (name, group_name, is_voice, description)
-                )
-        
-        await db.commit()
+    """Open the connection pool and bring the schema up to date (see migrations.py)."""
+    await _pool.open()
+    async with _pool.acquire() as db:
+        for version, name, seconds in await migrate(db):
+            print(f"Applied schema migration {version} ({name}) in {seconds * 1000:.1f} ms")
 
 
 # ============== GROUPS ==============
 
 async def get_all_groups() -> List[Group]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute("SELECT * FROM groups")
         rows = await cursor.fetchall()
         return [Group(id=r["id"], name=r["name"], emoji=r["emoji"]) for r in rows]
 
 
 async def get_group(name: str) -> Optional[Group]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute("SELECT * FROM groups WHERE name = ?", (name,))
         row = await cursor.fetchone()
         if row:
@@ -239,12 +230,12 @@ async def get_group(name: str) -> Optional[Group]:
 
 
 async def update_group_emoji(name: str, emoji: str) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "UPDATE groups SET emoji = ? WHERE name = ?",
             (emoji, name)
         )
-        await db.commit()
+        await _commit(db)
         return cursor.rowcount > 0
 
 
@@ -256,21 +247,20 @@ async def get_groups_dict() -> dict:
 
 async def upsert_group(name: str, emoji: str) -> bool:
     """Insert or update a group."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         await db.execute(
             """INSERT INTO groups (name, emoji) VALUES (?, ?)
                ON CONFLICT(name) DO UPDATE SET emoji = excluded.emoji""",
             (name, emoji)
         )
-        await db.commit()
+        await _commit(db)
         return True
 
 
 # ============== TEMPLATE CHANNELS ==============
 
 async def get_all_template_channels() -> List[TemplateChannel]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute("SELECT * FROM template_channels ORDER BY id")
         rows = await cursor.fetchall()
         return [
@@ -287,38 +277,38 @@ async def get_all_template_channels() -> List[TemplateChannel]:
 
 async def add_template_channel(name: str, group_name: str, is_voice: bool = False, description: str = None) -> bool:
     try:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _connection() as db:
             await db.execute(
                 "INSERT INTO template_channels (name, group_name, is_voice, description) VALUES (?, ?, ?, ?)",
                 (name, group_name, is_voice, description)
             )
-            await db.commit()
+            await _commit(db)
             return True
     except aiosqlite.IntegrityError:
         return False
 
 
 async def remove_template_channel(name: str) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "DELETE FROM template_channels WHERE name = ?",
             (name,)
         )
-        await db.commit()
+        await _commit(db)
         return cursor.rowcount > 0
 
 
 async def clear_template_channels() -> int:
     """Delete all template channels. Returns count deleted."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute("DELETE FROM template_channels")
-        await db.commit()
+        await _commit(db)
         return cursor.rowcount
 
 
 async def upsert_template_channel(name: str, group_name: str, is_voice: bool = False, description: str = None) -> bool:
     """Insert or update a template channel."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         await db.execute(
             """INSERT INTO template_channels (name, group_name, is_voice, description) 
                VALUES (?, ?, ?, ?)
@@ -328,13 +318,12 @@ async def upsert_template_channel(name: str, group_name: str, is_voice: bool = F
                description = excluded.description""",
             (name, group_name, is_voice, description)
         )
-        await db.commit()
+        await _commit(db)
         return True
 
 
 async def get_template_channel(name: str) -> Optional[TemplateChannel]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM template_channels WHERE name = ?",
             (name,)
@@ -354,8 +343,7 @@ async def get_template_channel(name: str) -> Optional[TemplateChannel]:
 # ============== PROJECTS ==============
 
 async def get_all_projects() -> List[Project]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute("SELECT * FROM projects ORDER BY created_at DESC")
         rows = await cursor.fetchall()
         return [
@@ -371,10 +359,9 @@ async def get_all_projects() -> List[Project]:
 
 
 async def get_project_by_acronym(acronym: str) -> Optional[Project]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
-            "SELECT * FROM projects WHERE LOWER(acronym) = LOWER(?)",
+            "SELECT * FROM projects WHERE acronym = ? COLLATE NOCASE",
             (acronym,)
         )
         row = await cursor.fetchone()
@@ -390,39 +377,42 @@ async def get_project_by_acronym(acronym: str) -> Optional[Project]:
 
 
 async def get_all_acronyms() -> Set[str]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute("SELECT acronym FROM projects")
         rows = await cursor.fetchall()
         return {r[0] for r in rows}
 
 
 async def create_project(name: str, acronym: str, category_id: int) -> Project:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "INSERT INTO projects (name, acronym, category_id) VALUES (?, ?, ?)",
             (name, acronym, category_id)
         )
-        await db.commit()
-        return Project(
+        await _commit(db)
+        project = Project(
             id=cursor.lastrowid,
             name=name,
             acronym=acronym,
             category_id=category_id
         )
+        _after_commit(lambda: project_index.add_project(project))
+        return project
 
 
 async def delete_project(project_id: int) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute("DELETE FROM projects WHERE id = ?", (project_id,))
-        await db.commit()
+        await _commit(db)
+        _after_commit(project_role_cache.invalidate)
+        _after_commit(lambda: project_index.remove_project(project_id))
         return cursor.rowcount > 0
 
 
 # ============== PROJECT CHANNELS ==============
 
 async def get_project_channels(project_id: int) -> List[ProjectChannel]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM project_channels WHERE project_id = ?",
             (project_id,)
@@ -450,14 +440,15 @@ async def add_project_channel(
     is_custom: bool = False,
     is_voice: bool = False
 ) -> ProjectChannel:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             """INSERT INTO project_channels 
                (project_id, channel_id, name, group_name, is_custom, is_voice) 
                VALUES (?, ?, ?, ?, ?, ?)""",
             (project_id, channel_id, name, group_name, is_custom, is_voice)
         )
-        await db.commit()
+        await _commit(db)
+        _after_commit(lambda: project_index.add_channel(project_id, channel_id, name))
         return ProjectChannel(
             id=cursor.lastrowid,
             project_id=project_id,
@@ -470,7 +461,7 @@ async def add_project_channel(
 
 
 async def remove_project_channel(project_id: int, name: str) -> Optional[int]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT channel_id FROM project_channels WHERE project_id = ? AND name = ?",
             (project_id, name)
@@ -484,13 +475,13 @@ async def remove_project_channel(project_id: int, name: str) -> Optional[int]:
             "DELETE FROM project_channels WHERE project_id = ? AND name = ?",
             (project_id, name)
         )
-        await db.commit()
+        await _commit(db)
+        _after_commit(lambda: project_index.remove_channel(project_id, name))
         return channel_id
 
 
 async def get_project_channel_by_name(project_id: int, name: str) -> Optional[ProjectChannel]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM project_channels WHERE project_id = ? AND name = ?",
             (project_id, name)
@@ -510,8 +501,7 @@ async def get_project_channel_by_name(project_id: int, name: str) -> Optional[Pr
 
 
 async def get_non_custom_project_channels(project_id: int) -> List[ProjectChannel]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM project_channels WHERE project_id = ? AND is_custom = 0",
             (project_id,)
@@ -531,11 +521,75 @@ async def get_non_custom_project_channels(project_id: int) -> List[ProjectChanne
         ]
 
 
+
+async def get_all_non_custom_project_channels() -> Dict[int, List[ProjectChannel]]:
+    """Non-custom channels of every project, keyed by project id."""
+    async with _connection() as db:
+        cursor = await db.execute("SELECT * FROM project_channels WHERE is_custom = 0")
+        rows = await cursor.fetchall()
+        by_project: Dict[int, List[ProjectChannel]] = {}
+        for r in rows:
+            by_project.setdefault(r["project_id"], []).append(ProjectChannel(
+                id=r["id"],
+                project_id=r["project_id"],
+                channel_id=r["channel_id"],
+                name=r["name"],
+                group_name=r["group_name"],
+                is_custom=bool(r["is_custom"]),
+                is_voice=bool(r["is_voice"])
+            ))
+        return by_project
+
+
+async def add_project_channels(channels: List[ProjectChannel]):
+    """Insert many project channels with one executemany; ids are not filled in."""
+    if not channels:
+        return
+    async with _connection() as db:
+        await db.executemany(
+            """INSERT INTO project_channels 
+               (project_id, channel_id, name, group_name, is_custom, is_voice) 
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(ch.project_id, ch.channel_id, ch.name, ch.group_name, ch.is_custom, ch.is_voice) for ch in channels]
+        )
+        await _commit(db)
+
+        def index_channels():
+            for ch in channels:
+                project_index.add_channel(ch.project_id, ch.channel_id, ch.name)
+        _after_commit(index_channels)
+
+
+async def remove_project_channels(channels: List[Tuple[int, str]]):
+    """Delete many (project_id, name) project channels with one executemany."""
+    if not channels:
+        return
+    async with _connection() as db:
+        await db.executemany(
+            "DELETE FROM project_channels WHERE project_id = ? AND name = ?",
+            channels
+        )
+        await _commit(db)
+
+        def unindex_channels():
+            for project_id, name in channels:
+                project_index.remove_channel(project_id, name)
+        _after_commit(unindex_channels)
+
+
+async def load_project_index():
+    """Fill the in-memory channel/category -> project index."""
+    projects = await get_all_projects()
+    async with _connection() as db:
+        cursor = await db.execute("SELECT project_id, channel_id, name FROM project_channels")
+        channels = [(r["project_id"], r["channel_id"], r["name"]) for r in await cursor.fetchall()]
+    project_index.load(projects, channels)
+
+
 # ============== PROJECT ROLES ==============
 
 async def get_project_roles(project_id: int) -> List[ProjectRole]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM project_roles WHERE project_id = ?",
             (project_id,)
@@ -553,12 +607,13 @@ async def get_project_roles(project_id: int) -> List[ProjectRole]:
 
 
 async def add_project_role(project_id: int, role_id: int, suffix: str) -> ProjectRole:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "INSERT INTO project_roles (project_id, role_id, suffix) VALUES (?, ?, ?)",
             (project_id, role_id, suffix)
         )
-        await db.commit()
+        await _commit(db)
+        _after_commit(project_role_cache.invalidate)
         return ProjectRole(
             id=cursor.lastrowid,
             project_id=project_id,
@@ -568,8 +623,7 @@ async def add_project_role(project_id: int, role_id: int, suffix: str) -> Projec
 
 
 async def get_all_project_roles() -> List[ProjectRole]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute("SELECT * FROM project_roles")
         rows = await cursor.fetchall()
         return [
@@ -583,8 +637,39 @@ async def get_all_project_roles() -> List[ProjectRole]:
         ]
 
 
+async def get_project_role_map() -> Dict[str, List[int]]:
+    """Return member-role suffix -> project role ids, cached until project roles change."""
+    if not project_role_cache.is_loaded:
+        async with _connection() as db:
+            cursor = await db.execute(
+                "SELECT r.suffix, r.role_id FROM project_roles r JOIN projects p ON p.id = r.project_id"
+            )
+            project_role_cache.load((r["suffix"], r["role_id"]) for r in await cursor.fetchall())
+    return project_role_cache.get()
+
+
 # ============== TASKS ==============
 
+# Called with a task id after each committed write to that task's row
+_task_listeners: List[Callable[[int], None]] = []
+
+
+def add_task_listener(listener: Callable[[int], None]):
+    _task_listeners.append(listener)
+
+
+def remove_task_listener(listener: Callable[[int], None]):
+    if listener in _task_listeners:
+        _task_listeners.remove(listener)
+
+
+def _task_changed(task_id: int):
+    def notify():
+        for listener in _task_listeners:
+            listener(task_id)
+    _after_commit(notify)
+
+
 def _row_to_task(r) -> Task:
     return Task(
         id=r["id"],
@@ -614,14 +699,15 @@ async def create_task(
     deadline: str = None,
     priority: str = None
 ) -> Task:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             """INSERT INTO tasks 
                (project_acronym, title, description, assignee_id, target_channel_id, deadline, priority)
                VALUES (?, ?, ?, ?, ?, ?, ?)""",
             (project_acronym, title, description, assignee_id, target_channel_id, deadline, priority)
         )
-        await db.commit()
+        await _commit(db)
+        _task_changed(cursor.lastrowid)
         return Task(
             id=cursor.lastrowid,
             project_acronym=project_acronym,
@@ -640,8 +726,7 @@ async def create_task(
 
 
 async def get_task(task_id: int) -> Optional[Task]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
         row = await cursor.fetchone()
         if row:
@@ -650,8 +735,7 @@ async def get_task(task_id: int) -> Optional[Task]:
 
 
 async def get_task_by_thread_id(thread_id: int) -> Optional[Task]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute("SELECT * FROM tasks WHERE thread_id = ?", (thread_id,))
         row = await cursor.fetchone()
         if row:
@@ -659,9 +743,28 @@ async def get_task_by_thread_id(thread_id: int) -> Optional[Task]:
         return None
 
 
+async def get_tasks(task_ids: Iterable[int]) -> List[Task]:
+    task_ids = list(task_ids)
+    if not task_ids:
+        return []
+    async with _connection() as db:
+        cursor = await db.execute(
+            f"SELECT * FROM tasks WHERE id IN ({','.join('?' * len(task_ids))})",
+            task_ids
+        )
+        rows = await cursor.fetchall()
+        return [_row_to_task(r) for r in rows]
+
+
+async def get_open_tasks() -> List[Task]:
+    async with _connection() as db:
+        cursor = await db.execute("SELECT * FROM tasks WHERE status NOT IN ('done', 'cancelled')")
+        rows = await cursor.fetchall()
+        return [_row_to_task(r) for r in rows]
+
+
 async def get_tasks_by_project(project_acronym: str) -> List[Task]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM tasks WHERE project_acronym = ? ORDER BY created_at DESC",
             (project_acronym,)
@@ -671,8 +774,7 @@ async def get_tasks_by_project(project_acronym: str) -> List[Task]:
 
 
 async def get_tasks_by_assignee(assignee_id: int) -> List[Task]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM tasks WHERE assignee_id = ? AND status NOT IN ('done', 'cancelled') ORDER BY deadline ASC",
             (assignee_id,)
@@ -682,8 +784,7 @@ async def get_tasks_by_assignee(assignee_id: int) -> List[Task]:
 
 
 async def get_tasks_by_status(status: str, project_acronym: str = None) -> List[Task]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         if project_acronym:
             cursor = await db.execute(
                 "SELECT * FROM tasks WHERE status = ? AND project_acronym = ? ORDER BY created_at DESC",
@@ -700,8 +801,7 @@ async def get_tasks_by_status(status: str, project_acronym: str = None) -> List[
 
 async def get_overdue_tasks() -> List[Task]:
     """Get tasks past deadline that are not done."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             """SELECT * FROM tasks 
                WHERE status NOT IN ('done', 'cancelled')
@@ -715,8 +815,7 @@ async def get_overdue_tasks() -> List[Task]:
 
 async def get_tasks_due_soon(hours: int = 24) -> List[Task]:
     """Get tasks due within the next N hours."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             f"""SELECT * FROM tasks 
                WHERE status NOT IN ('done', 'cancelled')
@@ -731,8 +830,7 @@ async def get_tasks_due_soon(hours: int = 24) -> List[Task]:
 
 async def get_stagnant_tasks(days: int = 3) -> List[Task]:
     """Get in-progress tasks not updated in N days."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             f"""SELECT * FROM tasks 
                WHERE status = 'progress' 
@@ -743,89 +841,316 @@ async def get_stagnant_tasks(days: int = 3) -> List[Task]:
         return [_row_to_task(r) for r in rows]
 
 
+async def get_task_page(
+    project_acronym: Optional[str] = None,
+    status: Optional[str] = None,
+    assignee_id: Optional[int] = None,
+    open_only: bool = False,
+    after: Optional[Tuple[str, int]] = None,
+    before: Optional[Tuple[str, int]] = None,
+    limit: int = 10
+) -> TaskPage:
+    """
+    One page of tasks, newest first, paginated by keyset on (created_at, id).
+
+    Pass the previous page's `last_key` as `after` for the next page, or
+    its `first_key` as `before` to step back. `assignee_id` matches any
+    assignee of a task, not only the primary one. Only `limit + 1` rows
+    are read; the extra row tells whether the listing goes on.
+    """
+    sql = "SELECT t.* FROM tasks t"
+    where: List[str] = []
+    params: list = []
+    if assignee_id is not None:
+        sql += " JOIN task_assignees ta ON t.id = ta.task_id"
+        where.append("ta.user_id = ?")
+        params.append(assignee_id)
+    if project_acronym:
+        where.append("t.project_acronym = ?")
+        params.append(project_acronym)
+    if status:
+        where.append("t.status = ?")
+        params.append(status)
+    if open_only:
+        where.append("t.status NOT IN ('done', 'cancelled')")
+
+    backwards = before is not None
+    if backwards:
+        where.append("(t.created_at, t.id) > (?, ?)")
+        params.extend(before)
+    elif after is not None:
+        where.append("(t.created_at, t.id) < (?, ?)")
+        params.extend(after)
+
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    direction = "ASC" if backwards else "DESC"
+    sql += f" ORDER BY t.created_at {direction}, t.id {direction} LIMIT ?"
+    params.append(limit + 1)
+
+    async with _connection() as db:
+        cursor = await db.execute(sql, params)
+        rows = await cursor.fetchall()
+
+    more = len(rows) > limit
+    tasks = [_row_to_task(r) for r in rows[:limit]]
+    if backwards:
+        tasks.reverse()
+        return TaskPage(tasks, has_prev=more, has_next=True)
+    return TaskPage(tasks, has_prev=after is not None, has_next=more)
+
+
+def _fts_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+async def search_tasks(
+    query: str,
+    project_acronym: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 10
+) -> List[Task]:
+    """Full-text search over title, description and questions, best match first (bm25)."""
+    match = _fts_query(query)
+    if not match:
+        return []
+
+    sql = """SELECT t.* FROM tasks_fts
+             JOIN tasks t ON t.id = tasks_fts.rowid
+             WHERE tasks_fts MATCH ?"""
+    params: list = [match]
+    if project_acronym:
+        sql += " AND t.project_acronym = ? COLLATE NOCASE"
+        params.append(project_acronym)
+    if status:
+        sql += " AND t.status = ?"
+        params.append(status)
+    # rank is bm25 weighted title > description > questions (set in migration 5)
+    sql += " ORDER BY tasks_fts.rank LIMIT ?"
+    params.append(limit)
+
+    async with _connection() as db:
+        cursor = await db.execute(sql, params)
+        rows = await cursor.fetchall()
+        return [_row_to_task(r) for r in rows]
+
+
 async def update_task_thread(task_id: int, thread_id: int, control_message_id: int) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             """UPDATE tasks SET thread_id = ?, control_message_id = ?, updated_at = CURRENT_TIMESTAMP 
                WHERE id = ?""",
             (thread_id, control_message_id, task_id)
         )
-        await db.commit()
+        await _commit(db)
+        _after_commit(lambda: thread_index.set_thread(task_id, thread_id))
+        _task_changed(task_id)
         return cursor.rowcount > 0
 
 
 async def update_task_status(task_id: int, status: str) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "UPDATE tasks SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
             (status, task_id)
         )
-        await db.commit()
+        await _commit(db)
+        _task_changed(task_id)
         return cursor.rowcount > 0
 
 
 async def update_task_eta(task_id: int, eta: str) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "UPDATE tasks SET eta = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
             (eta, task_id)
         )
-        await db.commit()
+        await _commit(db)
+        _task_changed(task_id)
         return cursor.rowcount > 0
 
 
 async def update_task_assignee(task_id: int, assignee_id: int) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "UPDATE tasks SET assignee_id = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
             (assignee_id, task_id)
         )
-        await db.commit()
+        await _commit(db)
+        _task_changed(task_id)
         return cursor.rowcount > 0
 
 
 async def update_task_priority(task_id: int, priority: str) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "UPDATE tasks SET priority = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
             (priority, task_id)
         )
-        await db.commit()
+        await _commit(db)
+        _task_changed(task_id)
         return cursor.rowcount > 0
 
 
 async def update_task_header_message(task_id: int, header_message_id: int) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "UPDATE tasks SET header_message_id = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
             (header_message_id, task_id)
         )
-        await db.commit()
+        await _commit(db)
+        _task_changed(task_id)
         return cursor.rowcount > 0
 
 
 async def delete_task(task_id: int) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-        await db.commit()
+        await db.execute("DELETE FROM task_assignees WHERE task_id = ?", (task_id,))
+        await db.execute("DELETE FROM task_reminders WHERE task_id = ?", (task_id,))
+        await _commit(db)
+        _after_commit(lambda: thread_index.remove_task(task_id))
+        _task_changed(task_id)
         return cursor.rowcount > 0
 
 
 # ============== TASK HISTORY ==============
 
+class HistoryWriter:
+    """
+    Write-behind buffer for task_history rows.
+
+    add() never touches SQLite; rows are inserted by a background task with
+    one executemany per batch, once `batch_size` rows are waiting or
+    `interval` seconds after the first one arrived. Rows keep the time they
+    were added, not the time they were flushed. A failed flush keeps its
+    rows for the next attempt. drain() flushes everything, waiting for a
+    batch already being written; it runs before history is read. close()
+    drains and stops the flusher on shutdown.
+    """
+
+    def __init__(self, batch_size: int, interval: float):
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self._pending: List[tuple] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._stopped = False
+        self.flushed = 0
+        self.flushes = 0
+        self.last_flush_ms: Optional[float] = None
+        self.max_flush_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def add(self, row: tuple):
+        self._stopped = False
+        self._pending.append(row)
+        self._start()
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def _start(self):
+        if self._stopped:
+            return
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            while self._pending:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                try:
+                    await self.flush()
+                except Exception as e:
+                    print(f"Failed to write task history ({self.depth} rows pending): {e}")
+                    await asyncio.sleep(self.interval)
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+                # A flush cancelled mid-write put its batch back
+                if self._pending:
+                    self._start()
+
+    async def flush(self):
+        # An empty queue with the lock held means a batch is being written;
+        # wait for it so a drain() before a read sees those rows too
+        if not self._pending and not self._flush_lock.locked():
+            return
+        # The connection is taken before the lock, so a flush waiting on the
+        # pool never holds up a drain() running inside transaction() on the
+        # connection that flush is waiting for
+        async with _connection() as db:
+            async with self._flush_lock:
+                await self._write(db)
+
+    async def _write(self, db: aiosqlite.Connection):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        started = time.perf_counter()
+        try:
+            await db.executemany(
+                """INSERT INTO task_history (task_id, user_id, action, old_value, new_value, timestamp)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                batch
+            )
+            await _commit(db)
+        except BaseException:
+            self._requeue(batch)
+            raise
+        tx = _active_transaction()
+        if tx is not None:
+            # Written as part of the caller's transaction; keep the rows if it rolls back
+            tx.on_rollback.append(lambda: self._requeue(batch))
+        elapsed = (time.perf_counter() - started) * 1000
+        self.flushes += 1
+        self.flushed += len(batch)
+        self.last_flush_ms = elapsed
+        self.max_flush_ms = max(self.max_flush_ms, elapsed)
+
+    def _requeue(self, batch: List[tuple]):
+        self._pending = batch + self._pending
+        self._start()
+
+    async def drain(self):
+        await self.flush()
+
+    async def close(self):
+        await self.flush()
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+history_writer = HistoryWriter(HISTORY_BATCH_SIZE, HISTORY_FLUSH_INTERVAL)
+
+
 async def add_task_history(task_id: int, user_id: int, action: str, old_value: str = None, new_value: str = None):
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        await db.execute(
-            """INSERT INTO task_history (task_id, user_id, action, old_value, new_value)
-               VALUES (?, ?, ?, ?, ?)""",
-            (task_id, user_id, action, old_value, new_value)
-        )
-        await db.commit()
+    """
+    Queue a history row; see HistoryWriter. Inside transaction() the row is
+    only queued once the transaction commits.
+    """
+    row = (task_id, user_id, action, old_value, new_value, datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'))
+    _after_commit(lambda: history_writer.add(row))
 
 
 async def get_task_history(task_id: int) -> List[TaskHistory]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    await history_writer.drain()
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM task_history WHERE task_id = ? ORDER BY timestamp DESC",
             (task_id,)
@@ -848,8 +1173,7 @@ async def get_task_history(task_id: int) -> List[TaskHistory]:
 # ============== TASK BOARDS ==============
 
 async def get_task_board(project_acronym: str) -> Optional[TaskBoard]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM task_boards WHERE project_acronym = ?",
             (project_acronym,)
@@ -866,7 +1190,7 @@ async def get_task_board(project_acronym: str) -> Optional[TaskBoard]:
 
 
 async def upsert_task_board(project_acronym: str, channel_id: int, message_ids: str) -> TaskBoard:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         await db.execute(
             """INSERT INTO task_boards (project_acronym, channel_id, message_ids)
                VALUES (?, ?, ?)
@@ -875,7 +1199,7 @@ async def upsert_task_board(project_acronym: str, channel_id: int, message_ids:
                message_ids = excluded.message_ids""",
             (project_acronym, channel_id, message_ids)
         )
-        await db.commit()
+        await _commit(db)
         return TaskBoard(
             id=None,
             project_acronym=project_acronym,
@@ -884,17 +1208,85 @@ async def upsert_task_board(project_acronym: str, channel_id: int, message_ids:
         )
 
 
+# ============== PROJECT TASK STATS ==============
+
+# project_task_stats columns plus the live overdue count for each row
+_TASK_STATS_SELECT = """
+    SELECT s.*, (
+        SELECT COUNT(*) FROM tasks t
+        WHERE t.project_acronym = s.project_acronym
+        AND t.status NOT IN ('done', 'cancelled')
+        AND t.deadline IS NOT NULL
+        AND t.deadline < datetime('now')
+    ) AS overdue
+    FROM project_task_stats s
+"""
+
+
+def _row_to_task_stats(r) -> ProjectTaskStats:
+    return ProjectTaskStats(
+        project_acronym=r["project_acronym"],
+        todo=r["todo"],
+        progress=r["progress"],
+        review=r["review"],
+        done=r["done"],
+        cancelled=r["cancelled"],
+        overdue=r["overdue"],
+        last_activity=r["last_activity"]
+    )
+
+
+async def get_project_task_stats(project_acronym: str) -> ProjectTaskStats:
+    """
+    Task counts for one project from the trigger-maintained project_task_stats
+    row. Overdue is counted from the open-deadline index, touching only the
+    project's overdue tasks.
+    """
+    async with _connection() as db:
+        cursor = await db.execute(_TASK_STATS_SELECT + " WHERE s.project_acronym = ?", (project_acronym,))
+        row = await cursor.fetchone()
+        if row:
+            return _row_to_task_stats(row)
+        return ProjectTaskStats(project_acronym=project_acronym)
+
+
+async def get_all_project_task_stats() -> Dict[str, ProjectTaskStats]:
+    async with _connection() as db:
+        cursor = await db.execute(_TASK_STATS_SELECT)
+        rows = await cursor.fetchall()
+        return {r["project_acronym"]: _row_to_task_stats(r) for r in rows}
+
+
+async def rebuild_project_task_stats() -> int:
+    """
+    Recount project_task_stats from the tasks table, repairing any drift
+    (e.g. from manual edits to the database). Returns how many projects'
+    counts changed.
+    """
+    columns = "project_acronym, todo, progress, review, done, cancelled"
+    async with transaction():
+        async with _connection() as db:
+            cursor = await db.execute(f"SELECT {columns} FROM project_task_stats")
+            before = {tuple(r) for r in await cursor.fetchall()}
+            await db.execute("DELETE FROM project_task_stats")
+            await db.execute(TASK_STATS_BACKFILL)
+            cursor = await db.execute(f"SELECT {columns} FROM project_task_stats")
+            after = {tuple(r) for r in await cursor.fetchall()}
+    return len({row[0] for row in before ^ after})
+
+
 # ============== TASK ASSIGNEES ==============
 
 async def add_task_assignee(task_id: int, user_id: int, is_primary: bool = False) -> TaskAssignee:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             """INSERT INTO task_assignees (task_id, user_id, is_primary)
                VALUES (?, ?, ?)
                ON CONFLICT(task_id, user_id) DO UPDATE SET is_primary = excluded.is_primary""",
             (task_id, user_id, is_primary)
         )
-        await db.commit()
+        await _commit(db)
+        _after_commit(lambda: thread_index.add_assignee(task_id, user_id))
         return TaskAssignee(
             id=cursor.lastrowid,
             task_id=task_id,
@@ -905,58 +1297,68 @@ async def add_task_assignee(task_id: int, user_id: int, is_primary: bool = False
 
 
 async def remove_task_assignee(task_id: int, user_id: int) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "DELETE FROM task_assignees WHERE task_id = ? AND user_id = ?",
             (task_id, user_id)
         )
-        await db.commit()
+        await _commit(db)
+        _after_commit(lambda: thread_index.remove_assignee(task_id, user_id))
         return cursor.rowcount > 0
 
 
+def _row_to_assignee(r) -> TaskAssignee:
+    return TaskAssignee(
+        id=r["id"],
+        task_id=r["task_id"],
+        user_id=r["user_id"],
+        is_primary=bool(r["is_primary"]),
+        has_approved=bool(r["has_approved"]),
+        added_at=r["added_at"]
+    )
+
+
 async def get_task_assignees(task_id: int) -> List[TaskAssignee]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM task_assignees WHERE task_id = ? ORDER BY is_primary DESC, added_at ASC",
             (task_id,)
         )
         rows = await cursor.fetchall()
-        return [
-            TaskAssignee(
-                id=r["id"],
-                task_id=r["task_id"],
-                user_id=r["user_id"],
-                is_primary=bool(r["is_primary"]),
-                has_approved=bool(r["has_approved"]),
-                added_at=r["added_at"]
-            )
-            for r in rows
-        ]
+        return [_row_to_assignee(r) for r in rows]
+
+
+async def get_assignees_for_tasks(task_ids: Iterable[int]) -> Dict[int, List[TaskAssignee]]:
+    """Assignees of several tasks in one query, primary first; tasks without any are left out."""
+    task_ids = list(task_ids)
+    if not task_ids:
+        return {}
+    async with _connection() as db:
+        cursor = await db.execute(
+            f"""SELECT * FROM task_assignees WHERE task_id IN ({','.join('?' * len(task_ids))})
+                ORDER BY task_id, is_primary DESC, added_at ASC""",
+            task_ids
+        )
+        assignees: Dict[int, List[TaskAssignee]] = {}
+        for r in await cursor.fetchall():
+            assignees.setdefault(r["task_id"], []).append(_row_to_assignee(r))
+        return assignees
 
 
 async def get_task_primary_assignee(task_id: int) -> Optional[TaskAssignee]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT * FROM task_assignees WHERE task_id = ? AND is_primary = 1",
             (task_id,)
         )
         row = await cursor.fetchone()
         if row:
-            return TaskAssignee(
-                id=row["id"],
-                task_id=row["task_id"],
-                user_id=row["user_id"],
-                is_primary=True,
-                has_approved=bool(row["has_approved"]),
-                added_at=row["added_at"]
-            )
+            return _row_to_assignee(row)
         return None
 
 
 async def set_task_primary_assignee(task_id: int, user_id: int) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         await db.execute(
             "UPDATE task_assignees SET is_primary = 0 WHERE task_id = ?",
             (task_id,)
@@ -965,27 +1367,27 @@ async def set_task_primary_assignee(task_id: int, user_id: int) -> bool:
             "UPDATE task_assignees SET is_primary = 1 WHERE task_id = ? AND user_id = ?",
             (task_id, user_id)
         )
-        await db.commit()
+        await _commit(db)
         return cursor.rowcount > 0
 
 
 async def clear_task_primary_assignee(task_id: int) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "UPDATE task_assignees SET is_primary = 0 WHERE task_id = ?",
             (task_id,)
         )
-        await db.commit()
+        await _commit(db)
         return cursor.rowcount > 0
 
 
 async def set_task_assignee_approval(task_id: int, user_id: int, approved: bool) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "UPDATE task_assignees SET has_approved = ? WHERE task_id = ? AND user_id = ?",
             (approved, task_id, user_id)
         )
-        await db.commit()
+        await _commit(db)
         return cursor.rowcount > 0
 
 
@@ -1003,17 +1405,17 @@ async def get_task_approval_status(task_id: int) -> dict:
 
 
 async def reset_task_approvals(task_id: int) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "UPDATE task_assignees SET has_approved = 0 WHERE task_id = ?",
             (task_id,)
         )
-        await db.commit()
+        await _commit(db)
         return cursor.rowcount > 0
 
 
 async def is_user_task_assignee(task_id: int, user_id: int) -> bool:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _connection() as db:
         cursor = await db.execute(
             "SELECT 1 FROM task_assignees WHERE task_id = ? AND user_id = ?",
             (task_id, user_id)
@@ -1022,8 +1424,7 @@ async def is_user_task_assignee(task_id: int, user_id: int) -> bool:
 
 
 async def get_tasks_by_assignee_multi(user_id: int) -> List[Task]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute(
             """SELECT t.* FROM tasks t
                JOIN task_assignees ta ON t.id = ta.task_id
@@ -1035,9 +1436,18 @@ async def get_tasks_by_assignee_multi(user_id: int) -> List[Task]:
         return [_row_to_task(r) for r in rows]
 
 
+async def load_thread_index():
+    """Fill the in-memory thread index used by the task thread monitor."""
+    async with _connection() as db:
+        cursor = await db.execute("SELECT id, thread_id FROM tasks WHERE thread_id IS NOT NULL")
+        threads = [(r["id"], r["thread_id"]) for r in await cursor.fetchall()]
+        cursor = await db.execute("SELECT task_id, user_id FROM task_assignees")
+        assignees = [(r["task_id"], r["user_id"]) for r in await cursor.fetchall()]
+    thread_index.load(threads, assignees)
+
+
 async def get_all_tasks() -> List[Task]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with _connection() as db:
         cursor = await db.execute("SELECT * FROM tasks ORDER BY created_at DESC")
         rows = await cursor.fetchall()
         return [_row_to_task(r) for r in rows]
@@ -1045,9 +1455,7 @@ async def get_all_tasks() -> List[Task]:
 
 async def migrate_tasks_to_multi_assignee() -> dict:
     """Migrate existing tasks to multi-assignee system. Returns stats."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        
+    async with _connection() as db:
         cursor = await db.execute("SELECT id, assignee_id FROM tasks WHERE assignee_id IS NOT NULL")
         tasks = await cursor.fetchall()
         
@@ -1070,32 +1478,37 @@ async def migrate_tasks_to_multi_assignee() -> dict:
             )
             migrated += 1
         
-        await db.commit()
+        await _commit(db)
+
+        def index_assignees():
+            for task in tasks:
+                thread_index.add_assignee(task["id"], task["assignee_id"])
+        _after_commit(index_assignees)
         return {"migrated": migrated, "skipped": skipped, "total": len(tasks)}
 
 
 # ============== SERVER CONFIG ==============
 
-async def get_server_config(guild_id: int) -> Optional[ServerConfig]:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute(
-            "SELECT * FROM server_config WHERE guild_id = ?",
-            (guild_id,)
-        )
-        row = await cursor.fetchone()
-        if row:
-            return ServerConfig(
-                id=row["id"],
-                guild_id=row["guild_id"],
-                config_json=row["config_json"],
-                setup_completed=bool(row["setup_completed"])
-            )
-        return None
+async def load_server_configs():
+    """Fill the in-memory config cache that every config read is served from."""
+    async with _connection() as db:
+        cursor = await db.execute("SELECT guild_id, config_json, setup_completed FROM server_config")
+        rows = await cursor.fetchall()
+
+    configs = []
+    for r in rows:
+        try:
+            settings = json.loads(r["config_json"])
+        except json.JSONDecodeError:
+            print(f"Ignoring unreadable config for guild {r['guild_id']}, using defaults")
+            settings = {}
+        configs.append(ServerConfig.from_settings(r["guild_id"], settings, bool(r["setup_completed"])))
+    server_configs.load(configs)
 
 
-async def upsert_server_config(guild_id: int, config_json: str, setup_completed: bool = False) -> ServerConfig:
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+async def upsert_server_config(config: ServerConfig):
+    """Save a guild's config; once committed it replaces the cached one."""
+    async with _connection() as db:
         await db.execute(
             """INSERT INTO server_config (guild_id, config_json, setup_completed)
                VALUES (?, ?, ?)
@@ -1103,18 +1516,277 @@ async def upsert_server_config(guild_id: int, config_json: str, setup_completed:
                config_json = excluded.config_json,
                setup_completed = excluded.setup_completed,
                updated_at = CURRENT_TIMESTAMP""",
-            (guild_id, config_json, setup_completed)
+            (config.guild_id, json.dumps(config.settings()), config.setup_completed)
         )
-        await db.commit()
-        return ServerConfig(
-            id=None,
-            guild_id=guild_id,
-            config_json=config_json,
-            setup_completed=setup_completed
+        await _commit(db)
+    _after_commit(lambda: server_configs.put(config))
+
+
+# ============== ROLE SYNC ==============
+
+async def get_role_sync_progress() -> Optional[RoleSyncProgress]:
+    async with _connection() as db:
+        cursor = await db.execute("SELECT * FROM role_sync_progress WHERE id = 1")
+        row = await cursor.fetchone()
+        if row:
+            return RoleSyncProgress(
+                status=row["status"],
+                total=row["total"],
+                processed=row["processed"],
+                updated=row["updated"],
+                skipped=row["skipped"],
+                failed=row["failed"],
+                last_member_id=row["last_member_id"],
+                started_at=row["started_at"],
+                updated_at=row["updated_at"]
+            )
+        return None
+
+
+async def save_role_sync_progress(progress: RoleSyncProgress):
+    async with _connection() as db:
+        await db.execute(
+            """INSERT INTO role_sync_progress
+               (id, status, total, processed, updated, skipped, failed, last_member_id, started_at)
+               VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET
+               status = excluded.status,
+               total = excluded.total,
+               processed = excluded.processed,
+               updated = excluded.updated,
+               skipped = excluded.skipped,
+               failed = excluded.failed,
+               last_member_id = excluded.last_member_id,
+               started_at = excluded.started_at,
+               updated_at = CURRENT_TIMESTAMP""",
+            (progress.status, progress.total, progress.processed, progress.updated,
+             progress.skipped, progress.failed, progress.last_member_id, progress.started_at)
+        )
+        await _commit(db)
+
+
+async def get_member_role_fingerprints() -> Dict[int, str]:
+    async with _connection() as db:
+        cursor = await db.execute("SELECT member_id, fingerprint FROM member_role_fingerprints")
+        return {row["member_id"]: row["fingerprint"] for row in await cursor.fetchall()}
+
+
+async def save_member_role_fingerprints(fingerprints: Dict[int, str]):
+    if not fingerprints:
+        return
+    async with _connection() as db:
+        await db.executemany(
+            """INSERT INTO member_role_fingerprints (member_id, fingerprint)
+               VALUES (?, ?)
+               ON CONFLICT(member_id) DO UPDATE SET
+               fingerprint = excluded.fingerprint,
+               updated_at = CURRENT_TIMESTAMP""",
+            list(fingerprints.items())
         )
+        await _commit(db)
+
+
+async def delete_member_role_fingerprints(member_ids: Iterable[int]):
+    member_ids = [(member_id,) for member_id in member_ids]
+    if not member_ids:
+        return
+    async with _connection() as db:
+        await db.executemany("DELETE FROM member_role_fingerprints WHERE member_id = ?", member_ids)
+        await _commit(db)
 
 
-async def is_setup_completed(guild_id: int) -> bool:
-    config = await get_server_config(guild_id)
-    return config.setup_completed if config else False
+# ============== REMINDERS ==============
+
+async def get_sent_reminders() -> Dict[Tuple[int, str], Tuple[str, str]]:
+    """(task_id, kind) -> (occurrence, sent_at) of the last reminder of each kind sent per task."""
+    async with _connection() as db:
+        cursor = await db.execute("SELECT task_id, kind, occurrence, sent_at FROM task_reminders")
+        return {(r["task_id"], r["kind"]): (r["occurrence"], r["sent_at"]) for r in await cursor.fetchall()}
+
+
+async def mark_reminders_sent(reminders: Iterable[Tuple[int, str, str, str]]):
+    """Record (task_id, kind, occurrence, sent_at) rows so restarts do not resend them."""
+    async with _connection() as db:
+        await db.executemany(
+            """INSERT INTO task_reminders (task_id, kind, occurrence, sent_at)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(task_id, kind) DO UPDATE SET
+               occurrence = excluded.occurrence,
+               sent_at = excluded.sent_at""",
+            list(reminders)
+        )
+        await _commit(db)
+
+
+# ============== IMPORT JOBS ==============
+
+def _row_to_import_job(r) -> ImportJob:
+    return ImportJob(
+        id=r["id"],
+        source_hash=r["source_hash"],
+        filename=r["filename"],
+        requested_by=r["requested_by"],
+        status=r["status"],
+        total_rows=r["total_rows"],
+        cursor=r["cursor"],
+        started_at=r["started_at"],
+        updated_at=r["updated_at"]
+    )
+
+
+async def create_import_job(source_hash: str, filename: str, requested_by: int, total_rows: int) -> ImportJob:
+    async with _connection() as db:
+        cursor = await db.execute(
+            """INSERT INTO import_jobs (source_hash, filename, requested_by, total_rows)
+               VALUES (?, ?, ?, ?)""",
+            (source_hash, filename, requested_by, total_rows)
+        )
+        job_id = cursor.lastrowid
+        await _commit(db)
+        return ImportJob(
+            id=job_id,
+            source_hash=source_hash,
+            filename=filename,
+            requested_by=requested_by,
+            status='running',
+            total_rows=total_rows
+        )
+
+
+async def get_import_job(job_id: int) -> Optional[ImportJob]:
+    async with _connection() as db:
+        cursor = await db.execute("SELECT * FROM import_jobs WHERE id = ?", (job_id,))
+        row = await cursor.fetchone()
+        return _row_to_import_job(row) if row else None
+
+
+async def get_import_job_by_hash(source_hash: str) -> Optional[ImportJob]:
+    """The latest job that imported a file with this hash."""
+    async with _connection() as db:
+        cursor = await db.execute(
+            "SELECT * FROM import_jobs WHERE source_hash = ? ORDER BY id DESC LIMIT 1",
+            (source_hash,)
+        )
+        row = await cursor.fetchone()
+        return _row_to_import_job(row) if row else None
+
+
+async def get_recent_import_jobs(limit: int = 10) -> List[ImportJob]:
+    async with _connection() as db:
+        cursor = await db.execute("SELECT * FROM import_jobs ORDER BY id DESC LIMIT ?", (limit,))
+        return [_row_to_import_job(r) for r in await cursor.fetchall()]
+
+
+async def update_import_job(job_id: int, status: str = None, cursor: int = None) -> bool:
+    updates = []
+    params = []
+    if status is not None:
+        updates.append("status = ?")
+        params.append(status)
+    if cursor is not None:
+        updates.append("cursor = MAX(cursor, ?)")
+        params.append(cursor)
+    if not updates:
+        return False
+    updates.append("updated_at = CURRENT_TIMESTAMP")
+    params.append(job_id)
+    async with _connection() as db:
+        result = await db.execute(f"UPDATE import_jobs SET {', '.join(updates)} WHERE id = ?", params)
+        await _commit(db)
+        return result.rowcount > 0
+
+
+async def interrupt_running_import_jobs() -> int:
+    """Mark jobs left running by a previous process as interrupted; returns how many."""
+    async with _connection() as db:
+        cursor = await db.execute(
+            "UPDATE import_jobs SET status = 'interrupted', updated_at = CURRENT_TIMESTAMP WHERE status = 'running'"
+        )
+        await _commit(db)
+        return cursor.rowcount
+
+
+async def save_import_job_rows(rows: Iterable[ImportJobRow]):
+    """Insert or update journal rows in one statement batch."""
+    rows = [
+        (r.job_id, r.row_number, json.dumps(r.payload), r.status, r.task_id,
+         r.header_message_id, r.thread_id, r.error)
+        for r in rows
+    ]
+    if not rows:
+        return
+    async with _connection() as db:
+        await db.executemany(
+            """INSERT INTO import_job_rows
+               (job_id, row_number, payload, status, task_id, header_message_id, thread_id, error)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(job_id, row_number) DO UPDATE SET
+               status = excluded.status,
+               task_id = excluded.task_id,
+               header_message_id = excluded.header_message_id,
+               thread_id = excluded.thread_id,
+               error = excluded.error""",
+            rows
+        )
+        await _commit(db)
+
+
+async def get_import_job_rows(job_id: int, statuses: Iterable[str] = None) -> List[ImportJobRow]:
+    query = "SELECT * FROM import_job_rows WHERE job_id = ?"
+    params: list = [job_id]
+    if statuses is not None:
+        statuses = list(statuses)
+        query += f" AND status IN ({','.join('?' * len(statuses))})"
+        params.extend(statuses)
+    async with _connection() as db:
+        cursor = await db.execute(query + " ORDER BY row_number", params)
+        return [
+            ImportJobRow(
+                job_id=r["job_id"],
+                row_number=r["row_number"],
+                payload=json.loads(r["payload"]) if r["payload"] else {},
+                status=r["status"],
+                task_id=r["task_id"],
+                header_message_id=r["header_message_id"],
+                thread_id=r["thread_id"],
+                error=r["error"]
+            )
+            for r in await cursor.fetchall()
+        ]
+
+
+async def get_import_job_counts(job_id: int) -> Dict[str, int]:
+    """Number of journal rows per status."""
+    async with _connection() as db:
+        cursor = await db.execute(
+            "SELECT status, COUNT(*) AS n FROM import_job_rows WHERE job_id = ? GROUP BY status",
+            (job_id,)
+        )
+        return {r["status"]: r["n"] for r in await cursor.fetchall()}
+
+
+# ============== BOT STATE ==============
+
+async def get_bot_state(key: str) -> Optional[str]:
+    async with _connection() as db:
+        cursor = await db.execute("SELECT value FROM bot_state WHERE key = ?", (key,))
+        row = await cursor.fetchone()
+        return row["value"] if row else None
+
+
+async def set_bot_state(key: str, value: str):
+    async with _connection() as db:
+        await db.execute(
+            """INSERT INTO bot_state (key, value) VALUES (?, ?)
+               ON CONFLICT(key) DO UPDATE SET
+               value = excluded.value,
+               updated_at = CURRENT_TIMESTAMP""",
+            (key, value)
+        )
+        await _commit(db)
+
 
+async def delete_bot_state(key: str):
+    async with _connection() as db:
+        await db.execute("DELETE FROM bot_state WHERE key = ?", (key,))
+        await _commit(db)
@@ -1,9 +1,12 @@
+import hashlib
+import json
+
 import discord
 from discord.ext import commands
 
 from .config import DISCORD_TOKEN, GUILD_ID, MEMBER_ROLES
-from .database import init_db, get_all_projects, get_project_roles, get_all_project_roles
-from .utils import format_role_name
+from .database import init_db, close_db, load_server_configs, load_project_index, get_project_role_map, get_bot_state, set_bot_state
+from .role_sync import RoleSyncJob, resolve_project_roles, plan_member_roles, apply_member_roles
 
 
 class ProjectBot(commands.Bot):
@@ -12,20 +15,49 @@ class ProjectBot(commands.Bot):
         intents.members = True
         intents.guilds = True
         super().__init__(command_prefix="!", intents=intents)
+        self.role_sync = RoleSyncJob()
     
     async def setup_hook(self):
         await init_db()
+        await load_server_configs()
+        await load_project_index()
         await self.load_extension("bot.cogs.templates")
         await self.load_extension("bot.cogs.projects")
         await self.load_extension("bot.cogs.tasks")
         await self.load_extension("bot.cogs.setup")
         
-        if GUILD_ID:
-            guild = discord.Object(id=int(GUILD_ID))
-            self.tree.copy_global_to(guild=guild)
-            await self.tree.sync(guild=guild)
+        if await self.sync_command_tree():
+            print("Slash commands synced.")
         else:
-            await self.tree.sync()
+            print("Slash commands unchanged, skipping sync.")
+    
+    async def sync_command_tree(self, force: bool = False) -> bool:
+        """
+        Sync slash commands with Discord, skipping the (heavily rate-limited)
+        call when the command schema hash matches the last synced one.
+        Returns True if a sync was made.
+        """
+        guild = discord.Object(id=int(GUILD_ID)) if GUILD_ID else None
+        if guild:
+            self.tree.copy_global_to(guild=guild)
+        
+        schema = sorted(
+            (cmd.to_dict(self.tree) for cmd in self.tree.get_commands(guild=guild)),
+            key=lambda c: (c.get("type", 1), c["name"])
+        )
+        schema_hash = hashlib.sha256(json.dumps(schema, sort_keys=True, default=str).encode()).hexdigest()
+        state_key = f"command_schema:{GUILD_ID or 'global'}"
+        
+        if not force and await get_bot_state(state_key) == schema_hash:
+            return False
+        
+        await self.tree.sync(guild=guild)
+        await set_bot_state(state_key, schema_hash)
+        return True
+    
+    async def close(self):
+        await super().close()
+        await close_db()
     
     async def on_ready(self):
         print(f"Logged in as {self.user} (ID: {self.user.id})")
@@ -48,61 +80,21 @@ class ProjectBot(commands.Bot):
         
         await self.sync_member_project_roles(after)
     
-    async def sync_all_project_roles(self):
+    async def sync_all_project_roles(self, restart: bool = False) -> bool:
+        """Start the background role sync job. Returns False if one was already running."""
         if not GUILD_ID:
-            return
+            return False
         
         guild = self.get_guild(int(GUILD_ID))
         if not guild:
-            return
+            return False
         
-        projects = await get_all_projects()
-        if not projects:
-            return
-        
-        print(f"Syncing project roles for {len(guild.members)} members...")
-        
-        for member in guild.members:
-            if member.bot:
-                continue
-            await self.sync_member_project_roles(member)
-        
-        print("Project role sync complete.")
+        return self.role_sync.start(guild, restart=restart)
     
     async def sync_member_project_roles(self, member: discord.Member):
-        guild = member.guild
-        member_role_names = {r.name for r in member.roles}
-        
-        all_project_roles = await get_all_project_roles()
-        
-        suffix_to_member_role = {role: role for role in MEMBER_ROLES}
-        
-        roles_to_add = []
-        roles_to_remove = []
-        
-        for project_role in all_project_roles:
-            discord_role = guild.get_role(project_role.role_id)
-            if not discord_role:
-                continue
-            
-            member_role_name = suffix_to_member_role.get(project_role.suffix)
-            has_member_role = member_role_name and member_role_name in member_role_names
-            has_project_role = discord_role in member.roles
-            
-            if has_member_role and not has_project_role:
-                roles_to_add.append(discord_role)
-            elif not has_member_role and has_project_role:
-                roles_to_remove.append(discord_role)
-        
-        try:
-            if roles_to_add:
-                await member.add_roles(*roles_to_add, reason="Project role sync")
-            if roles_to_remove:
-                await member.remove_roles(*roles_to_remove, reason="Project role sync")
-        except discord.Forbidden:
-            print(f"Missing permissions to modify roles for {member.name}")
-        except discord.HTTPException as e:
-            print(f"Failed to modify roles for {member.name}: {e}")
+        role_map = resolve_project_roles(member.guild, await get_project_role_map())
+        roles_to_add, roles_to_remove = plan_member_roles(member, role_map)
+        await apply_member_roles(member, roles_to_add, roles_to_remove)
 
 
 def main():
@@ -0,0 +1,528 @@
+import sqlite3
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+import aiosqlite
+
+from .config import DEFAULT_GROUPS, DEFAULT_TEMPLATE
+
+
+# Each migration runs once, in its own transaction, in version order. They
+# must not use executescript(), which commits on its own. Append new
+# migrations at the end; never edit or reorder ones that have shipped.
+Migration = Tuple[int, str, Callable[[aiosqlite.Connection], Awaitable[None]]]
+
+
+async def _columns(db: aiosqlite.Connection, table: str) -> List[str]:
+    cursor = await db.execute(f"PRAGMA table_info({table})")
+    return [row[1] for row in await cursor.fetchall()]
+
+
+async def _table_exists(db: aiosqlite.Connection, table: str) -> bool:
+    cursor = await db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return await cursor.fetchone() is not None
+
+
+async def _rename_games_to_projects(db: aiosqlite.Connection):
+    """Upgrade the original games/game_channels/game_roles layout."""
+    if not await _table_exists(db, 'games'):
+        return
+
+    if await _table_exists(db, 'projects'):
+        await db.execute("DROP TABLE IF EXISTS games")
+        await db.execute("DROP TABLE IF EXISTS game_channels")
+        await db.execute("DROP TABLE IF EXISTS game_roles")
+    else:
+        await db.execute("ALTER TABLE games RENAME TO projects")
+        await db.execute("ALTER TABLE game_channels RENAME TO project_channels")
+        await db.execute("ALTER TABLE game_roles RENAME TO project_roles")
+        for table in ('project_channels', 'project_roles'):
+            if 'game_id' in await _columns(db, table):
+                await db.execute(f"ALTER TABLE {table} RENAME COLUMN game_id TO project_id")
+
+    if 'game_acronym' in await _columns(db, 'tasks'):
+        await db.execute("""
+            CREATE TABLE tasks_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_acronym TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                assignee_id INTEGER NOT NULL,
+                target_channel_id INTEGER NOT NULL,
+                thread_id INTEGER,
+                control_message_id INTEGER,
+                header_message_id INTEGER,
+                status TEXT DEFAULT 'todo',
+                deadline DATETIME,
+                eta TEXT,
+                priority TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        header_column = 'header_message_id' if 'header_message_id' in await _columns(db, 'tasks') else 'NULL'
+        await db.execute(f"""
+            INSERT INTO tasks_new (id, project_acronym, title, description, assignee_id,
+                target_channel_id, thread_id, control_message_id, header_message_id,
+                status, deadline, eta, priority, created_at, updated_at)
+            SELECT id, game_acronym, title, description, assignee_id,
+                target_channel_id, thread_id, control_message_id, {header_column},
+                status, deadline, eta, priority, created_at, updated_at
+            FROM tasks
+        """)
+        await db.execute("DROP TABLE tasks")
+        await db.execute("ALTER TABLE tasks_new RENAME TO tasks")
+
+    if 'game_acronym' in await _columns(db, 'task_boards'):
+        await db.execute("""
+            CREATE TABLE task_boards_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_acronym TEXT NOT NULL UNIQUE,
+                channel_id INTEGER NOT NULL,
+                message_ids TEXT NOT NULL
+            )
+        """)
+        await db.execute("""
+            INSERT INTO task_boards_new (id, project_acronym, channel_id, message_ids)
+            SELECT id, game_acronym, channel_id, message_ids FROM task_boards
+        """)
+        await db.execute("DROP TABLE task_boards")
+        await db.execute("ALTER TABLE task_boards_new RENAME TO task_boards")
+
+
+async def _create_core_tables(db: aiosqlite.Connection):
+    """Projects, templates, tasks and server config, plus default groups and template."""
+    statements = [
+        """CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            acronym TEXT UNIQUE NOT NULL,
+            category_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        """CREATE TABLE IF NOT EXISTS groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            emoji TEXT NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS template_channels (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            group_name TEXT NOT NULL,
+            is_voice BOOLEAN DEFAULT 0,
+            description TEXT,
+            UNIQUE(name)
+        )""",
+        """CREATE TABLE IF NOT EXISTS project_channels (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            channel_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            group_name TEXT NOT NULL,
+            is_custom BOOLEAN DEFAULT 0,
+            is_voice BOOLEAN DEFAULT 0,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )""",
+        """CREATE TABLE IF NOT EXISTS project_roles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            role_id INTEGER NOT NULL,
+            suffix TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )""",
+        """CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_acronym TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            assignee_id INTEGER NOT NULL,
+            target_channel_id INTEGER NOT NULL,
+            thread_id INTEGER,
+            control_message_id INTEGER,
+            header_message_id INTEGER,
+            status TEXT DEFAULT 'todo',
+            deadline DATETIME,
+            eta TEXT,
+            priority TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        """CREATE TABLE IF NOT EXISTS task_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            action TEXT NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE
+        )""",
+        """CREATE TABLE IF NOT EXISTS task_boards (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_acronym TEXT NOT NULL UNIQUE,
+            channel_id INTEGER NOT NULL,
+            message_ids TEXT NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS task_assignees (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            is_primary BOOLEAN DEFAULT 0,
+            has_approved BOOLEAN DEFAULT 0,
+            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE,
+            UNIQUE(task_id, user_id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS server_config (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL UNIQUE,
+            config_json TEXT NOT NULL DEFAULT '{}',
+            setup_completed BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+    ]
+    for statement in statements:
+        await db.execute(statement)
+
+    # Databases created before header messages existed
+    if 'header_message_id' not in await _columns(db, 'tasks'):
+        await db.execute("ALTER TABLE tasks ADD COLUMN header_message_id INTEGER")
+
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_task_assignees_task_id ON task_assignees(task_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_task_assignees_user_id ON task_assignees(user_id)")
+
+    cursor = await db.execute("SELECT COUNT(*) FROM groups")
+    if (await cursor.fetchone())[0] == 0:
+        await db.executemany(
+            "INSERT INTO groups (name, emoji) VALUES (?, ?)",
+            list(DEFAULT_GROUPS.items())
+        )
+
+    cursor = await db.execute("SELECT COUNT(*) FROM template_channels")
+    if (await cursor.fetchone())[0] == 0:
+        await db.executemany(
+            "INSERT INTO template_channels (name, group_name, is_voice, description) VALUES (?, ?, ?, ?)",
+            DEFAULT_TEMPLATE
+        )
+
+
+async def _create_bookkeeping_tables(db: aiosqlite.Connection):
+    """Role sync checkpoint and fingerprints, and the bot_state key/value store."""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS role_sync_progress (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            status TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            processed INTEGER NOT NULL DEFAULT 0,
+            updated INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            last_member_id INTEGER,
+            started_at TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS member_role_fingerprints (
+            member_id INTEGER PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS bot_state (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+async def _add_query_indexes(db: aiosqlite.Connection):
+    """Indexes for the hot lookups in database.py, matched to each query's WHERE/ORDER BY."""
+    statements = [
+        # get_task_by_thread_id, load_thread_index
+        "CREATE INDEX IF NOT EXISTS idx_tasks_thread_id ON tasks(thread_id) WHERE thread_id IS NOT NULL",
+        # get_tasks_by_project (dashboards), newest first
+        "CREATE INDEX IF NOT EXISTS idx_tasks_project_created ON tasks(project_acronym, created_at)",
+        # get_tasks_by_status
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at)",
+        # get_tasks_by_assignee
+        "CREATE INDEX IF NOT EXISTS idx_tasks_assignee_deadline ON tasks(assignee_id, deadline)",
+        # get_overdue_tasks, get_tasks_due_soon: only open tasks with a deadline
+        """CREATE INDEX IF NOT EXISTS idx_tasks_open_deadline ON tasks(deadline)
+           WHERE status NOT IN ('done', 'cancelled') AND deadline IS NOT NULL""",
+        # get_stagnant_tasks
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_updated ON tasks(status, updated_at)",
+        # get_task_history
+        "CREATE INDEX IF NOT EXISTS idx_task_history_task ON task_history(task_id, timestamp)",
+        # get_project_by_acronym compares case-insensitively
+        "CREATE INDEX IF NOT EXISTS idx_projects_acronym_nocase ON projects(acronym COLLATE NOCASE)",
+        # project channel and role lookups by project
+        "CREATE INDEX IF NOT EXISTS idx_project_channels_project ON project_channels(project_id, name)",
+        "CREATE INDEX IF NOT EXISTS idx_project_roles_project ON project_roles(project_id)",
+    ]
+    for statement in statements:
+        await db.execute(statement)
+
+
+async def _add_task_search(db: aiosqlite.Connection):
+    """FTS5 index over task title, description and questions asked in the thread."""
+    await db.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            title, description, questions,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    # Rank title hits above description hits above question hits
+    await db.execute("INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0)')")
+    # rowid mirrors tasks.id
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, description, questions)
+            VALUES (new.id, new.title, COALESCE(new.description, ''), '');
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+            UPDATE tasks_fts SET title = new.title, description = COALESCE(new.description, '')
+            WHERE rowid = new.id;
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            DELETE FROM tasks_fts WHERE rowid = old.id;
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_question AFTER INSERT ON task_history
+        WHEN new.action = 'question' BEGIN
+            UPDATE tasks_fts SET questions = questions || ' ' || COALESCE(new.new_value, '')
+            WHERE rowid = new.task_id;
+        END
+    """)
+    await db.execute("""
+        INSERT INTO tasks_fts (rowid, title, description, questions)
+        SELECT t.id, t.title, COALESCE(t.description, ''),
+               COALESCE((SELECT group_concat(h.new_value, ' ') FROM task_history h
+                         WHERE h.task_id = t.id AND h.action = 'question'), '')
+        FROM tasks t
+    """)
+
+
+async def _add_task_page_index(db: aiosqlite.Connection):
+    """Keyset pages of one status within a project (task boards), newest first."""
+    # id is the implicit rowid at the end of every index, so (created_at, id)
+    # cursors resume inside the index without a sort
+    await db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_project_status_created ON tasks(project_acronym, status, created_at)"
+    )
+
+
+# Recount of project_task_stats from tasks, shared by migration 7 and
+# rebuild_project_task_stats()
+TASK_STATS_BACKFILL = """
+    INSERT INTO project_task_stats
+        (project_acronym, todo, progress, review, done, cancelled, last_activity)
+    SELECT project_acronym,
+           SUM(status = 'todo'), SUM(status = 'progress'), SUM(status = 'review'),
+           SUM(status = 'done'), SUM(status = 'cancelled'),
+           MAX(COALESCE(updated_at, created_at))
+    FROM tasks
+    GROUP BY project_acronym
+"""
+
+
+async def _add_project_task_stats(db: aiosqlite.Connection):
+    """Per-project task counts by status, kept current by triggers on tasks."""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS project_task_stats (
+            project_acronym TEXT PRIMARY KEY,
+            todo INTEGER NOT NULL DEFAULT 0,
+            progress INTEGER NOT NULL DEFAULT 0,
+            review INTEGER NOT NULL DEFAULT 0,
+            done INTEGER NOT NULL DEFAULT 0,
+            cancelled INTEGER NOT NULL DEFAULT 0,
+            last_activity TIMESTAMP
+        )
+    """)
+    # Comparisons are 0 or 1 in SQLite, so each trigger adds or subtracts
+    # the row's status column without a CASE per status
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS project_task_stats_insert AFTER INSERT ON tasks BEGIN
+            INSERT OR IGNORE INTO project_task_stats (project_acronym) VALUES (new.project_acronym);
+            UPDATE project_task_stats SET
+                todo = todo + (new.status = 'todo'),
+                progress = progress + (new.status = 'progress'),
+                review = review + (new.status = 'review'),
+                done = done + (new.status = 'done'),
+                cancelled = cancelled + (new.status = 'cancelled'),
+                last_activity = CURRENT_TIMESTAMP
+            WHERE project_acronym = new.project_acronym;
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS project_task_stats_update AFTER UPDATE ON tasks BEGIN
+            UPDATE project_task_stats SET
+                todo = todo - (old.status = 'todo'),
+                progress = progress - (old.status = 'progress'),
+                review = review - (old.status = 'review'),
+                done = done - (old.status = 'done'),
+                cancelled = cancelled - (old.status = 'cancelled')
+            WHERE project_acronym = old.project_acronym;
+            INSERT OR IGNORE INTO project_task_stats (project_acronym) VALUES (new.project_acronym);
+            UPDATE project_task_stats SET
+                todo = todo + (new.status = 'todo'),
+                progress = progress + (new.status = 'progress'),
+                review = review + (new.status = 'review'),
+                done = done + (new.status = 'done'),
+                cancelled = cancelled + (new.status = 'cancelled'),
+                last_activity = CURRENT_TIMESTAMP
+            WHERE project_acronym = new.project_acronym;
+        END
+    """)
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS project_task_stats_delete AFTER DELETE ON tasks BEGIN
+            UPDATE project_task_stats SET
+                todo = todo - (old.status = 'todo'),
+                progress = progress - (old.status = 'progress'),
+                review = review - (old.status = 'review'),
+                done = done - (old.status = 'done'),
+                cancelled = cancelled - (old.status = 'cancelled'),
+                last_activity = CURRENT_TIMESTAMP
+            WHERE project_acronym = old.project_acronym;
+        END
+    """)
+    # Overdue depends on the clock, not on writes, so it is counted when read;
+    # this index limits that count to the project's overdue rows
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tasks_project_open_deadline ON tasks(project_acronym, deadline)
+        WHERE status NOT IN ('done', 'cancelled') AND deadline IS NOT NULL
+    """)
+    await db.execute(TASK_STATS_BACKFILL)
+
+
+async def _add_task_reminders(db: aiosqlite.Connection):
+    """Markers for reminders already sent, so the scheduler never repeats one."""
+    # occurrence is the deadline (deadline, overdue) or updated_at (stagnant)
+    # the reminder was sent for; when that value changes the reminder re-arms
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS task_reminders (
+            task_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            occurrence TEXT NOT NULL,
+            sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (task_id, kind)
+        )
+    """)
+    # Tasks already overdue were never sent an overdue reminder; treat them
+    # as reminded so the first start after upgrading does not ping them all
+    await db.execute("""
+        INSERT OR IGNORE INTO task_reminders (task_id, kind, occurrence)
+        SELECT id, 'overdue', deadline FROM tasks
+        WHERE status NOT IN ('done', 'cancelled')
+        AND deadline IS NOT NULL
+        AND deadline < datetime('now')
+    """)
+
+
+async def _add_import_jobs(db: aiosqlite.Connection):
+    """Journal of /task import runs, so an interrupted import can be resumed."""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS import_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source_hash TEXT NOT NULL,
+            filename TEXT,
+            requested_by INTEGER,
+            status TEXT NOT NULL DEFAULT 'running',
+            total_rows INTEGER NOT NULL DEFAULT 0,
+            cursor INTEGER NOT NULL DEFAULT 0,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_import_jobs_source_hash ON import_jobs(source_hash)")
+    # One row per file row: its payload as read, and how far it got
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS import_job_rows (
+            job_id INTEGER NOT NULL,
+            row_number INTEGER NOT NULL,
+            payload TEXT,
+            status TEXT NOT NULL,
+            task_id INTEGER,
+            header_message_id INTEGER,
+            thread_id INTEGER,
+            error TEXT,
+            PRIMARY KEY (job_id, row_number)
+        )
+    """)
+
+
+MIGRATIONS: List[Migration] = [
+    (1, "rename games layout to projects", _rename_games_to_projects),
+    (2, "core tables and default template", _create_core_tables),
+    (3, "role sync and bot state tables", _create_bookkeeping_tables),
+    (4, "query indexes", _add_query_indexes),
+    (5, "full-text task search", _add_task_search),
+    (6, "task page index", _add_task_page_index),
+    (7, "project task stats", _add_project_task_stats),
+    (8, "task reminder markers", _add_task_reminders),
+    (9, "import job journal", _add_import_jobs),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+async def get_schema_version(db: aiosqlite.Connection) -> int:
+    try:
+        cursor = await db.execute("SELECT MAX(version) FROM schema_version")
+    except sqlite3.OperationalError:
+        # No schema_version table yet: a new or pre-versioning database
+        return 0
+    row = await cursor.fetchone()
+    return row[0] or 0
+
+
+async def migrate(db: aiosqlite.Connection) -> List[Tuple[int, str, float]]:
+    """
+    Bring the database up to LATEST_VERSION.
+
+    A current database costs a single SELECT. Databases from before
+    versioning start at 0; the early migrations only create what is missing,
+    so they are safe to replay on those. Returns (version, name, seconds)
+    for each migration applied.
+    """
+    current = await get_schema_version(db)
+    if current >= LATEST_VERSION:
+        return []
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            duration_ms REAL NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    await db.commit()
+
+    applied = []
+    for version, name, apply in MIGRATIONS:
+        if version <= current:
+            continue
+        started = time.perf_counter()
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            await apply(db)
+            elapsed = time.perf_counter() - started
+            await db.execute(
+                "INSERT INTO schema_version (version, name, duration_ms) VALUES (?, ?, ?)",
+                (version, name, elapsed * 1000)
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        applied.append((version, name, elapsed))
+    return applied
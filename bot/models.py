@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import Optional
+from typing import FrozenSet, Iterable, List, Optional, Tuple
 
 
 @dataclass
@@ -66,6 +66,45 @@ class Task:
     updated_at: Optional[datetime] = None
 
 
+@dataclass
+class TaskPage:
+    """One page of a keyset-paginated task listing, newest first."""
+    tasks: List[Task]
+    has_prev: bool = False
+    has_next: bool = False
+
+    @property
+    def first_key(self) -> Optional[Tuple[str, int]]:
+        return (self.tasks[0].created_at, self.tasks[0].id) if self.tasks else None
+
+    @property
+    def last_key(self) -> Optional[Tuple[str, int]]:
+        return (self.tasks[-1].created_at, self.tasks[-1].id) if self.tasks else None
+
+
+@dataclass
+class ProjectTaskStats:
+    project_acronym: str
+    todo: int = 0
+    progress: int = 0
+    review: int = 0
+    done: int = 0
+    cancelled: int = 0
+    overdue: int = 0  # counted when read, see get_project_task_stats
+    last_activity: Optional[datetime] = None
+
+    @property
+    def open(self) -> int:
+        return self.todo + self.progress + self.review
+
+    @property
+    def total(self) -> int:
+        return self.open + self.done + self.cancelled
+
+    def count(self, status: str) -> int:
+        return getattr(self, status, 0)
+
+
 @dataclass
 class TaskHistory:
     id: Optional[int]
@@ -95,9 +134,90 @@ class TaskAssignee:
     added_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class ServerConfig:
-    id: Optional[int]
+    """
+    Typed, immutable view of a guild's server_config row.
+
+    A change replaces the whole object (see ServerConfigCache), so readers
+    can hold on to one without it shifting under them.
+    """
     guild_id: int
-    config_json: str
     setup_completed: bool = False
+    version: int = 0  # bumped on every write, 0 = never configured
+    # Settings, stored as config_json
+    channel_mode: str = 'per_project'
+    board_channel_template: str = 'tasks'
+    questions_channel_template: str = 'questions'
+    leads_channel_template: str = 'leads'
+    global_board_channel_id: Optional[int] = None
+    global_questions_channel_id: Optional[int] = None
+    global_leads_channel_id: Optional[int] = None
+    lead_role_ids: FrozenSet[int] = frozenset()
+    approval_mode: str = 'auto'
+    approval_threshold: Optional[int] = None
+    reminder_interval_hours: int = 1
+    deadline_warning_hours: int = 24
+    stagnant_days: int = 3
+    reminders_enabled: bool = True
+    reminder_digest: str = 'off'  # off, project, user
+
+    @classmethod
+    def from_settings(cls, guild_id: int, settings: dict, setup_completed: bool = False) -> 'ServerConfig':
+        """Build from a config_json dict, ignoring unknown keys."""
+        values = {k: v for k, v in settings.items() if k in _SERVER_CONFIG_SETTINGS}
+        if 'lead_role_ids' in values:
+            values['lead_role_ids'] = frozenset(int(r) for r in values['lead_role_ids'] or ())
+        return cls(guild_id=guild_id, setup_completed=setup_completed, **values)
+
+    def settings(self) -> dict:
+        """The settings as the JSON-serialisable dict stored in config_json."""
+        values = {name: getattr(self, name) for name in _SERVER_CONFIG_SETTINGS}
+        values['lead_role_ids'] = sorted(self.lead_role_ids)
+        return values
+
+    def is_lead(self, role_ids: Iterable[int]) -> bool:
+        return not self.lead_role_ids.isdisjoint(role_ids)
+
+
+_SERVER_CONFIG_SETTINGS = tuple(
+    f.name for f in fields(ServerConfig) if f.name not in ('guild_id', 'setup_completed', 'version')
+)
+
+
+@dataclass
+class RoleSyncProgress:
+    status: str  # idle, running, done
+    total: int = 0
+    processed: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    last_member_id: Optional[int] = None  # members are synced in ascending ID order
+    started_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+@dataclass
+class ImportJob:
+    id: Optional[int]
+    source_hash: str  # sha256 of the imported file
+    filename: Optional[str]
+    requested_by: Optional[int]
+    status: str  # running, interrupted, incomplete, done
+    total_rows: int = 0
+    cursor: int = 0  # every row up to this number has been processed
+    started_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+@dataclass
+class ImportJobRow:
+    job_id: int
+    row_number: int  # 1-based position in the file
+    payload: dict  # the row as read from the file
+    status: str  # invalid, created, posted, published, failed
+    task_id: Optional[int] = None
+    header_message_id: Optional[int] = None
+    thread_id: Optional[int] = None
+    error: Optional[str] = None
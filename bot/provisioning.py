@@ -0,0 +1,280 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import discord
+
+from .config import MEMBER_ROLES, PROVISION_CONCURRENCY
+from .database import (
+    transaction,
+    create_project,
+    add_project_role,
+    add_project_channel,
+    add_project_channels,
+    remove_project_channels,
+)
+from .models import Project, ProjectChannel, TemplateChannel
+from .utils import format_channel_name, format_role_name
+
+
+async def _bounded(semaphore: asyncio.Semaphore, coro):
+    async with semaphore:
+        return await coro
+
+
+async def _discard(objects: list, reason: str):
+    """Best-effort delete of Discord objects created for a project that was rolled back."""
+    for obj in reversed(objects):
+        try:
+            await obj.delete(reason=reason)
+        except discord.HTTPException:
+            pass
+
+
+async def provision_project(
+    guild: discord.Guild,
+    name: str,
+    acronym: str,
+    template_channels: List[TemplateChannel],
+    groups: Dict[str, str],
+    role_color: discord.Color,
+    concurrency: int = PROVISION_CONCURRENCY
+) -> Tuple[Project, discord.CategoryChannel, List[discord.Role]]:
+    """
+    Create a project's category, member roles and template channels, then save it.
+
+    Role and channel creation hit separate rate-limit buckets, so each gets
+    its own semaphore of `concurrency` requests and both run side by side;
+    discord.py still waits out any 429 within a bucket. Channels are given
+    their template position explicitly since they may finish out of order.
+
+    The project, role and channel rows are written in one transaction once
+    every Discord object exists. If any creation or the write fails, the
+    objects created so far are deleted and the error is re-raised, so a
+    failed /project new leaves neither orphaned channels nor partial rows.
+    """
+    reason = f"Project: {name}"
+    category = await guild.create_category(name=name, reason=reason)
+    created: list = [category]
+
+    role_slots = asyncio.Semaphore(max(1, concurrency))
+    channel_slots = asyncio.Semaphore(max(1, concurrency))
+
+    def create_role(suffix: str):
+        return guild.create_role(
+            name=format_role_name(acronym, suffix),
+            color=role_color,
+            reason=reason
+        )
+
+    def create_channel(position: int, template_ch: TemplateChannel):
+        emoji = groups.get(template_ch.group_name, "")
+        channel_name = format_channel_name(emoji, acronym, template_ch.name)
+        if template_ch.is_voice:
+            return category.create_voice_channel(name=channel_name, position=position, reason=reason)
+        return category.create_text_channel(
+            name=channel_name,
+            topic=template_ch.description,
+            position=position,
+            reason=reason
+        )
+
+    try:
+        results = await asyncio.gather(
+            *(_bounded(role_slots, create_role(suffix)) for suffix in MEMBER_ROLES),
+            *(_bounded(channel_slots, create_channel(i, ch)) for i, ch in enumerate(template_channels)),
+            return_exceptions=True
+        )
+        created.extend(r for r in results if not isinstance(r, BaseException))
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        roles = results[:len(MEMBER_ROLES)]
+        channels = results[len(MEMBER_ROLES):]
+
+        async with transaction():
+            project = await create_project(name, acronym, category.id)
+            for suffix, role in zip(MEMBER_ROLES, roles):
+                await add_project_role(project.id, role.id, suffix)
+            for template_ch, channel in zip(template_channels, channels):
+                await add_project_channel(
+                    project_id=project.id,
+                    channel_id=channel.id,
+                    name=template_ch.name,
+                    group_name=template_ch.group_name,
+                    is_custom=False,
+                    is_voice=template_ch.is_voice
+                )
+    except Exception:
+        await _discard(created, f"Rolling back project: {name}")
+        raise
+
+    return project, category, roles
+
+
+# ============== TEMPLATE SYNC ==============
+
+@dataclass
+class ChannelAddition:
+    project: Project
+    category: discord.CategoryChannel
+    template: TemplateChannel
+    channel_name: str
+
+
+@dataclass
+class ChannelRemoval:
+    project: Project
+    channel: ProjectChannel
+
+
+@dataclass
+class TemplateSyncPlan:
+    additions: List[ChannelAddition] = field(default_factory=list)
+    removals: List[ChannelRemoval] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.additions) + len(self.removals)
+
+
+@dataclass
+class TemplateSyncResult:
+    added: int = 0
+    removed: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def plan_template_sync(
+    guild: discord.Guild,
+    projects: List[Project],
+    template_channels: List[TemplateChannel],
+    channels_by_project: Dict[int, List[ProjectChannel]],
+    groups: Dict[str, str]
+) -> TemplateSyncPlan:
+    """Work out every channel to add or remove across all projects, without touching Discord."""
+    plan = TemplateSyncPlan()
+    template_names = {ch.name for ch in template_channels}
+
+    for project in projects:
+        category = guild.get_channel(project.category_id)
+        if not category:
+            plan.errors.append(f"Category not found for {project.name}")
+            continue
+
+        project_channels = channels_by_project.get(project.id, [])
+        project_channel_names = {ch.name for ch in project_channels}
+
+        for template_ch in template_channels:
+            if template_ch.name not in project_channel_names:
+                emoji = groups.get(template_ch.group_name, "")
+                plan.additions.append(ChannelAddition(
+                    project=project,
+                    category=category,
+                    template=template_ch,
+                    channel_name=format_channel_name(emoji, project.acronym, template_ch.name)
+                ))
+
+        for proj_ch in project_channels:
+            if proj_ch.name not in template_names:
+                plan.removals.append(ChannelRemoval(project=project, channel=proj_ch))
+
+    return plan
+
+
+def lead_channel_overwrites(guild: discord.Guild, lead_role_ids: List[int]) -> Optional[dict]:
+    """Overwrites that hide a leads channel from everyone but the bot and lead roles."""
+    if not lead_role_ids:
+        return None
+    overwrites = {
+        guild.default_role: discord.PermissionOverwrite(read_messages=False),
+        guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True)
+    }
+    for role_id in lead_role_ids:
+        role = guild.get_role(role_id)
+        if role:
+            overwrites[role] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
+    return overwrites
+
+
+async def apply_template_sync(
+    guild: discord.Guild,
+    plan: TemplateSyncPlan,
+    lead_role_ids: List[int],
+    on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    concurrency: int = PROVISION_CONCURRENCY,
+    batch_size: int = 25
+) -> TemplateSyncResult:
+    """
+    Carry out a template sync plan.
+
+    Creations and deletions each get `concurrency` requests in flight. The
+    plan is applied in batches of `batch_size`; after each batch the
+    resulting project_channels inserts and deletes are written in one
+    transaction and `on_progress(done, total)` is awaited. A removal whose
+    delete fails keeps its row, so the next sync retries it.
+    """
+    result = TemplateSyncResult(errors=list(plan.errors))
+    overwrites = lead_channel_overwrites(guild, lead_role_ids)
+    create_slots = asyncio.Semaphore(max(1, concurrency))
+    delete_slots = asyncio.Semaphore(max(1, concurrency))
+
+    added: List[ProjectChannel] = []
+    removed: List[Tuple[int, str]] = []
+
+    async def add(item: ChannelAddition):
+        template_ch = item.template
+        try:
+            async with create_slots:
+                if template_ch.is_voice:
+                    channel = await item.category.create_voice_channel(name=item.channel_name)
+                else:
+                    is_leads_channel = 'lead' in template_ch.name.lower()
+                    channel = await item.category.create_text_channel(
+                        name=item.channel_name,
+                        topic=template_ch.description,
+                        overwrites=overwrites if is_leads_channel and overwrites else discord.utils.MISSING
+                    )
+        except discord.HTTPException as e:
+            result.errors.append(f"Failed to create {item.channel_name}: {e}")
+            return
+        added.append(ProjectChannel(
+            id=None,
+            project_id=item.project.id,
+            channel_id=channel.id,
+            name=template_ch.name,
+            group_name=template_ch.group_name,
+            is_custom=False,
+            is_voice=template_ch.is_voice
+        ))
+        result.added += 1
+
+    async def remove(item: ChannelRemoval):
+        channel = guild.get_channel(item.channel.channel_id)
+        if channel:
+            try:
+                async with delete_slots:
+                    await channel.delete(reason="Template sync")
+            except discord.HTTPException as e:
+                result.errors.append(f"Failed to delete {item.channel.name}: {e}")
+                return
+            result.removed += 1
+        removed.append((item.project.id, item.channel.name))
+
+    steps = [(add, item) for item in plan.additions] + [(remove, item) for item in plan.removals]
+    done = 0
+    for i in range(0, len(steps), batch_size):
+        batch = steps[i:i + batch_size]
+        await asyncio.gather(*(step(item) for step, item in batch))
+        async with transaction():
+            await add_project_channels(added)
+            await remove_project_channels(removed)
+        added.clear()
+        removed.clear()
+        done += len(batch)
+        if on_progress:
+            await on_progress(done, len(steps))
+
+    return result
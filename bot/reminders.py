@@ -0,0 +1,274 @@
+import asyncio
+import heapq
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from .cache import server_configs
+from .database import transaction, get_tasks, get_open_tasks, get_sent_reminders, mark_reminders_sent
+from .models import ServerConfig, Task
+
+TIMESTAMP_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d')
+
+# An event: (fire_at, task_id, kind, occurrence)
+Reminder = Tuple[datetime, int, str, str]
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Parse a deadline or SQLite timestamp (naive UTC); None if unset or unreadable."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(str(value)[:19], fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def digest_chunks(header: str, lines: List[str], limit: int = 2000) -> List[Tuple[str, int]]:
+    """
+    Split a reminder digest into as few messages under Discord's length
+    limit as possible, each with the number of lines it carries.
+    """
+    chunks = []
+    current, count = header, 0
+    for line in lines:
+        if len(current) + 1 + len(line) > limit:
+            chunks.append((current, count))
+            current, count = line, 1
+        else:
+            current = f"{current}\n{line}"
+            count += 1
+    chunks.append((current, count))
+    return chunks
+
+
+def reminder_events(task: Task, config: ServerConfig, now: datetime) -> List[Tuple[datetime, str, str]]:
+    """
+    (fire_at, kind, occurrence) for each reminder a task is due.
+
+    The occurrence names what the reminder is about (the deadline, or the
+    updated_at a task went stagnant from); a sent reminder is only sent
+    again once that value changes.
+    """
+    if task.status in ('done', 'cancelled'):
+        return []
+
+    events = []
+    deadline = parse_timestamp(task.deadline)
+    if deadline:
+        occurrence = str(task.deadline)
+        if deadline > now:
+            events.append((deadline - timedelta(hours=config.deadline_warning_hours), 'deadline', occurrence))
+        events.append((deadline, 'overdue', occurrence))
+
+    if task.status == 'progress':
+        updated = parse_timestamp(task.updated_at)
+        if updated:
+            events.append((updated + timedelta(days=config.stagnant_days), 'stagnant', str(task.updated_at)))
+    return events
+
+
+class ReminderScheduler:
+    """
+    Event-driven deadline, overdue and stagnant reminders for one guild.
+
+    Every pending reminder sits in a min-heap keyed by its fire time, and
+    the scheduler sleeps until the earliest one is due. Task writes call
+    `task_changed` (registered with add_task_listener), which re-plans just
+    that task on the next wake-up; superseded heap entries are dropped
+    lazily when popped. Sent reminders are recorded in task_reminders so a
+    restart never sends one twice, and reminder_interval_hours is the least
+    time between two reminders to the same task. The whole plan is rebuilt
+    when the guild's config version changes.
+
+    Reminders that fall due together are handed to `send` as one batch of
+    (task, kind) pairs; it returns one flag per pair, False to retry that
+    reminder after the interval.
+    """
+
+    def __init__(
+        self,
+        guild_id: int,
+        send: Callable[[List[Tuple[Task, str]]], Awaitable[List[bool]]],
+        wait_ready: Optional[Callable[[], Awaitable[None]]] = None
+    ):
+        self.guild_id = guild_id
+        self.send = send
+        self.wait_ready = wait_ready
+        self._heap: List[Reminder] = []
+        self._armed: Dict[Tuple[int, str], Tuple[datetime, str]] = {}
+        self._sent: Dict[Tuple[int, str], str] = {}
+        self._last_sent: Dict[int, datetime] = {}
+        self._dirty: Set[int] = set()
+        self._wake = asyncio.Event()
+        self._config_version: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._armed)
+
+    @property
+    def next_due(self) -> Optional[datetime]:
+        return min((fire_at for fire_at, _ in self._armed.values()), default=None)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    def task_changed(self, task_id: int):
+        self._dirty.add(task_id)
+        self._wake.set()
+
+    def wake(self):
+        """Re-check the config now instead of at the next due reminder."""
+        self._wake.set()
+
+    def _arm(self, task: Task, config: ServerConfig, now: datetime):
+        for key in [key for key in self._armed if key[0] == task.id]:
+            del self._armed[key]
+        for fire_at, kind, occurrence in reminder_events(task, config, now):
+            if self._sent.get((task.id, kind)) == occurrence:
+                continue
+            self._armed[(task.id, kind)] = (fire_at, occurrence)
+            heapq.heappush(self._heap, (fire_at, task.id, kind, occurrence))
+
+        # Frequently edited tasks leave superseded entries behind; compact
+        # once they outnumber the live ones
+        if len(self._heap) > 2 * len(self._armed) + 64:
+            self._heap = [(fire_at, task_id, kind, occurrence)
+                          for (task_id, kind), (fire_at, occurrence) in self._armed.items()]
+            heapq.heapify(self._heap)
+
+    async def _rebuild(self, config: ServerConfig, now: datetime):
+        self._heap = []
+        self._armed = {}
+        self._dirty.clear()
+        sent = await get_sent_reminders()
+        self._sent = {key: occurrence for key, (occurrence, _) in sent.items()}
+        self._last_sent = {}
+        for (task_id, _), (_, sent_at) in sent.items():
+            sent_at = parse_timestamp(sent_at)
+            if sent_at and sent_at > self._last_sent.get(task_id, datetime.min):
+                self._last_sent[task_id] = sent_at
+        if config.reminders_enabled:
+            for task in await get_open_tasks():
+                self._arm(task, config, now)
+
+    async def _replan_dirty(self, config: ServerConfig, now: datetime):
+        task_ids, self._dirty = self._dirty, set()
+        tasks = {t.id: t for t in await get_tasks(task_ids)}
+        for task_id in task_ids:
+            task = tasks.get(task_id)
+            if task:
+                self._arm(task, config, now)
+            else:
+                for key in [key for key in self._armed if key[0] == task_id]:
+                    del self._armed[key]
+
+    def _pop_due(self, now: datetime, gap: timedelta) -> List[Reminder]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, task_id, kind, occurrence = heapq.heappop(self._heap)
+            if self._armed.get((task_id, kind)) != (fire_at, occurrence):
+                continue  # superseded by a later plan for this task
+            if kind == 'deadline' and parse_timestamp(occurrence) <= now:
+                # Held back past the deadline itself; the overdue reminder covers it
+                del self._armed[(task_id, kind)]
+                continue
+            last = self._last_sent.get(task_id)
+            if last and now < last + gap:
+                self._defer(task_id, kind, occurrence, last + gap)
+                continue
+            del self._armed[(task_id, kind)]
+            due.append((fire_at, task_id, kind, occurrence))
+        return due
+
+    def _defer(self, task_id: int, kind: str, occurrence: str, fire_at: datetime):
+        self._armed[(task_id, kind)] = (fire_at, occurrence)
+        heapq.heappush(self._heap, (fire_at, task_id, kind, occurrence))
+
+    async def _fire(self, due: List[Reminder], now: datetime, gap: timedelta):
+        # _pop_due already disarmed these; anything not settled when an error
+        # escapes is re-armed, or it would wait for the next full rebuild
+        settled: Set[Tuple[int, str]] = set()
+        try:
+            tasks = {t.id: t for t in await get_tasks({task_id for _, task_id, _, _ in due})}
+            batch = []
+            batched: Set[int] = set()
+            for _, task_id, kind, occurrence in due:
+                task = tasks.get(task_id)
+                if not task:
+                    settled.add((task_id, kind))
+                    continue
+                if task_id in batched:
+                    # One reminder per task per interval, the rest wait
+                    self._defer(task_id, kind, occurrence, now + gap)
+                    settled.add((task_id, kind))
+                    continue
+                batched.add(task_id)
+                batch.append((task, kind, occurrence))
+            if not batch:
+                return
+
+            results = await self.send([(task, kind) for task, kind, _ in batch])
+            done = []
+            for (task, kind, occurrence), delivered in zip(batch, results):
+                settled.add((task.id, kind))
+                if not delivered:
+                    # Discord error, try again once the interval has passed
+                    self._defer(task.id, kind, occurrence, now + gap)
+                    continue
+                self._sent[(task.id, kind)] = occurrence
+                self._last_sent[task.id] = now
+                self.sent += 1
+                done.append((task.id, kind, occurrence, now.strftime('%Y-%m-%d %H:%M:%S')))
+            if done:
+                async with transaction():
+                    await mark_reminders_sent(done)
+        except BaseException:
+            for _, task_id, kind, occurrence in due:
+                if (task_id, kind) not in settled:
+                    self._defer(task_id, kind, occurrence, now + gap)
+            raise
+
+    async def _run(self):
+        if self.wait_ready:
+            await self.wait_ready()
+        while True:
+            self._wake.clear()
+            config = server_configs.get(self.guild_id)
+            now = datetime.utcnow()
+            try:
+                if config.version != self._config_version:
+                    await self._rebuild(config, now)
+                    self._config_version = config.version
+                elif self._dirty and config.reminders_enabled:
+                    await self._replan_dirty(config, now)
+                else:
+                    self._dirty.clear()
+
+                gap = timedelta(hours=config.reminder_interval_hours)
+                due = self._pop_due(now, gap)
+                if due:
+                    await self._fire(due, now, gap)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Reminder scheduler error: {e}")
+
+            timeout = None
+            if self._heap:
+                timeout = max(0.0, (self._heap[0][0] - datetime.utcnow()).total_seconds())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import discord
+
+from .config import MEMBER_ROLES, ROLE_SYNC_CONCURRENCY
+from .database import (
+    transaction,
+    get_project_role_map,
+    get_role_sync_progress,
+    save_role_sync_progress,
+    get_member_role_fingerprints,
+    save_member_role_fingerprints,
+    delete_member_role_fingerprints,
+)
+from .models import RoleSyncProgress
+
+
+def resolve_project_roles(guild: discord.Guild, role_ids_by_suffix: Dict[str, List[int]]) -> Dict[str, List[discord.Role]]:
+    """Map each member-role suffix to the project roles that still exist in the guild."""
+    role_map = {}
+    for suffix, role_ids in role_ids_by_suffix.items():
+        roles = [guild.get_role(role_id) for role_id in role_ids]
+        roles = [r for r in roles if r]
+        if roles:
+            role_map[suffix] = roles
+    return role_map
+
+
+def plan_member_roles(member: discord.Member, role_map: Dict[str, List[discord.Role]]) -> Tuple[list, list]:
+    """Return (roles_to_add, roles_to_remove) that bring a member's project roles in line."""
+    member_role_names = {r.name for r in member.roles}
+    current_role_ids = {r.id for r in member.roles}
+
+    roles_to_add = []
+    roles_to_remove = []
+
+    for suffix, project_roles in role_map.items():
+        has_member_role = suffix in MEMBER_ROLES and suffix in member_role_names
+        for discord_role in project_roles:
+            has_project_role = discord_role.id in current_role_ids
+            if has_member_role and not has_project_role:
+                roles_to_add.append(discord_role)
+            elif not has_member_role and has_project_role:
+                roles_to_remove.append(discord_role)
+
+    return roles_to_add, roles_to_remove
+
+
+def role_fingerprint(roles: Iterable[discord.Role], role_map: Dict[str, List[discord.Role]]) -> str:
+    """
+    Compact hash of the roles that matter for project role sync.
+
+    Covers the member's MEMBER_ROLES and project roles plus the set of
+    project roles itself, so creating or deleting a project changes every
+    fingerprint and forces a resync.
+    """
+    project_role_ids = sorted(r.id for roles_ in role_map.values() for r in roles_)
+    project_id_set = set(project_role_ids)
+    relevant = sorted({
+        r.name if r.name in MEMBER_ROLES else str(r.id)
+        for r in roles
+        if r.name in MEMBER_ROLES or r.id in project_id_set
+    })
+    payload = ",".join(relevant) + "|" + ",".join(map(str, project_role_ids))
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+async def apply_member_roles(member: discord.Member, roles_to_add: list, roles_to_remove: list) -> bool:
+    try:
+        if roles_to_add:
+            await member.add_roles(*roles_to_add, reason="Project role sync")
+        if roles_to_remove:
+            await member.remove_roles(*roles_to_remove, reason="Project role sync")
+        return True
+    except discord.Forbidden:
+        print(f"Missing permissions to modify roles for {member.name}")
+    except discord.HTTPException as e:
+        print(f"Failed to modify roles for {member.name}: {e}")
+    return False
+
+
+async def sync_members(
+    guild: discord.Guild,
+    members: Iterable[discord.Member],
+    concurrency: int = ROLE_SYNC_CONCURRENCY
+) -> int:
+    """Reconcile project roles for just `members`. Returns how many were changed."""
+    role_map = resolve_project_roles(guild, await get_project_role_map())
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def sync_one(member: discord.Member) -> bool:
+        roles_to_add, roles_to_remove = plan_member_roles(member, role_map)
+        if not roles_to_add and not roles_to_remove:
+            return False
+        async with semaphore:
+            return await apply_member_roles(member, roles_to_add, roles_to_remove)
+
+    results = await asyncio.gather(*(sync_one(m) for m in members))
+    return sum(results)
+
+
+class RoleSyncJob:
+    """
+    Background, resumable sweep that reconciles project roles for every member.
+
+    Members are processed in ascending ID order with at most `concurrency`
+    REST calls in flight. discord.py queues calls per rate-limit bucket (all
+    member role edits share the guild's bucket), so the bound only keeps the
+    bot from piling requests onto that queue. Progress is checkpointed to the
+    database so a restart resumes after the last finished member, and members
+    whose role fingerprint is unchanged since their last successful sync are
+    skipped without any REST call. Fingerprints are persisted alongside the
+    checkpoint, so after a reconnect or restart only members whose roles
+    changed in the meantime are touched.
+    """
+
+    CHECKPOINT_EVERY = 25
+
+    def __init__(self, concurrency: int = ROLE_SYNC_CONCURRENCY):
+        self.concurrency = max(1, concurrency)
+        self.progress = RoleSyncProgress(status='idle')
+        self._fingerprints: Optional[Dict[int, str]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._rerun = False
+        self._run_started: Optional[float] = None
+        self._run_processed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, guild: discord.Guild, restart: bool = False) -> bool:
+        """
+        Start a sweep in the background. Returns False if one was already
+        running; that sweep is then repeated once it finishes, so role
+        changes made meanwhile are still picked up.
+        """
+        if self.running:
+            if not restart:
+                self._rerun = True
+                return False
+            self._task.cancel()
+        self._task = asyncio.create_task(self._run(guild, restart))
+        return True
+
+    def eta_seconds(self) -> Optional[float]:
+        if not self.running or not self._run_processed:
+            return None
+        elapsed = time.monotonic() - self._run_started
+        remaining = self.progress.total - self.progress.processed
+        return remaining * elapsed / self._run_processed
+
+    async def _run(self, guild: discord.Guild, restart: bool):
+        while True:
+            self._rerun = False
+            try:
+                await self._sweep(guild, restart)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Checkpoint stays 'running', so the next start resumes
+                print(f"Project role sync failed: {e}")
+                return
+            restart = False
+            if not self._rerun:
+                return
+
+    async def _sweep(self, guild: discord.Guild, restart: bool):
+        if self._fingerprints is None:
+            self._fingerprints = await get_member_role_fingerprints()
+        fingerprints = self._fingerprints
+
+        role_map = resolve_project_roles(guild, await get_project_role_map())
+        members = sorted((m for m in guild.members if not m.bot), key=lambda m: m.id)
+
+        saved = await get_role_sync_progress()
+        if saved and saved.status == 'running' and not restart:
+            progress = saved
+            progress.total = len(members)
+            if progress.last_member_id is not None:
+                members = [m for m in members if m.id > progress.last_member_id]
+            print(f"Resuming project role sync at {progress.processed}/{progress.total} members...")
+        else:
+            progress = RoleSyncProgress(
+                status='running',
+                total=len(members),
+                started_at=datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+            )
+            print(f"Syncing project roles for {len(members)} members...")
+
+        self.progress = progress
+        self._run_started = time.monotonic()
+        self._run_processed = 0
+        await save_role_sync_progress(progress)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        changed: Dict[int, str] = {}
+
+        async def sync_one(member: discord.Member):
+            fingerprint = role_fingerprint(member.roles, role_map)
+            if fingerprints.get(member.id) == fingerprint:
+                progress.skipped += 1
+                return
+
+            roles_to_add, roles_to_remove = plan_member_roles(member, role_map)
+            if roles_to_add or roles_to_remove:
+                async with semaphore:
+                    ok = await apply_member_roles(member, roles_to_add, roles_to_remove)
+                if not ok:
+                    progress.failed += 1
+                    return
+                progress.updated += 1
+                # Fingerprint the state we just wrote, the member cache updates later
+                removed = {r.id for r in roles_to_remove}
+                roles = [r for r in member.roles if r.id not in removed] + roles_to_add
+                fingerprint = role_fingerprint(roles, role_map)
+            fingerprints[member.id] = fingerprint
+            changed[member.id] = fingerprint
+
+        for i in range(0, len(members), self.CHECKPOINT_EVERY):
+            chunk = members[i:i + self.CHECKPOINT_EVERY]
+            await asyncio.gather(*(sync_one(m) for m in chunk))
+            progress.processed += len(chunk)
+            progress.last_member_id = chunk[-1].id
+            self._run_processed += len(chunk)
+            async with transaction():
+                await save_member_role_fingerprints(changed)
+                await save_role_sync_progress(progress)
+            changed.clear()
+
+        # Forget members who left the guild
+        live_ids = {m.id for m in guild.members}
+        departed = [member_id for member_id in fingerprints if member_id not in live_ids]
+        for member_id in departed:
+            del fingerprints[member_id]
+
+        progress.status = 'done'
+        async with transaction():
+            await delete_member_role_fingerprints(departed)
+            await save_role_sync_progress(progress)
+        print(
+            f"Project role sync complete ({progress.updated} updated, "
+            f"{progress.skipped} unchanged, {progress.failed} failed)."
+        )
@@ -0,0 +1,454 @@
+import asyncio
+import codecs
+import json
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+import aiohttp
+import discord
+
+from .cache import project_index
+from .config import IMPORT_CONCURRENCY
+from .database import (
+    transaction,
+    create_task,
+    get_tasks,
+    add_task_assignee,
+    update_task_thread,
+    update_task_header_message,
+    delete_task,
+    create_import_job,
+    update_import_job,
+    save_import_job_rows,
+    get_import_job_rows,
+    get_import_job_counts,
+)
+from .models import ImportJob, ImportJobRow, Project, Task
+
+IMPORT_FIELDS = (
+    'title', 'description', 'assignee_id', 'target_channel_id',
+    'deadline', 'priority', 'additional_assignees'
+)
+
+
+async def attachment_chunks(attachment: discord.Attachment, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Download an attachment piece by piece instead of reading it into memory whole."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(attachment.url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+
+async def _single(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+
+async def iter_json_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator:
+    """
+    Yield the elements of a JSON array one by one as its bytes arrive.
+
+    Only the element being decoded is held in memory. A document that is a
+    JSON string holding the array (a double-encoded export) is decoded
+    whole first. Raises ValueError on malformed JSON.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8-sig')()
+    chunks = chunks.__aiter__()
+    buf, pos, eof = '', 0, False
+
+    async def fill() -> bool:
+        # Drop what was consumed and append the next chunk; False at the end
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        try:
+            data = await chunks.__anext__()
+        except StopAsyncIteration:
+            eof = True
+            data = b''
+        buf = buf[pos:] + utf8.decode(data, final=eof)
+        pos = 0
+        return True
+
+    async def peek() -> str:
+        # Next non-whitespace character, '' at the end of the document
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not await fill():
+                return ''
+
+    async def value():
+        nonlocal pos
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if await fill():
+                    continue
+                raise
+            if end == len(buf) and not eof:
+                # A number cut at a chunk edge decodes short, read on first
+                await fill()
+                continue
+            pos = end
+            return obj
+
+    first = await peek()
+    if first == '"':
+        inner = await value()
+        async for row in iter_json_rows(_single(inner.encode('utf-8'))):
+            yield row
+        return
+    if first != '[':
+        raise ValueError("JSON must be an array of task objects")
+    pos += 1
+    if await peek() == ']':
+        return
+    while True:
+        if not await peek():
+            raise ValueError("JSON array is not closed")
+        yield await value()
+        separator = await peek()
+        if separator == ']':
+            return
+        if not separator:
+            raise ValueError("JSON array is not closed")
+        if separator != ',':
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {separator!r}")
+        pos += 1
+
+
+async def iter_xml_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """
+    Yield each <task> child of the root element as a dict of its fields.
+
+    The document is parsed incrementally and every task element is dropped
+    once read. Raises ValueError on malformed XML.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+    depth = 0
+
+    def rows():
+        nonlocal root, depth
+        for event, elem in parser.read_events():
+            if event == 'start':
+                depth += 1
+                if root is None:
+                    root = elem
+                continue
+            depth -= 1
+            if depth == 1 and elem.tag == 'task':
+                yield {name: elem.findtext(name) for name in IMPORT_FIELDS}
+                root.clear()
+
+    try:
+        async for data in chunks:
+            parser.feed(data)
+            for row in rows():
+                yield row
+        parser.close()
+        for row in rows():
+            yield row
+    except ET.ParseError as e:
+        raise ValueError(str(e)) from e
+
+
+@dataclass
+class ImportRow:
+    number: int  # 1-based position in the file, used in error messages
+    title: str
+    description: str
+    channel: discord.abc.GuildChannel
+    members: List[discord.Member]  # primary assignee first
+    project: Project
+    deadline: Optional[str] = None
+    priority: Optional[str] = None
+
+
+@dataclass
+class ImportResult:
+    created: List[Task] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def projects(self) -> List[str]:
+        """Acronyms of the projects that gained tasks."""
+        return sorted({task.project_acronym for task in self.created})
+
+
+class ImportValidator:
+    """
+    Checks import rows against in-memory lookups built once per import.
+
+    Channels and members come from the guild cache and a channel's project
+    from the resident project index, matched by channel or category id.
+    """
+
+    def __init__(self, guild: discord.Guild):
+        self.guild = guild
+
+    def project_for(self, channel: discord.abc.GuildChannel) -> Optional[Project]:
+        return project_index.project_for(channel.id, getattr(channel, 'category_id', None))
+
+    @staticmethod
+    def _id(data: dict, name: str) -> int:
+        try:
+            return int(data[name])
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be a numeric ID")
+
+    def validate(self, number: int, data) -> ImportRow:
+        """Build an ImportRow, or raise ValueError saying what is wrong with the row."""
+        if not isinstance(data, dict):
+            raise ValueError("not a task object")
+        for name in ('title', 'assignee_id', 'target_channel_id'):
+            if not data.get(name):
+                raise ValueError(f"missing {name}")
+        for name in ('title', 'description', 'deadline', 'priority'):
+            if data.get(name) is not None and not isinstance(data[name], str):
+                raise ValueError(f"{name} must be a string")
+
+        assignee_id = self._id(data, 'assignee_id')
+        target_channel_id = self._id(data, 'target_channel_id')
+
+        channel = self.guild.get_channel(target_channel_id)
+        if not channel:
+            raise ValueError(f"channel {target_channel_id} not found")
+        member = self.guild.get_member(assignee_id)
+        if not member:
+            raise ValueError(f"member {assignee_id} not found")
+        project = self.project_for(channel)
+        if not project:
+            raise ValueError("could not detect project from channel")
+
+        members = [member]
+        additional_ids = data.get('additional_assignees') or []
+        if isinstance(additional_ids, str):
+            additional_ids = [x.strip() for x in additional_ids.split(',') if x.strip()]
+        elif not isinstance(additional_ids, list):
+            raise ValueError("additional_assignees must be a list or comma-separated string")
+        for add_id in additional_ids:
+            try:
+                add_member = self.guild.get_member(int(add_id))
+            except (ValueError, TypeError):
+                continue
+            if add_member and add_member not in members:
+                members.append(add_member)
+
+        return ImportRow(
+            number=number,
+            title=data['title'],
+            description=data.get('description') or '',
+            channel=channel,
+            members=members,
+            project=project,
+            deadline=data.get('deadline'),
+            priority=data.get('priority')
+        )
+
+
+@dataclass
+class ImportItem:
+    """A journalled row on its way to being published."""
+    journal: ImportJobRow
+    row: ImportRow
+    task: Task
+
+
+async def hashed_chunks(chunks: AsyncIterator[bytes], digest) -> AsyncIterator[bytes]:
+    """Pass chunks through, feeding them to a hashlib digest on the way."""
+    async for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
+
+
+async def _insert_tasks(pairs: List[Tuple[ImportJobRow, ImportRow]]) -> List[ImportItem]:
+    """Create the task and assignee rows for journal rows; call inside a transaction."""
+    items = []
+    for journal, row in pairs:
+        task = await create_task(
+            project_acronym=row.project.acronym,
+            title=row.title,
+            description=row.description,
+            assignee_id=row.members[0].id,
+            target_channel_id=row.channel.id,
+            deadline=row.deadline,
+            priority=row.priority
+        )
+        for i, member in enumerate(row.members):
+            await add_task_assignee(task.id, member.id, is_primary=(i == 0))
+        journal.status = 'created'
+        journal.task_id = task.id
+        journal.header_message_id = None
+        journal.thread_id = None
+        journal.error = None
+        items.append(ImportItem(journal, row, task))
+    return items
+
+
+async def start_import_job(
+    source_hash: str,
+    filename: str,
+    requested_by: int,
+    entries: List[Tuple[int, object, Optional[ImportRow], Optional[str]]]
+) -> Tuple[ImportJob, List[ImportItem]]:
+    """
+    Journal a parsed file and create tasks for its valid rows.
+
+    `entries` holds (number, payload, row, error) per file row, with row
+    None and error set for rows that failed validation. The job, its
+    journal and every task and assignee row are written in one
+    transaction, so a job either exists with all its tasks or not at all.
+    """
+    async with transaction():
+        job = await create_import_job(source_hash, filename, requested_by, len(entries))
+        journal = []
+        valid = []
+        for number, payload, row, error in entries:
+            entry = ImportJobRow(job.id, number, payload, 'invalid' if row is None else 'created', error=error)
+            journal.append(entry)
+            if row is not None:
+                valid.append((entry, row))
+        items = await _insert_tasks(valid)
+        await save_import_job_rows(journal)
+    return job, items
+
+
+async def resume_import_job(
+    job: ImportJob,
+    validator: ImportValidator,
+    discard: Optional[Callable[[ImportJobRow], Awaitable[None]]] = None
+) -> Tuple[List[ImportItem], List[str]]:
+    """
+    Reload the rows of an unfinished job that are not published yet.
+
+    Rows keep the task they already have, and the header they posted if
+    any, so resuming never creates a row twice. Rows that failed to
+    publish get a fresh task. Every row is validated again against the
+    current guild; rows that no longer pass are marked failed, their task
+    is deleted and `discard` is awaited for rows that had posted a header.
+    Returns the items to publish and the errors of the dropped rows.
+    """
+    pending = await get_import_job_rows(job.id, statuses=('created', 'posted', 'failed'))
+    tasks = {t.id: t for t in await get_tasks(j.task_id for j in pending if j.task_id)}
+    items: List[ImportItem] = []
+    retry: List[Tuple[ImportJobRow, ImportRow]] = []
+    dropped: List[ImportJobRow] = []
+    errors = []
+    for journal in pending:
+        try:
+            row = validator.validate(journal.row_number, journal.payload)
+        except ValueError as e:
+            dropped.append(ImportJobRow(**vars(journal)))
+            journal.status = 'failed'
+            journal.error = str(e)
+            errors.append(f"Task {journal.row_number}: {e}")
+            continue
+        task = tasks.get(journal.task_id)
+        if task:
+            items.append(ImportItem(journal, row, task))
+        else:
+            retry.append((journal, row))
+
+    for journal in dropped:
+        if discard and journal.header_message_id:
+            await discard(journal)
+
+    async with transaction():
+        for journal in dropped:
+            if journal.task_id:
+                await delete_task(journal.task_id)
+        for journal in pending:
+            if journal.status == 'failed':
+                journal.task_id = journal.header_message_id = journal.thread_id = None
+        items.extend(await _insert_tasks(retry))
+        await save_import_job_rows(pending)
+        await update_import_job(job.id, status='running')
+    job.status = 'running'
+    items.sort(key=lambda item: item.journal.row_number)
+    return items, errors
+
+
+async def run_import_job(
+    job: ImportJob,
+    items: List[ImportItem],
+    publish: Callable[[ImportItem, Callable[[int], Awaitable[None]]], Awaitable[None]],
+    on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    concurrency: int = IMPORT_CONCURRENCY,
+    batch_size: int = 25
+) -> ImportResult:
+    """
+    Publish the tasks of an import job and settle its journal.
+
+    `publish(item, on_header)` posts a task's header, thread and control
+    panel, setting thread_id, control_message_id and header_message_id on
+    item.task; it awaits `on_header(message_id)` right after posting a
+    new header, which journals it before the thread is created, and it
+    must remove what it posted before raising discord.HTTPException.
+    `concurrency` tasks are published at a time. After each batch of
+    `batch_size` the message IDs, the deletion of tasks that failed, the
+    journal rows and the job cursor are written in one transaction, then
+    `on_progress(done, total)` is awaited. The job ends 'done', or
+    'incomplete' while failed rows are left to resume.
+    """
+    result = ImportResult()
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def publish_one(item: ImportItem):
+        journal = item.journal
+
+        async def on_header(message_id: int):
+            journal.status = 'posted'
+            journal.header_message_id = message_id
+            await save_import_job_rows([journal])
+
+        try:
+            async with slots:
+                await publish(item, on_header)
+        except discord.HTTPException as e:
+            journal.status = 'failed'
+            journal.error = str(e)
+            result.errors.append(f"Task {journal.row_number}: {e}")
+            return
+        journal.status = 'published'
+        journal.header_message_id = item.task.header_message_id
+        journal.thread_id = item.task.thread_id
+        journal.error = None
+        result.created.append(item.task)
+
+    done = 0
+    for i in range(0, len(items), batch_size):
+        batch = items[i:i + batch_size]
+        # Let the whole batch finish and settle it before any unexpected
+        # error propagates; rows it interrupted stay as journalled for resume
+        outcomes = await asyncio.gather(*(publish_one(item) for item in batch), return_exceptions=True)
+        async with transaction():
+            for item in batch:
+                journal = item.journal
+                if journal.status == 'published':
+                    await update_task_thread(item.task.id, item.task.thread_id, item.task.control_message_id)
+                    await update_task_header_message(item.task.id, item.task.header_message_id)
+                elif journal.status == 'failed':
+                    await delete_task(item.task.id)
+                    journal.task_id = journal.header_message_id = journal.thread_id = None
+            await save_import_job_rows(item.journal for item in batch)
+            interrupted = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+            if not interrupted:
+                await update_import_job(job.id, cursor=batch[-1].journal.row_number)
+        if interrupted:
+            raise interrupted[0]
+        done += len(batch)
+        if on_progress:
+            await on_progress(done, len(items))
+
+    counts = await get_import_job_counts(job.id)
+    job.status = 'incomplete' if counts.get('failed') else 'done'
+    await update_import_job(job.id, status=job.status, cursor=job.total_rows)
+    return result
@@ -0,0 +1,97 @@
+"""
+Per-query latency of the database layer: a new aiosqlite connection per
+call (how database.py worked before the connection pool) against the
+shared ConnectionPool.
+
+Runs against a throwaway database file, never data/bot.db:
+
+    python scripts/bench_db.py [--iterations 500] [--pool-size 4]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+
+import aiosqlite
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from bot import database  # noqa: E402
+
+
+class PerCallConnections:
+    """Stand-in for ConnectionPool that opens and closes a connection on every acquire()."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @property
+    def is_open(self) -> bool:
+        return True
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @asynccontextmanager
+    async def acquire(self):
+        async with aiosqlite.connect(self.path) as db:
+            db.row_factory = aiosqlite.Row
+            yield db
+
+
+async def time_queries(task_id: int, iterations: int) -> dict:
+    queries = {
+        "get_task": lambda: database.get_task(task_id),
+        "get_all_projects": database.get_all_projects,
+        "is_user_task_assignee": lambda: database.is_user_task_assignee(task_id, 1),
+        "update_task_status": lambda: database.update_task_status(task_id, "progress"),
+    }
+    results = {}
+    for name, query in queries.items():
+        await query()  # warm up
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await query()
+        results[name] = (time.perf_counter() - started) / iterations * 1e6
+    return results
+
+
+async def main(iterations: int, pool_size: int):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+    # Schema and fixture through the real pool
+    database._pool = database.ConnectionPool(path, pool_size)
+    await database.init_db()
+    await database.create_project("Neon Drift", "ND", 1)
+    task = await database.create_task("ND", "Benchmark task", "", 1, 2)
+    await database.add_task_assignee(task.id, 1, is_primary=True)
+    await database.close_db()
+
+    database._pool = PerCallConnections(path)
+    per_call = await time_queries(task.id, iterations)
+
+    database._pool = database.ConnectionPool(path, pool_size)
+    await database.init_db()
+    try:
+        pooled = await time_queries(task.id, iterations)
+    finally:
+        await database.close_db()
+
+    print(f"{iterations} iterations, pool of {pool_size}, {path}")
+    print(f"{'query':24s} {'per-call':>10s} {'pooled':>10s}")
+    for name in per_call:
+        print(f"{name:24s} {per_call[name]:8.0f}us {pooled[name]:8.0f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=database.DATABASE_POOL_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.pool_size))
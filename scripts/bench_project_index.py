@@ -0,0 +1,89 @@
+"""
+Project detection for a channel: the old substring scan over every
+project's acronym against ProjectChannelIndex.project_for.
+
+Builds a throwaway database with --projects projects of five channels
+each, plus a "frontend" project whose channel also contains the acronym
+"nd" of the first one, to show the scan's ambiguity:
+
+    python scripts/bench_project_index.py [--projects 200] [--iterations 20000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from bot import database  # noqa: E402
+from bot.cache import project_index  # noqa: E402
+from bot.models import ProjectChannel  # noqa: E402
+
+CHANNEL_NAMES = ("general", "leads", "board", "questions", "dev")
+
+
+def substring_scan(projects, channel):
+    """Project detection as /task new and /task import did it before the index."""
+    for project in projects:
+        if project.acronym.lower() in channel.name.lower():
+            return project
+    return None
+
+
+def per_lookup(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def main(project_count: int, iterations: int):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    database._pool = database.ConnectionPool(path, 4)
+    await database.init_db()
+    try:
+        for i in range(project_count):
+            category_id = 10_000 + i
+            project = await database.create_project(f"Project {i}", "nd" if i == 0 else f"p{i:03d}x", category_id)
+            await database.add_project_channels([
+                ProjectChannel(id=None, project_id=project.id, channel_id=category_id * 100 + j,
+                               name=name, group_name="general", is_custom=False, is_voice=False)
+                for j, name in enumerate(CHANNEL_NAMES)
+            ])
+        frontend = await database.create_project("Frontend", "frontend", 99)
+        await database.add_project_channel(frontend.id, 9900, "frontend-dev", "general", False, False)
+        await database.load_project_index()
+
+        # Worst case for the scan: a channel of the last project
+        last = project_count - 1
+        channel = SimpleNamespace(id=(10_000 + last) * 100 + 4, name=f"p{last:03d}x-dev", category_id=10_000 + last)
+        ambiguous = SimpleNamespace(id=9900, name="frontend-dev", category_id=99)
+        projects = await database.get_all_projects()
+
+        scan = per_lookup(lambda: substring_scan(projects, channel), iterations)
+        index = per_lookup(lambda: project_index.project_for(channel.id, channel.category_id), iterations)
+        query_iterations = max(1, iterations // 40)
+        started = time.perf_counter()
+        for _ in range(query_iterations):
+            substring_scan(await database.get_all_projects(), channel)
+        query_scan = (time.perf_counter() - started) / query_iterations * 1e6
+
+        print(f"{len(projects)} projects, {len(project_index)} indexed channels")
+        print(f"  substring scan, projects preloaded:  {scan:8.2f} us/lookup")
+        print(f"  get_all_projects() + scan:           {query_scan:8.2f} us/lookup")
+        print(f"  ProjectChannelIndex.project_for:     {index:8.2f} us/lookup")
+        print(f"  '{ambiguous.name}': scan -> {substring_scan(projects, ambiguous).acronym}, "
+              f"index -> {project_index.project_for(ambiguous.id, ambiguous.category_id).acronym}")
+    finally:
+        await database.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.projects, args.iterations))
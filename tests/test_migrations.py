@@ -0,0 +1,231 @@
+"""
+Upgrade tests for the schema migrations in bot/migrations.py.
+
+Every historical layout is built on disk, filled with a project, a task
+and its satellites, then opened with init_db(). The data must survive,
+the schema must end at LATEST_VERSION with every table and index a fresh
+database has, and a second init_db() must change nothing.
+"""
+import asyncio
+import sqlite3
+
+import aiosqlite
+import pytest
+
+from bot import database, migrations
+from bot.migrations import LATEST_VERSION, MIGRATIONS
+
+GAMES_LAYOUT = """
+    CREATE TABLE games (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        acronym TEXT UNIQUE NOT NULL,
+        category_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE game_channels (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_id INTEGER NOT NULL,
+        channel_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        group_name TEXT NOT NULL,
+        is_custom BOOLEAN DEFAULT 0,
+        is_voice BOOLEAN DEFAULT 0
+    );
+    CREATE TABLE game_roles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_id INTEGER NOT NULL,
+        role_id INTEGER NOT NULL,
+        suffix TEXT NOT NULL
+    );
+    CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_acronym TEXT NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        assignee_id INTEGER NOT NULL,
+        target_channel_id INTEGER NOT NULL,
+        thread_id INTEGER,
+        control_message_id INTEGER,
+        status TEXT DEFAULT 'todo',
+        deadline DATETIME,
+        eta TEXT,
+        priority TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE task_boards (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_acronym TEXT NOT NULL UNIQUE,
+        channel_id INTEGER NOT NULL,
+        message_ids TEXT NOT NULL
+    );
+    INSERT INTO games (name, acronym, category_id) VALUES ('Neon Drift', 'ND', 100);
+    INSERT INTO game_channels (game_id, channel_id, name, group_name) VALUES (1, 500, 'general', 'general');
+    INSERT INTO game_roles (game_id, role_id, suffix) VALUES (1, 900, 'Coder');
+    INSERT INTO tasks (game_acronym, title, description, assignee_id, target_channel_id, thread_id)
+        VALUES ('ND', 'Tune drift physics', 'handbrake feels floaty', 7, 500, 600);
+    INSERT INTO task_boards (game_acronym, channel_id, message_ids) VALUES ('ND', 500, '[1, 2, 3, 4]');
+"""
+
+# The same data for layouts that already have the project tables
+PROJECT_DATA = """
+    INSERT INTO projects (name, acronym, category_id) VALUES ('Neon Drift', 'ND', 100);
+    INSERT INTO project_channels (project_id, channel_id, name, group_name) VALUES (1, 500, 'general', 'general');
+    INSERT INTO project_roles (project_id, role_id, suffix) VALUES (1, 900, 'Coder');
+    INSERT INTO tasks (project_acronym, title, description, assignee_id, target_channel_id, thread_id)
+        VALUES ('ND', 'Tune drift physics', 'handbrake feels floaty', 7, 500, 600);
+    INSERT INTO task_assignees (task_id, user_id, is_primary) VALUES (1, 7, 1);
+    INSERT INTO task_history (task_id, user_id, action, new_value) VALUES (1, 8, 'question', 'which gearbox');
+    INSERT INTO task_boards (project_acronym, channel_id, message_ids) VALUES ('ND', 500, '[1, 2, 3, 4]');
+"""
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def apply_up_to(path, version):
+    """Build a database at an intermediate schema version, as a bot of that release left it."""
+    db = await aiosqlite.connect(path)
+    try:
+        original = migrations.MIGRATIONS, migrations.LATEST_VERSION
+        migrations.MIGRATIONS = [m for m in MIGRATIONS if m[0] <= version]
+        migrations.LATEST_VERSION = version
+        try:
+            await migrations.migrate(db)
+        finally:
+            migrations.MIGRATIONS, migrations.LATEST_VERSION = original
+    finally:
+        await db.close()
+
+
+async def apply_unversioned(path):
+    """The layout init_db created before schema versioning: core tables, no schema_version."""
+    db = await aiosqlite.connect(path)
+    try:
+        for version, _, apply in MIGRATIONS:
+            if version <= 3:
+                await apply(db)
+        await db.commit()
+    finally:
+        await db.close()
+
+
+def has_projects(path):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT 1 FROM sqlite_master WHERE name = 'projects'").fetchone() is not None
+
+
+def schema_objects(path):
+    """(type, name) of every table, index and trigger, ignoring FTS shadow tables."""
+    with sqlite3.connect(path) as db:
+        return {
+            (kind, name) for kind, name in db.execute("SELECT type, name FROM sqlite_master")
+            if not name.startswith(("sqlite_", "tasks_fts_")) or kind == "trigger"
+        }
+
+
+def dump(path):
+    """Schema and every row of every table, for before/after comparisons."""
+    with sqlite3.connect(path) as db:
+        master = db.execute("SELECT type, name, sql FROM sqlite_master ORDER BY type, name").fetchall()
+        rows = {
+            name: db.execute(f'SELECT * FROM "{name}"').fetchall()
+            for kind, name, _ in master if kind == "table"
+        }
+    return master, rows
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "bot.db")
+    monkeypatch.setattr(database, "_pool", database.ConnectionPool(path, 1))
+    return path
+
+
+@pytest.fixture(scope="module")
+def fresh_schema(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("fresh") / "bot.db")
+    run(apply_up_to(path, LATEST_VERSION))
+    return schema_objects(path)
+
+
+def layouts():
+    yield pytest.param("games", id="games-layout")
+    yield pytest.param("unversioned", id="unversioned")
+    for version, name, _ in MIGRATIONS[:-1]:
+        yield pytest.param(version, id=f"v{version}-{name.replace(' ', '-')}")
+
+
+def build(path, layout):
+    if layout == "games":
+        with sqlite3.connect(path) as db:
+            db.executescript(GAMES_LAYOUT)
+        return
+    if layout == "unversioned":
+        run(apply_unversioned(path))
+    else:
+        run(apply_up_to(path, layout))
+    if has_projects(path):
+        with sqlite3.connect(path) as db:
+            db.executescript(PROJECT_DATA)
+
+
+async def upgrade():
+    await database.init_db()
+    try:
+        applied = await migrations.migrate(database._pool._connections[0])
+        project = await database.get_project_by_acronym("nd")
+        found = {
+            "project": project,
+            "channels": await database.get_project_channels(project.id) if project else [],
+            "roles": await database.get_project_roles(project.id) if project else [],
+            "tasks": await database.get_tasks_by_project("ND"),
+            "board": await database.get_task_board("ND"),
+            "search": await database.search_tasks("drift"),
+            "stats": await database.get_project_task_stats("ND"),
+        }
+    finally:
+        await database.close_db()
+    return applied, found
+
+
+@pytest.mark.parametrize("layout", list(layouts()))
+def test_upgrade_keeps_data(db_path, layout, fresh_schema):
+    build(db_path, layout)
+    had_data = layout == "games" or has_projects(db_path)
+
+    applied, found = run(upgrade())
+
+    assert applied == [], "a second migrate() after init_db must do nothing"
+    with sqlite3.connect(db_path) as db:
+        versions = [v for v, in db.execute("SELECT version FROM schema_version ORDER BY version")]
+        durations = [ms for ms, in db.execute("SELECT duration_ms FROM schema_version")]
+    assert versions == [version for version, _, _ in MIGRATIONS]
+    assert all(ms >= 0 for ms in durations)
+    assert fresh_schema <= schema_objects(db_path)
+
+    if not had_data:
+        return
+    assert found["project"].name == "Neon Drift"
+    assert [(c.channel_id, c.name) for c in found["channels"]] == [(500, "general")]
+    assert [(r.role_id, r.suffix) for r in found["roles"]] == [(900, "Coder")]
+    assert [(t.title, t.thread_id) for t in found["tasks"]] == [("Tune drift physics", 600)]
+    assert found["board"].message_ids == "[1, 2, 3, 4]"
+    # Derived tables are backfilled from the rows that were already there
+    assert [t.title for t in found["search"]] == ["Tune drift physics"]
+    assert found["stats"].todo == 1
+
+
+@pytest.mark.parametrize("layout", ["games", LATEST_VERSION])
+def test_rerun_changes_nothing(db_path, layout):
+    build(db_path, layout)
+    run(database.init_db())
+    run(database.close_db())
+    before = dump(db_path)
+
+    run(database.init_db())
+    run(database.close_db())
+
+    assert dump(db_path) == before
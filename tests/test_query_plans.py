@@ -0,0 +1,83 @@
+"""
+EXPLAIN QUERY PLAN checks for the hot task queries in bot/database.py.
+
+Each query function runs against a freshly migrated in-memory database
+with a trace callback on its connection; every statement it issues is
+explained and must reach its table through an index, never a full scan.
+"""
+import asyncio
+
+import pytest
+
+from bot import database
+
+HOT_QUERIES = {
+    # Task lists: dashboards, /task manage, /task list
+    "task_page_project": lambda: database.get_task_page(project_acronym="AA"),
+    "task_page_project_status": lambda: database.get_task_page(project_acronym="AA", status="todo"),
+    "task_page_status": lambda: database.get_task_page(status="todo"),
+    "task_page_next": lambda: database.get_task_page(project_acronym="AA", after=("2024-01-01 00:00:00", 5)),
+    "task_page_assignee": lambda: database.get_task_page(assignee_id=1, open_only=True),
+    "tasks_by_project": lambda: database.get_tasks_by_project("AA"),
+    "tasks_by_status": lambda: database.get_tasks_by_status("todo"),
+    "tasks_by_status_project": lambda: database.get_tasks_by_status("todo", "AA"),
+    # Assignees
+    "tasks_by_assignee": lambda: database.get_tasks_by_assignee(1),
+    "tasks_by_assignee_multi": lambda: database.get_tasks_by_assignee_multi(1),
+    "task_assignees": lambda: database.get_task_assignees(1),
+    "assignees_for_tasks": lambda: database.get_assignees_for_tasks([1, 2, 3]),
+    # Deadline reminders
+    "overdue_tasks": lambda: database.get_overdue_tasks(),
+    "tasks_due_soon": lambda: database.get_tasks_due_soon(24),
+    # Stagnant reminders
+    "stagnant_tasks": lambda: database.get_stagnant_tasks(3),
+    # Lookups by key
+    "task_by_thread_id": lambda: database.get_task_by_thread_id(5),
+    "project_by_acronym": lambda: database.get_project_by_acronym("aa"),
+    "task_history": lambda: database.get_task_history(1),
+}
+
+
+def full_scans(plan):
+    """
+    Plan lines that walk a whole table or index instead of searching one.
+
+    "SCAN t USING INDEX i" still reads every entry of i (e.g. a partial
+    index whose condition the query implies but does not search on), so
+    only SEARCH steps pass.
+    """
+    return [line for line in plan if line.startswith("SCAN ") and "VIRTUAL TABLE" not in line]
+
+
+async def query_plans(call):
+    """Run a query function and return the plan of every statement it issued."""
+    await database.init_db()
+    try:
+        db = database._pool._connections[0]
+        statements = []
+        await db.set_trace_callback(statements.append)
+        await call()
+        await db.set_trace_callback(None)
+
+        plans = {}
+        for sql in statements:
+            if not sql.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                continue
+            cursor = await db.execute("EXPLAIN QUERY PLAN " + sql)
+            plans[sql] = [row["detail"] for row in await cursor.fetchall()]
+        return plans
+    finally:
+        await database.close_db()
+
+
+@pytest.fixture
+def memory_db(monkeypatch):
+    monkeypatch.setattr(database, "_pool", database.ConnectionPool(":memory:", 1))
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(memory_db, name):
+    plans = asyncio.run(query_plans(HOT_QUERIES[name]))
+    assert plans, f"{name} issued no query"
+    for sql, plan in plans.items():
+        assert not full_scans(plan), f"{name} scans a whole table:\n{sql}\n" + "\n".join(plan)